@@ -0,0 +1,492 @@
+"""
+Library API for deploying without the CLI.
+
+``deploy`` runs the same pipeline as ``ufazien deploy`` - scan, skip
+unchanged trees, transform, check budgets, archive, upload, trigger and
+optionally wait - but reports progress through a callback instead of
+printing, and reuses the caller's ``UfazienAPIClient``, so one process can
+deploy many sites over the same session, rate limiter and upload throttle.
+
+Example:
+    from ufazien import UfazienAPIClient
+    from ufazien.api import DeployOptions, deploy
+
+    client = UfazienAPIClient()
+    for project in projects:
+        result = deploy(project, client=client, options=DeployOptions(wait=True))
+        print(project, result.status, result.duration)
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ufazien.archives import DEFAULT_KEEP, ArchiveStore
+from ufazien.budgets import check_archive_budget, check_file_budgets, load_budgets
+from ufazien.client import UfazienAPIClient
+from ufazien.gitfiles import list_git_files
+from ufazien.transforms import (
+    add_precache_manifest,
+    add_precompressed_sidecars,
+    compile_env_files,
+    fingerprint_assets,
+    minify_assets,
+    has_managed_htaccess,
+    sync_htaccess_files,
+)
+from ufazien.utils import (
+    ArchiveSizeExceeded,
+    available_archive_formats,
+    compute_tree_fingerprint,
+    create_tar_zst_from_files,
+    create_zip_from_files,
+    file_sha256,
+    find_website_config,
+    list_folder_files,
+    list_project_files,
+    load_deploy_state,
+    save_deploy_state,
+)
+
+FileList = List[Tuple[Path, str]]
+
+
+@dataclass
+class DeployOptions:
+    """Options of a deploy; transforms also turn on when enabled in .ufazien.json."""
+
+    force: bool = False
+    reproducible: bool = False
+    precompress: bool = False
+    minify: bool = False
+    fingerprint: bool = False
+    archive_format: str = 'auto'
+    from_git: bool = False
+    git_ref: Optional[str] = None
+    wait: bool = False
+    timeout: float = 600.0
+
+
+@dataclass
+class DeployEvent:
+    """
+    A progress event.
+
+    ``status`` is 'started' or 'finished' for each phase, 'progress' for
+    deployment status changes while waiting, and 'warning' for problems
+    that do not stop the deploy. 'finished' events carry the phase's
+    duration in ``seconds``.
+    """
+
+    phase: str
+    status: str
+    message: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+    seconds: Optional[float] = None
+
+
+@dataclass
+class DeployResult:
+    """
+    Outcome of a deploy.
+
+    ``status`` is 'unchanged' when nothing was uploaded, 'uploaded' when the
+    deployment could not be triggered, and 'deployed' otherwise.
+    """
+
+    website_id: str
+    status: str
+    domain: Optional[str] = None
+    fingerprint: Optional[str] = None
+    files: int = 0
+    archive_format: Optional[str] = None
+    archive_size: Optional[int] = None
+    archive_sha256: Optional[str] = None
+    deployment: Optional[Dict[str, Any]] = None
+    wait: Optional[Dict[str, Any]] = None
+    budget_checks: List[Dict[str, Any]] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    duration: float = 0.0
+
+
+class DeployError(Exception):
+    """A deploy failed during ``phase``."""
+
+    def __init__(self, message: str, phase: str):
+        super().__init__(message)
+        self.phase = phase
+
+
+class BudgetExceeded(DeployError):
+    """A size budget from .ufazien.json was exceeded; nothing was uploaded."""
+
+    def __init__(
+        self,
+        message: str,
+        checks: List[Dict[str, Any]],
+        size: Optional[int] = None,
+        limit: Optional[int] = None
+    ):
+        super().__init__(message, 'budgets')
+        self.checks = checks
+        # Set when the archive (rather than the files) went over its budget
+        self.size = size
+        self.limit = limit
+
+
+class DeploymentFailed(DeployError):
+    """The deployment failed or did not finish in time (``result`` is the wait result, if any)."""
+
+    def __init__(self, message: str, result: Optional[Dict[str, Any]] = None):
+        super().__init__(message, 'wait')
+        self.result = result
+
+    @property
+    def timed_out(self) -> bool:
+        return bool(self.result and self.result['timed_out'])
+
+
+def _transform_option(config: Dict[str, Any], key: str, enabled: bool) -> Tuple[bool, List[str]]:
+    """Read a deploy transform setting (true or {"exclude": [...]}) from .ufazien.json."""
+    value = config.get(key)
+    exclude = value.get('exclude', []) if isinstance(value, dict) else []
+    return enabled or bool(value), exclude
+
+
+def deploy_settings(
+    config: Dict[str, Any],
+    reproducible: bool = False,
+    precompress: bool = False,
+    minify: bool = False,
+    fingerprint: bool = False
+) -> Dict[str, Any]:
+    """
+    Resolve the deploy options that change the archive, merging .ufazien.json.
+
+    ``compile_env`` is on by default for PHP websites; set it to false in
+    .ufazien.json to turn it off. ``htaccess`` is None unless set: the
+    managed .htaccess block is then rebuilt only if the project already has
+    it, while true adds it and false leaves .htaccess alone. ``service_worker`` is opt-in: ``ufazien
+    create --service-worker`` sets it, since a worker shipped to browsers is
+    hard to take back.
+    """
+    minify, minify_exclude = _transform_option(config, 'minify', minify)
+    fingerprint, fingerprint_exclude = _transform_option(config, 'fingerprint', fingerprint)
+    service_worker, service_worker_exclude = _transform_option(config, 'service_worker', False)
+    return {
+        'reproducible': reproducible or bool(config.get('reproducible_archive')),
+        'precompress': precompress or bool(config.get('precompress')),
+        'minify': minify,
+        'minify_exclude': minify_exclude,
+        'fingerprint': fingerprint,
+        'fingerprint_exclude': fingerprint_exclude,
+        'compile_env': bool(config.get('compile_env', config.get('website_type') == 'php')),
+        'htaccess': config.get('htaccess'),
+        'service_worker': service_worker,
+        'service_worker_exclude': service_worker_exclude,
+    }
+
+
+def list_deploy_files(
+    project_dir: str,
+    config: Dict[str, Any],
+    from_git: bool = False,
+    git_ref: Optional[str] = None
+) -> FileList:
+    """List the files a deploy of this project uploads, from the file system or from git."""
+    build_folder = config.get('build_folder') if config.get('website_type') == 'build' else None
+    if from_git:
+        return list_git_files(project_dir, ref=git_ref, folder=build_folder, apply_ignore=not build_folder)
+    if build_folder:
+        return list_folder_files(project_dir, build_folder)
+    return list_project_files(project_dir)
+
+
+def server_archive_hash(data: object) -> Optional[str]:
+    """Return the archive hash the server reports for a deploy, if any."""
+    if not isinstance(data, dict):
+        return None
+    return data.get('archive_hash') or data.get('archive_sha256')
+
+
+def archive_store(client: UfazienAPIClient, keep: int = DEFAULT_KEEP) -> ArchiveStore:
+    """Return the archive store kept next to the client's configuration."""
+    return ArchiveStore(client.config_dir / 'archives', keep=keep)
+
+
+class _Reporter:
+    """Sends events to the callback and times each phase."""
+
+    def __init__(self, on_event: Optional[Callable[[DeployEvent], None]], result: DeployResult):
+        self.on_event = on_event
+        self.result = result
+        self._started: Dict[str, float] = {}
+
+    def emit(self, phase: str, status: str, message: str, /, **data: Any) -> None:
+        seconds = None
+        if status == 'started':
+            self._started[phase] = time.monotonic()
+        elif status == 'finished' and phase in self._started:
+            seconds = self.result.timings[phase] = time.monotonic() - self._started.pop(phase)
+        elif status == 'warning':
+            self.result.warnings.append(message)
+        if self.on_event is not None:
+            self.on_event(DeployEvent(phase, status, message, data, seconds=seconds))
+
+
+def deploy(
+    project_dir: str,
+    *,
+    client: UfazienAPIClient,
+    options: Optional[DeployOptions] = None,
+    on_event: Optional[Callable[[DeployEvent], None]] = None
+) -> DeployResult:
+    """
+    Deploy a project directory that has a .ufazien.json.
+
+    Args:
+        project_dir: Project directory
+        client: Authenticated client; its upload throttle, if set, applies to the upload
+        options: Deploy options (defaults to DeployOptions())
+        on_event: Called with a DeployEvent as each phase starts and finishes
+
+    Returns:
+        The deploy result
+
+    Raises:
+        BudgetExceeded: A size budget was exceeded before anything was uploaded
+        DeploymentFailed: With ``options.wait``, the deployment failed or timed out
+        DeployError: Any other phase failed
+    """
+    options = options or DeployOptions()
+    started = time.monotonic()
+
+    config = find_website_config(project_dir)
+    if not config:
+        raise DeployError(f".ufazien.json not found in {project_dir}", 'config')
+    website_id = config.get('website_id')
+    if not website_id:
+        raise DeployError("website_id not found in .ufazien.json", 'config')
+    if options.archive_format not in ('auto', 'zip', 'tar.zst'):
+        raise DeployError("archive_format must be 'auto', 'zip' or 'tar.zst'", 'config')
+    try:
+        budgets = load_budgets(config)
+    except ValueError as e:
+        raise DeployError(f"Error in .ufazien.json budgets: {e}", 'config')
+
+    result = DeployResult(website_id=website_id, status='unchanged', domain=config.get('domain'))
+    reporter = _Reporter(on_event, result)
+    emit = reporter.emit
+
+    settings = deploy_settings(
+        config, options.reproducible, options.precompress, options.minify, options.fingerprint
+    )
+    from_git = options.from_git or bool(options.git_ref)
+    build_folder = config.get('build_folder') if config.get('website_type') == 'build' else None
+
+    # Scan files and skip deploys of an unchanged tree
+    emit('scan', 'started', "Scanning files", build_folder=build_folder, git_ref=options.git_ref)
+    try:
+        files = list_deploy_files(project_dir, config, from_git, options.git_ref)
+        deploy_state = load_deploy_state(client.config_dir, website_id)
+        tree_fingerprint, file_index = compute_tree_fingerprint(files, deploy_state.get('files'), settings)
+    except Exception as e:
+        raise DeployError(f"Error scanning files: {e}", 'scan')
+    result.fingerprint = tree_fingerprint
+    result.files = len(files)
+    emit('scan', 'finished', f"Found {len(files)} file(s)", files=len(files), fingerprint=tree_fingerprint)
+
+    if not options.force and deploy_state.get('fingerprint') == tree_fingerprint:
+        server_hash = None
+        if deploy_state.get('archive_hash'):
+            try:
+                server_hash = server_archive_hash(client.get_website(website_id, use_cache=False))
+            except Exception:
+                pass
+        if server_hash is None or server_hash == deploy_state['archive_hash']:
+            result.duration = time.monotonic() - started
+            return result
+        emit('scan', 'warning', "The deployed archive differs from the last deploy made here.")
+
+    if settings['compile_env']:
+        emit('env', 'started', "Compiling .env")
+        try:
+            files, compiled = compile_env_files(files)
+        except Exception as e:
+            raise DeployError(f"Error compiling .env: {e}", 'env')
+        emit('env', 'finished', f"Compiled {compiled} .env file(s)", files=compiled)
+
+    if settings['minify']:
+        emit('minify', 'started', "Minifying assets")
+        try:
+            files, minify_report = minify_assets(files, exclude=settings['minify_exclude'])
+        except Exception as e:
+            raise DeployError(f"Error minifying assets: {e}", 'minify')
+        emit('minify', 'finished', f"Minified {len(minify_report)} file(s)", report=minify_report)
+
+    manifest: Dict[str, str] = {}
+    if settings['fingerprint']:
+        emit('fingerprint', 'started', "Fingerprinting assets")
+        try:
+            files, manifest = fingerprint_assets(files, exclude=settings['fingerprint_exclude'])
+        except Exception as e:
+            raise DeployError(f"Error fingerprinting assets: {e}", 'fingerprint')
+        emit('fingerprint', 'finished', f"Fingerprinted {len(manifest)} asset(s)", manifest=manifest)
+
+    if settings['service_worker']:
+        emit('service_worker', 'started', "Building service worker precache manifest")
+        try:
+            files, precached = add_precache_manifest(files, exclude=settings['service_worker_exclude'])
+        except Exception as e:
+            raise DeployError(f"Error building the service worker precache manifest: {e}", 'service_worker')
+        emit('service_worker', 'finished', f"Precaching {precached} file(s) in sw.js", files=precached)
+
+    if settings['precompress']:
+        emit('precompress', 'started', "Precompressing assets")
+        try:
+            files, counts = add_precompressed_sidecars(files)
+        except Exception as e:
+            raise DeployError(f"Error precompressing assets: {e}", 'precompress')
+        emit('precompress', 'finished', "Precompressed assets", gz=counts['gz'], br=counts['br'])
+
+    if settings['htaccess'] or (settings['htaccess'] is None and has_managed_htaccess(files)):
+        emit('htaccess', 'started', "Updating .htaccess")
+        try:
+            files, htaccess = sync_htaccess_files(files, manifest, add_block=bool(settings['htaccess']))
+        except Exception as e:
+            raise DeployError(f"Error updating .htaccess: {e}", 'htaccess')
+        emit('htaccess', 'finished', "Updated .htaccess cache rules", **htaccess)
+
+    # Check size budgets before spending time on the archive
+    budget_sizes = None
+    if budgets:
+        emit('budgets', 'started', "Checking size budgets")
+        try:
+            checks, budget_sizes = check_file_budgets(files, budgets, deploy_state)
+        except Exception as e:
+            raise DeployError(f"Error checking size budgets: {e}", 'budgets')
+        result.budget_checks = checks
+        emit('budgets', 'finished', "Checked size budgets", checks=checks)
+        if not all(check['ok'] for check in checks):
+            raise BudgetExceeded("Size budget exceeded. Nothing was uploaded.", checks)
+
+    # Create archive (tar.zst when both sides support it, ZIP otherwise)
+    archive_format = options.archive_format
+    if archive_format == 'auto':
+        archive_format = client.negotiate_archive_format(available_archive_formats())
+    label = 'ZIP' if archive_format == 'zip' else archive_format
+    max_archive_size = budgets['compressed_size'] if budgets else None
+    emit('archive', 'started', f"Creating {label} archive", format=archive_format)
+    try:
+        create_archive = create_tar_zst_from_files if archive_format == 'tar.zst' else create_zip_from_files
+        archive_path = create_archive(files, reproducible=settings['reproducible'], max_size=max_archive_size)
+    except ArchiveSizeExceeded as e:
+        checks = check_archive_budget(e.size, budgets or {}, deploy_state)
+        result.budget_checks.extend(checks)
+        raise BudgetExceeded(
+            f"Archive exceeds the {e.limit} byte budget (stopped at {e.size} bytes).", checks, e.size, e.limit
+        )
+    except Exception as e:
+        raise DeployError(f"Error creating {label} file: {e}", 'archive')
+
+    try:
+        result.archive_format = archive_format
+        result.archive_size = os.path.getsize(archive_path)
+        result.archive_sha256 = file_sha256(Path(archive_path))
+        archive_checks = check_archive_budget(result.archive_size, budgets, deploy_state) if budgets else []
+        result.budget_checks.extend(archive_checks)
+        if budget_sizes is not None:
+            budget_sizes['compressed_size'] = result.archive_size
+        emit(
+            'archive', 'finished', f"Created {label} archive",
+            format=archive_format, size=result.archive_size, sha256=result.archive_sha256,
+            reproducible=settings['reproducible'], checks=archive_checks,
+        )
+
+        # Upload files
+        emit('upload', 'started', "Uploading files", bytes=result.archive_size)
+        try:
+            response = client.upload_archive(website_id, archive_path, archive_format)
+        except Exception as e:
+            raise DeployError(f"Error uploading files: {e}", 'upload')
+        throttle = client.upload_throttle
+        emit(
+            'upload', 'finished', "Files uploaded successfully",
+            bytes=result.archive_size, throttled_seconds=throttle.throttled_seconds if throttle else 0.0,
+        )
+
+        # Trigger deployment
+        emit('trigger', 'started', "Triggering deployment")
+        try:
+            result.deployment = client.deploy_website(website_id)
+        except Exception as e:
+            result.status = 'uploaded'
+            emit('trigger', 'warning', f"Could not trigger deployment: {e}")
+        else:
+            result.status = 'deployed'
+            emit(
+                'trigger', 'finished', "Deployment triggered successfully",
+                status=result.deployment.get('status', 'queued'), deployment_id=result.deployment.get('id'),
+            )
+
+        # Keep the archive for `ufazien rollback`
+        keep = config.get('rollback_history', DEFAULT_KEEP)
+        if result.deployment is not None and keep:
+            try:
+                archive_store(client, keep).add(website_id, archive_path, archive_format, tree_fingerprint)
+            except (OSError, ValueError) as e:
+                emit('store', 'warning', f"Could not store archive for rollback: {e}")
+    finally:
+        try:
+            os.remove(archive_path)
+        except OSError:
+            pass
+
+    if options.wait:
+        if result.deployment is None:
+            raise DeploymentFailed("Cannot wait for a deployment that was not triggered.")
+        emit('wait', 'started', "Waiting for deployment")
+        try:
+            result.wait = client.wait_for_deployment(
+                website_id,
+                result.deployment,
+                timeout=options.timeout,
+                on_status=lambda s: emit('wait', 'progress', f"Deployment {s}", status=s)
+            )
+        except Exception as e:
+            raise DeployError(f"Error tracking deployment: {e}", 'wait')
+        wait_result = result.wait
+        emit(
+            'wait', 'finished', f"Deployment {wait_result['status']}",
+            status=wait_result['status'], queue_time=wait_result['queue_time'], build_time=wait_result['build_time'],
+        )
+        if wait_result['timed_out']:
+            raise DeploymentFailed(
+                f"Timed out after {options.timeout:g}s waiting for the deployment.", wait_result
+            )
+        if not wait_result['succeeded']:
+            website = wait_result['website']
+            latest = website.get('latest_deployment') or website.get('last_deployment')
+            if not isinstance(latest, dict):
+                latest = {}
+            error_msg = latest.get('error_message') or website.get('error_message') or 'Unknown error'
+            raise DeploymentFailed(f"Deployment failed: {error_msg}", wait_result)
+
+    if result.deployment is not None:
+        try:
+            save_deploy_state(client.config_dir, website_id, {
+                'fingerprint': tree_fingerprint,
+                'files': file_index,
+                'archive_hash': server_archive_hash(response) or server_archive_hash(result.deployment),
+                'sizes': budget_sizes,
+                'deployed_at': time.time(),
+            })
+        except OSError as e:
+            emit('state', 'warning', f"Could not record deploy state: {e}")
+
+    result.duration = time.monotonic() - started
+    return result
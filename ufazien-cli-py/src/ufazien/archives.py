@@ -0,0 +1,173 @@
+"""
+Content-addressed store of deployed archives, used by ``ufazien rollback``.
+
+Archives live under ~/.ufazien/archives/objects, named by their SHA-256, so
+a tree deployed to several websites (or deployed again later) is stored
+once. Each website keeps a newest-first history of the archives deployed
+from this machine in ~/.ufazien/archives/websites/<website_id>.json.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ufazien.utils import file_sha256
+
+DEFAULT_KEEP = 5
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+ARCHIVE_EXTENSIONS = {'zip': '.zip', 'tar.zst': '.tar.zst'}
+
+# Bare numbers shorter than this are positions; longer ones are hash prefixes.
+MIN_HASH_PREFIX = 4
+
+
+class ArchiveStore:
+    """Per-website history of deployed archives with LRU and byte-cap eviction."""
+
+    def __init__(self, root: Path, keep: int = DEFAULT_KEEP, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the store.
+
+        Args:
+            root: Store directory (usually ~/.ufazien/archives)
+            keep: Archives kept per website
+            max_bytes: Total size above which least recently used archives are evicted
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.websites_dir = self.root / 'websites'
+        self.keep = keep
+        self.max_bytes = max_bytes
+
+    def object_path(self, entry: Dict[str, Any]) -> Path:
+        """Return the stored archive for a history entry."""
+        return self.objects_dir / f"{entry['hash']}{ARCHIVE_EXTENSIONS[entry['format']]}"
+
+    def history(self, website_id: str) -> List[Dict[str, Any]]:
+        """Return a website's deployed archives, newest first, skipping evicted ones."""
+        path = self.websites_dir / f'{website_id}.json'
+        try:
+            with open(path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return []
+        return [entry for entry in entries if self.object_path(entry).exists()]
+
+    def _save_history(self, website_id: str, entries: List[Dict[str, Any]]) -> None:
+        self.websites_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.websites_dir, suffix='.tmp')
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.websites_dir / f'{website_id}.json')
+
+    def add(
+        self,
+        website_id: str,
+        archive_path: str,
+        archive_format: str,
+        fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Store a deployed archive and make it the newest entry of a website's history.
+
+        Args:
+            website_id: Website ID
+            archive_path: Archive that was uploaded
+            archive_format: 'zip' or 'tar.zst'
+            fingerprint: Tree fingerprint of the deployed files
+
+        Returns:
+            The new history entry
+        """
+        entry = {
+            'hash': file_sha256(Path(archive_path)),
+            'format': archive_format,
+            'size': os.path.getsize(archive_path),
+            'fingerprint': fingerprint,
+            'deployed_at': time.time(),
+        }
+        target = self.object_path(entry)
+        if not target.exists():
+            self.objects_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, suffix='.tmp')
+            os.close(fd)
+            try:
+                shutil.copyfile(archive_path, tmp_path)
+                os.replace(tmp_path, target)
+            except OSError:
+                os.remove(tmp_path)
+                raise
+        self.touch(entry)
+        self.promote(website_id, entry)
+        return entry
+
+    def promote(self, website_id: str, entry: Dict[str, Any]) -> None:
+        """Make an entry the newest (currently deployed) one and trim the history."""
+        entry = dict(entry, deployed_at=time.time())
+        entries = [e for e in self.history(website_id) if e['hash'] != entry['hash']]
+        self._save_history(website_id, [entry] + entries[:self.keep - 1])
+        self._evict()
+
+    def touch(self, entry: Dict[str, Any]) -> None:
+        """Mark a stored archive as recently used."""
+        try:
+            os.utime(self.object_path(entry), None)
+        except OSError:
+            pass
+
+    def resolve(self, website_id: str, ref: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Find a history entry by position or hash.
+
+        Positions are written ``~N``, or as a bare number shorter than
+        MIN_HASH_PREFIX digits; anything else is a hash prefix, so an
+        all-digit prefix such as ``1234`` still finds its archive.
+
+        Args:
+            website_id: Website ID
+            ref: Deploys back (``~N`` or ``N``; 0 is the current one, default 1) or a hash prefix
+
+        Returns:
+            The matching entry, or None
+        """
+        entries = self.history(website_id)
+        position = '1' if ref is None else ref[1:] if ref.startswith('~') else ref
+        if position.isdigit() and (ref is None or ref.startswith('~') or len(ref) < MIN_HASH_PREFIX):
+            index = int(position)
+            return entries[index] if index < len(entries) else None
+        matches = [entry for entry in entries if entry['hash'].startswith(ref.lower())]
+        return matches[0] if len(matches) == 1 else None
+
+    def _evict(self) -> None:
+        referenced = set()
+        for path in self.websites_dir.glob('*.json'):
+            try:
+                with open(path, 'r') as f:
+                    referenced.update(self.object_path(entry).name for entry in json.load(f))
+            except (OSError, json.JSONDecodeError, KeyError):
+                continue
+
+        objects = []
+        total = 0
+        for path in self.objects_dir.glob('*'):
+            if path.name.endswith('.tmp'):
+                continue
+            if path.name not in referenced:
+                path.unlink()
+                continue
+            stat = path.stat()
+            objects.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        # Least recently used first, always keeping the newest archive;
+        # history files drop evicted archives on read.
+        for _, size, path in sorted(objects)[:-1]:
+            if total <= self.max_bytes:
+                break
+            path.unlink()
+            total -= size
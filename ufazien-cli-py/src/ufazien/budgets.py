@@ -0,0 +1,160 @@
+"""
+Deploy size budgets.
+
+Budgets are configured in .ufazien.json, for example::
+
+    "budgets": {
+        "total_size": "20 MB",
+        "compressed_size": "5 MB",
+        "file_size": "2 MB",
+        "files": [
+            {"path": "*.js", "max_size": "250 KB", "compression": "gzip"},
+            {"path": "images/", "max_size": "500 KB", "compression": "none"}
+        ]
+    }
+
+``total_size`` and ``file_size`` limit uncompressed bytes, ``compressed_size``
+limits the archive that is uploaded, and each ``files`` entry limits every
+matching file after the given compression (gzip by default). Sizes are byte
+counts or strings with a B/KB/MB/GB suffix (powers of 1024).
+"""
+
+import gzip
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ufazien.transforms import matches_patterns
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*(B|KB|K|MB|M|GB|G)?\s*$', re.IGNORECASE)
+_UNITS = {'B': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+COMPRESSIONS = ('gzip', 'brotli', 'none')
+
+
+def parse_size(value: Any) -> int:
+    """Parse a byte count such as 250000, "250 KB" or "1.5MB"."""
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid size: {value!r}")
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = _SIZE.match(str(value))
+    if not match:
+        raise ValueError(f"Invalid size: {value!r}")
+    unit = (match.group(2) or 'B').upper()[0]
+    return int(float(match.group(1)) * _UNITS[unit])
+
+
+def load_budgets(config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Read and validate the budgets section of .ufazien.json.
+
+    Returns:
+        Normalized budgets with sizes in bytes, or None if none are configured
+
+    Raises:
+        ValueError: If the budgets section is malformed
+    """
+    raw = config.get('budgets')
+    if not raw:
+        return None
+    if not isinstance(raw, dict):
+        raise ValueError("'budgets' must be an object")
+
+    budgets: Dict[str, Any] = {'files': []}
+    for key in ('total_size', 'compressed_size', 'file_size'):
+        budgets[key] = parse_size(raw[key]) if raw.get(key) is not None else None
+    for entry in raw.get('files', []):
+        if not isinstance(entry, dict) or 'path' not in entry or 'max_size' not in entry:
+            raise ValueError("Each entry in 'budgets.files' needs 'path' and 'max_size'")
+        compression = entry.get('compression', 'gzip')
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression {compression!r}; use one of {', '.join(COMPRESSIONS)}")
+        if compression == 'brotli' and brotli is None:
+            raise ValueError("Brotli budgets need the optional 'brotli' package")
+        budgets['files'].append({
+            'path': entry['path'],
+            'max_size': parse_size(entry['max_size']),
+            'compression': compression,
+        })
+    return budgets
+
+
+def compressed_size(file_path: Path, compression: str) -> int:
+    """Return the size of a file after compression."""
+    data = file_path.read_bytes()
+    if compression == 'gzip':
+        return len(gzip.compress(data, compresslevel=9, mtime=0))
+    if compression == 'brotli':
+        return len(brotli.compress(data))
+    return len(data)
+
+
+def _check(name: str, limit: int, size: int, previous: Optional[int]) -> Dict[str, Any]:
+    return {'name': name, 'limit': limit, 'size': size, 'previous': previous, 'ok': size <= limit}
+
+
+def check_file_budgets(
+    files: List[Tuple[Path, str]],
+    budgets: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Check the total, per-file and per-glob budgets of a file set.
+
+    Only needs file sizes, plus compression of files matched by a ``files``
+    entry, so it runs before the archive is built.
+
+    Args:
+        files: (path, archive name) pairs that would be uploaded
+        budgets: Budgets as returned by load_budgets
+        previous: State of the previous deploy (see load_deploy_state), for the diff
+
+    Returns:
+        Tuple of check results and the sizes to record in the deploy state
+    """
+    previous = previous or {}
+    previous_sizes = previous.get('sizes') or {}
+    previous_files = previous_sizes.get('files', {})
+    sizes = {arcname: path.stat().st_size for path, arcname in files}
+    recorded: Dict[str, Any] = {'total_size': sum(sizes.values()), 'files': {}}
+    checks = []
+
+    if budgets.get('total_size') is not None:
+        checks.append(_check(
+            'Total size', budgets['total_size'], recorded['total_size'], previous_sizes.get('total_size')
+        ))
+
+    if budgets.get('file_size') is not None:
+        for arcname, size in sizes.items():
+            recorded['files'][arcname] = size
+            if size > budgets['file_size']:
+                checks.append(_check(arcname, budgets['file_size'], size, previous_files.get(arcname)))
+
+    for entry in budgets.get('files', []):
+        for path, arcname in files:
+            if not matches_patterns(arcname, [entry['path']]):
+                continue
+            key = f"{arcname} ({entry['compression']})" if entry['compression'] != 'none' else arcname
+            size = compressed_size(path, entry['compression'])
+            recorded['files'][key] = size
+            checks.append(_check(key, entry['max_size'], size, previous_files.get(key)))
+
+    return checks, recorded
+
+
+def check_archive_budget(
+    archive_size: int,
+    budgets: Dict[str, Any],
+    previous: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Check the compressed archive size budget against the previous deploy state."""
+    if budgets.get('compressed_size') is None:
+        return []
+    previous_size = ((previous or {}).get('sizes') or {}).get('compressed_size')
+    return [_check('Archive size', budgets['compressed_size'], archive_size, previous_size)]
@@ -0,0 +1,191 @@
+"""
+On-disk HTTP cache for read-only API calls.
+
+Responses are stored under ~/.ufazien/cache together with their ETag and
+Last-Modified validators, keyed by endpoint within a namespace (the API base
+URL and the logged-in user) so different servers or accounts never share
+entries. Fresh entries are served without touching the
+network; stale ones are revalidated with If-None-Match / If-Modified-Since.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Endpoint prefix -> seconds an entry is served without revalidation.
+# First match wins, so more specific prefixes come first.
+DEFAULT_TTLS: List[Tuple[str, int]] = [
+    ('/auth/user/', 300),
+    ('/hosting/capabilities/', 3600),
+    ('/hosting/domains/available/', 300),
+    ('/hosting/databases/', 15),
+    ('/hosting/websites/', 30),
+]
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+
+
+class ResponseCache:
+    """Size-bounded LRU cache of JSON API responses."""
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttls: Optional[List[Tuple[str, int]]] = None,
+        namespace: str = ''
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Total size above which least recently used entries are evicted
+            ttls: Endpoint prefix to TTL mapping (defaults to DEFAULT_TTLS)
+            namespace: Key prefix separating API servers and users sharing the directory
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttls = ttls if ttls is not None else DEFAULT_TTLS
+        self.namespace = namespace
+
+    def _entry_path(self, endpoint: str) -> Path:
+        key = f'{self.namespace}\n{endpoint}'
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / f'{digest}.json'
+
+    def ttl_for(self, endpoint: str) -> Optional[int]:
+        """Return the TTL for an endpoint, or None if it is not cacheable."""
+        for prefix, ttl in self.ttls:
+            if endpoint.startswith(prefix):
+                return ttl
+        return None
+
+    def get(self, endpoint: str) -> Optional[Dict[str, Any]]:
+        """Return the stored entry for an endpoint and mark it as recently used."""
+        path = self._entry_path(endpoint)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path, None)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if entry.get('endpoint') != endpoint or entry.get('namespace', '') != self.namespace:
+            return None
+        return entry
+
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry can be served without revalidation."""
+        ttl = self.ttl_for(entry['endpoint'])
+        if ttl is None:
+            return False
+        return time.time() - entry.get('stored_at', 0) < ttl
+
+    @staticmethod
+    def conditional_headers(entry: Dict[str, Any]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry."""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(
+        self,
+        endpoint: str,
+        body: Any,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> None:
+        """Store a response body and its validators."""
+        self._write(self._entry_path(endpoint), {
+            'namespace': self.namespace,
+            'endpoint': endpoint,
+            'stored_at': time.time(),
+            'etag': etag,
+            'last_modified': last_modified,
+            'body': body,
+        })
+        self._evict()
+
+    def revalidated(self, entry: Dict[str, Any]) -> None:
+        """Restart the TTL of an entry after a 304 Not Modified."""
+        entry['stored_at'] = time.time()
+        self._write(self._entry_path(entry['endpoint']), entry)
+
+    def invalidate(self, endpoint: str) -> None:
+        """
+        Drop cached entries affected by a mutating call on an endpoint.
+
+        Invalidation is per collection: a write to /hosting/websites/<id>/deploy/
+        drops the website list and every cached website. Only entries in the
+        current namespace are affected.
+        """
+        segments = [s for s in endpoint.split('/') if s]
+        if not segments or segments[0] == 'auth':
+            self.clear()
+            return
+        prefix = '/' + '/'.join(segments[:2]) + '/'
+        for path, entry in self._entries():
+            if entry.get('namespace', '') == self.namespace and entry.get('endpoint', '').startswith(prefix):
+                self._remove(path)
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for path in self.cache_dir.glob('*.json'):
+            self._remove(path)
+
+    def _entries(self) -> List[Tuple[Path, Dict[str, Any]]]:
+        entries = []
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                with open(path, 'r') as f:
+                    entries.append((path, json.load(f)))
+            except (OSError, json.JSONDecodeError):
+                self._remove(path)
+        return entries
+
+    def _write(self, path: Path, entry: Dict[str, Any]) -> None:
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix='.entry.', suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entry, f)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+            tmp_path = None
+        except OSError:
+            pass
+        finally:
+            if tmp_path:
+                self._remove(Path(tmp_path))
+
+    def _evict(self) -> None:
+        files = []
+        total = 0
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        files.sort()
+        for _, size, path in files:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
@@ -2,11 +2,15 @@
 Ufazien CLI - Main entry point using Typer and Rich.
 """
 
+import json
 import os
 import sys
 import time
 import getpass
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 # Windows consoles default to cp1252, which cannot encode the emoji in the UI.
 for _stream in (sys.stdout, sys.stderr):
@@ -18,18 +22,47 @@ for _stream in (sys.stdout, sys.stderr):
 import typer
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import (
+    BarColumn,
+    DownloadColumn,
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    TimeRemainingColumn,
+    TransferSpeedColumn,
+)
 from rich.prompt import Prompt, Confirm
+from rich.status import Status
 from rich.table import Table
 
 from ufazien import __version__
+from ufazien.api import (
+    BudgetExceeded,
+    DeployError,
+    DeployEvent,
+    DeploymentFailed,
+    DeployOptions,
+    archive_store,
+    deploy_settings,
+    list_deploy_files,
+    server_archive_hash,
+)
+from ufazien.api import deploy as deploy_project
+from ufazien.archives import DEFAULT_KEEP
+from ufazien.budgets import parse_size
 from ufazien.client import UfazienAPIClient
+from ufazien.database import COMPRESSION_EXTENSIONS, COMPRESSIONS, export_dump, import_dump
+from ufazien.events import EventStream
 from ufazien.utils import (
-    create_zip,
-    create_zip_from_folder,
+    compute_tree_fingerprint,
+    create_zip_from_files,
     find_website_config,
     generate_random_alphabetic,
+    index_fingerprint,
+    load_deploy_state,
+    save_deploy_state,
     save_website_config,
+    should_exclude_file,
     subdomain_sanitize
 )
 from ufazien.project import (
@@ -42,6 +75,10 @@ from ufazien.project import (
     create_static_project_structure,
     create_build_project_structure,
 )
+from ufazien.operations import PendingOperations, operation_id
+from ufazien.report import build_deploy_report
+from ufazien.upload import UploadThrottle
+from ufazien.watch import PollingWatcher, create_watcher, list_watch_dirs
 
 console = Console()
 
@@ -57,23 +94,56 @@ def version_callback(value: bool) -> None:
         console.print(f"ufazien CLI version {__version__}")
         raise typer.Exit()
 
+# Set by --output json: commands then write NDJSON events instead of Rich output.
+events: Optional[EventStream] = None
+
+
 @app.callback(invoke_without_command=True)
-def main(
+def _callback(
     ctx: typer.Context,
     version: bool = typer.Option(None, "--version", "-V", callback=version_callback, is_eager=True, help="Show version and exit"),
+    output: str = typer.Option(
+        "text", "--output", "-o", envvar="UFAZIEN_OUTPUT",
+        help="Output format: text, or json for newline-delimited JSON events"
+    ),
 ) -> None:
     """🚀 Ufazien CLI - Deploy web applications on Ufazien platform."""
+    global events
+    if output not in ('text', 'json'):
+        console.print("[red]✗ Error: --output must be 'text' or 'json'.[/red]")
+        raise typer.Exit(1)
+    events = EventStream(ctx.invoked_subcommand) if output == 'json' else None
     if ctx.invoked_subcommand is None:
         console.print(app.info.help)
         raise typer.Exit()
 
 
+def _fail(message: str, code: int = 1, phase: Optional[str] = None, hint: Optional[str] = None) -> typer.Exit:
+    """Report an error (as an event in JSON mode) and return the Exit to raise."""
+    if events is not None:
+        events.emit('error', phase=phase, message=message, exit_code=code)
+    else:
+        console.print(f"[red]✗ {message}[/red]")
+        if hint:
+            console.print(hint)
+    return typer.Exit(code)
+
+
+def _say(*objects: Any) -> None:
+    """Print to the console, except in JSON mode."""
+    if events is None:
+        console.print(*objects)
+
+
+def _spinner(message: str) -> Any:
+    """A Rich status spinner, or a no-op context in JSON mode."""
+    return nullcontext() if events is not None else console.status(message, spinner="dots")
+
+
 def require_auth(client: UfazienAPIClient) -> None:
     """Check if user is authenticated, exit if not."""
     if not client.access_token:
-        console.print("[red]✗ Error: Not logged in.[/red]")
-        console.print("Please run [cyan]ufazien login[/cyan] first.")
-        raise typer.Exit(1)
+        raise _fail("Error: Not logged in.", hint="Please run [cyan]ufazien login[/cyan] first.")
 
 
 @app.command()
@@ -82,40 +152,65 @@ def login(
     password: Optional[str] = typer.Option(None, "--password", "-p", help="Password (not recommended)"),
 ) -> None:
     """Login to your Ufazien account."""
-    console.print(Panel.fit("[bold cyan]🔐 Login to Ufazien[/bold cyan]", border_style="cyan"))
+    if events is None:
+        console.print(Panel.fit("[bold cyan]🔐 Login to Ufazien[/bold cyan]", border_style="cyan"))
 
-    if not email:
+    if not email and events is None:
         email = Prompt.ask("Email")
     if not password:
         password = getpass.getpass("Password: ")
 
     if not email or not password:
-        console.print("[red]✗ Error: Email and password are required.[/red]")
-        raise typer.Exit(1)
+        raise _fail("Error: Email and password are required.")
 
-    with console.status("[bold green]Logging in...", spinner="dots"):
+    if events is not None:
+        events.emit('login.started', email=email)
+    with _spinner("[bold green]Logging in..."):
         try:
             client = UfazienAPIClient()
             user = client.login(email, password)
-            console.print("[green]✓ Login successful![/green]")
-            console.print(f"Welcome, [bold]{user.get('first_name', '')} {user.get('last_name', '')}[/bold] ({user.get('email', '')})")
         except Exception as e:
-            console.print(f"[red]✗ Login failed: {e}[/red]")
-            raise typer.Exit(1)
+            raise _fail(f"Login failed: {e}", phase='login')
+    if events is not None:
+        events.emit('login.succeeded', user={key: user.get(key) for key in ('id', 'email', 'first_name', 'last_name')})
+        return
+    console.print("[green]✓ Login successful![/green]")
+    console.print(f"Welcome, [bold]{user.get('first_name', '')} {user.get('last_name', '')}[/bold] ({user.get('email', '')})")
 
 
 @app.command()
 def logout() -> None:
     """Logout from your Ufazien account."""
-    console.print(Panel.fit("[bold cyan]🚪 Logout from Ufazien[/bold cyan]", border_style="cyan"))
+    _say(Panel.fit("[bold cyan]🚪 Logout from Ufazien[/bold cyan]", border_style="cyan"))
 
-    with console.status("[bold yellow]Logging out...", spinner="dots"):
+    with _spinner("[bold yellow]Logging out..."):
         try:
             client = UfazienAPIClient()
             client.logout()
-            console.print("[green]✓ Logged out successfully[/green]")
         except Exception as e:
-            console.print(f"[yellow]⚠ Warning: {e}[/yellow]")
+            if events is not None:
+                events.emit('warning', phase='logout', message=str(e))
+            _say(f"[yellow]⚠ Warning: {e}[/yellow]")
+            return
+    if events is not None:
+        events.emit('logout.succeeded')
+    _say("[green]✓ Logged out successfully[/green]")
+
+
+def _resume_step(
+    pending: PendingOperations,
+    op_id: str,
+    operation: Dict[str, Any],
+    field: str,
+    func: Any,
+    **kwargs: Any
+) -> Dict[str, Any]:
+    """Return a step's stored result, or run it and store the result in the pending operation."""
+    if operation.get(field):
+        return operation[field]
+    result = func(**kwargs)
+    pending.update(op_id, **{field: result})
+    return result
 
 
 @app.command()
@@ -128,57 +223,87 @@ def create(
     build_folder_opt: Optional[str] = typer.Option(None, "--build-folder", "-b", help="Build output folder (build type only)"),
     yes: bool = typer.Option(False, "--yes", "-y", help="Accept defaults instead of prompting (implied when not a TTY)"),
     no_structure: bool = typer.Option(False, "--no-structure", help="Skip boilerplate scaffolding, which overwrites files like index.html"),
+    service_worker: bool = typer.Option(False, "--service-worker", help="Add a service worker for offline caching (static only)"),
 ) -> None:
     """Create a new website project."""
-    console.print(Panel.fit("[bold cyan]✨ Create New Website[/bold cyan]", border_style="cyan"))
+    _say(Panel.fit("[bold cyan]✨ Create New Website[/bold cyan]", border_style="cyan"))
 
-    noninteractive = yes or not sys.stdin.isatty()
+    noninteractive = yes or not sys.stdin.isatty() or events is not None
 
     client = UfazienAPIClient()
     require_auth(client)
 
     project_dir = os.getcwd()
-    console.print(f"Project directory: [dim]{project_dir}[/dim]\n")
+    _say(f"Project directory: [dim]{project_dir}[/dim]\n")
+    if events is not None:
+        events.emit('create.started', project_dir=project_dir)
 
     existing_config = find_website_config(project_dir)
     if existing_config:
-        console.print("[yellow]⚠ Warning: .ufazien.json already exists in this directory.[/yellow]")
+        _say("[yellow]⚠ Warning: .ufazien.json already exists in this directory.[/yellow]")
         if noninteractive:
-            console.print("[red]✗ Refusing to overwrite an existing .ufazien.json without confirmation.[/red]")
-            console.print("[dim]Remove it first, or run interactively.[/dim]")
-            raise typer.Exit(1)
+            raise _fail(
+                "Refusing to overwrite an existing .ufazien.json without confirmation.",
+                hint="[dim]Remove it first, or run interactively.[/dim]"
+            )
         if not Confirm.ask("Do you want to create a new website?", default=False):
-            console.print("[dim]Cancelled.[/dim]")
+            _say("[dim]Cancelled.[/dim]")
             return
 
+    # An interrupted create of this directory is resumed with its original answers.
+    create_op = operation_id('create', {'api': client.base_url, 'project_dir': project_dir})
+    resumed = None if existing_config else client.pending.get(create_op)
+    if resumed and any(
+        given is not None and given != resumed[field]
+        for given, field in ((name, 'name'), (subdomain, 'subdomain'), (website_type, 'website_type'))
+    ):
+        _say("[yellow]⚠ Discarding an interrupted create with different settings.[/yellow]")
+        _say("[dim]A website may already have been created for it; check 'ufazien sites'.[/dim]")
+        client.pending.finish(create_op)
+        resumed = None
+    if resumed:
+        _say(
+            f"[yellow]ℹ Resuming interrupted create of {resumed['name']} "
+            f"({resumed['subdomain']}.ufazien.com).[/yellow]"
+        )
+        if noninteractive or Confirm.ask("Resume it?", default=True):
+            if events is not None:
+                events.emit('create.resumed', name=resumed['name'], subdomain=resumed['subdomain'])
+            name = resumed['name']
+            subdomain = resumed['subdomain']
+            website_type = resumed['website_type']
+            description = resumed['description'] or ''
+            database = resumed['needs_database']
+            build_folder_opt = resumed['build_folder']
+        else:
+            client.pending.finish(create_op)
+            resumed = None
+
     # Get website name
     if not name and not noninteractive:
         name = Prompt.ask("Website name")
     if not name:
-        console.print("[red]✗ Error: Website name is required.[/red]")
-        console.print("[dim]Pass --name when running non-interactively.[/dim]")
-        raise typer.Exit(1)
+        raise _fail("Error: Website name is required.", hint="[dim]Pass --name when running non-interactively.[/dim]")
 
     # Get subdomain
     if not subdomain and not noninteractive:
         subdomain = Prompt.ask("Subdomain (choose a unique one)")
     if not subdomain:
-        console.print("[dim]Pass --subdomain when running non-interactively.[/dim]")
-        console.print("[red]✗ Error: Subdomain is required.[/red]")
-        raise typer.Exit(1)
+        raise _fail(
+            "Error: Subdomain is required.", hint="[dim]Pass --subdomain when running non-interactively.[/dim]"
+        )
 
     if not all(c.isalnum() or c == '-' for c in subdomain):
-        console.print("[red]✗ Error: Subdomain can only contain letters, numbers, and hyphens.[/red]")
-        raise typer.Exit(1)
+        raise _fail("Error: Subdomain can only contain letters, numbers, and hyphens.")
 
     # Get website type
     if not website_type and noninteractive:
         website_type = 'static'
     if not website_type:
-        console.print("\n[bold]Website type:[/bold]")
-        console.print("1. Static (HTML/CSS/JavaScript)")
-        console.print("2. PHP")
-        console.print("3. Build (Vite/React/etc. - deploy dist/build folder)")
+        _say("\n[bold]Website type:[/bold]")
+        _say("1. Static (HTML/CSS/JavaScript)")
+        _say("2. PHP")
+        _say("3. Build (Vite/React/etc. - deploy dist/build folder)")
         choice = Prompt.ask("Choose website type", choices=["1", "2", "3"], default="1")
         if choice == '1':
             website_type = 'static'
@@ -188,15 +313,14 @@ def create(
             website_type = 'build'
     else:
         if website_type not in ['static', 'php', 'build']:
-            console.print("[red]✗ Error: Website type must be 'static', 'php', or 'build'.[/red]")
-            raise typer.Exit(1)
+            raise _fail("Error: Website type must be 'static', 'php', or 'build'.")
 
     needs_database = False
     build_folder = None
     if website_type == 'php':
         if database:
             needs_database = True
-        elif noninteractive:
+        elif noninteractive or resumed:
             needs_database = False
         else:
             needs_database = Confirm.ask("Do you want a database?", default=True)
@@ -210,96 +334,101 @@ def create(
     if description is None and not noninteractive:
         description = Prompt.ask("Description (optional)", default="", show_default=False)
 
-    # Create website (build projects use 'static' type on the backend)
+    db_name = None
+    if needs_database:
+        db_name = resumed.get('db_name') if resumed else None
+        if not db_name:
+            db_name_from_subdomain = subdomain_sanitize(subdomain)
+            random_chars = generate_random_alphabetic(6)
+            db_name = f"{db_name_from_subdomain}_{random_chars}_db"
+
+    # Recorded before any API call; finished once .ufazien.json is saved.
+    operation = client.pending.begin(
+        create_op,
+        name=name,
+        subdomain=subdomain,
+        website_type=website_type,
+        description=description,
+        needs_database=needs_database,
+        build_folder=build_folder,
+        db_name=db_name,
+    )
+
+    # Create website and database concurrently (build projects use 'static' type on the backend)
     api_website_type = 'static' if website_type == 'build' else website_type
-    with console.status("[bold green]Creating website...", spinner="dots"):
+    executor = ThreadPoolExecutor(max_workers=2)
+    website_future = executor.submit(
+        _resume_step,
+        client.pending,
+        create_op,
+        operation,
+        'website',
+        client.create_website,
+        name=name,
+        subdomain=subdomain,
+        website_type=api_website_type,
+        description=description if description else None
+    )
+    database_future = None
+    if needs_database:
+        database_future = executor.submit(
+            _resume_step,
+            client.pending,
+            create_op,
+            operation,
+            'database',
+            client.create_database,
+            name=db_name,
+            db_type='mysql',
+            description=f"Database for {name}"
+        )
+
+    with _spinner("[bold green]Creating website..."):
         try:
-            website = client.create_website(
-                name=name,
-                subdomain=subdomain,
-                website_type=api_website_type,
-                description=description if description else None
-            )
-            console.print(f"[green]✓ Website created:[/green] {website['name']}")
-            console.print(f"  URL: [cyan]https://{website['domain']['name']}[/cyan]")
-            console.print(f"  Website ID: [dim]{website['id']}[/dim]")
+            website = website_future.result()
+            if events is not None:
+                events.emit(
+                    'website.created', website_id=website['id'], name=website['name'], domain=website['domain']['name']
+                )
+            _say(f"[green]✓ Website created:[/green] {website['name']}")
+            _say(f"  URL: [cyan]https://{website['domain']['name']}[/cyan]")
+            _say(f"  Website ID: [dim]{website['id']}[/dim]")
         except Exception as e:
-            console.print(f"[red]✗ Error creating website: {e}[/red]")
-            raise typer.Exit(1)
+            if database_future is not None:
+                try:
+                    orphan = database_future.result()
+                    _say(f"[yellow]⚠ Database {orphan['name']} was created without a website.[/yellow]")
+                except Exception:
+                    pass
+            raise _fail(
+                f"Error creating website: {e}",
+                phase='website',
+                hint="[dim]Run 'ufazien create' again in this directory to resume.[/dim]"
+            )
 
-    # Create database if needed
+    # Provisioning runs in the background while the project files are written.
     database_obj = None
-    if needs_database:
-        with console.status("[bold green]Creating database...", spinner="dots"):
+    provisioning_future = None
+    if database_future is not None:
+        with _spinner("[bold green]Creating database..."):
             try:
-                db_name_from_subdomain = subdomain_sanitize(subdomain)
-                random_chars = generate_random_alphabetic(6)
-                db_name = f"{db_name_from_subdomain}_{random_chars}_db"
-                database_obj = client.create_database(
-                    name=db_name,
-                    db_type='mysql',
-                    description=f"Database for {name}"
-                )
-                console.print(f"[green]✓ Database created:[/green] {database_obj['name']}")
-                console.print(f"  Status: {database_obj.get('status', 'creating')}")
-
-                # Wait for database provisioning
+                database_obj = database_future.result()
+                if events is not None:
+                    events.emit(
+                        'database.created',
+                        database_id=database_obj['id'],
+                        name=database_obj['name'],
+                        status=database_obj.get('status', 'creating')
+                    )
+                _say(f"[green]✓ Database created:[/green] {database_obj['name']}")
+                _say(f"  Status: {database_obj.get('status', 'creating')}")
                 if database_obj.get('status') != 'active':
-                    console.print("[dim]Waiting for database provisioning...[/dim]")
-                    max_wait = 60
-                    wait_time = 0
-                    poll_interval = 2
-
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn("[progress.description]{task.description}"),
-                        console=console,
-                    ) as progress:
-                        task = progress.add_task("Provisioning database...", total=None)
-                        while wait_time < max_wait:
-                            time.sleep(poll_interval)
-                            wait_time += poll_interval
-
-                            try:
-                                database_obj = client.get_database(database_obj['id'])
-                                status = database_obj.get('status', 'creating')
-
-                                if status == 'active':
-                                    progress.update(task, description="[green]Database is ready![/green]")
-                                    break
-                                elif status == 'error':
-                                    error_msg = database_obj.get('error_message', 'Unknown error')
-                                    console.print(f"[red]✗ Database provisioning failed: {error_msg}[/red]")
-                                    database_obj = None
-                                    break
-                            except Exception as e:
-                                console.print(f"[yellow]⚠ Error checking database status: {e}[/yellow]")
-                                break
-
-                    if wait_time >= max_wait:
-                        console.print("[yellow]⚠ Timeout waiting for database provisioning.[/yellow]")
-                        console.print("[dim]It may still be processing. Check status later.[/dim]")
-
-                if database_obj and database_obj.get('status') == 'active':
-                    try:
-                        database_obj = client.get_database(database_obj['id'])
-                    except Exception as e:
-                        console.print(f"[yellow]⚠ Warning: Could not fetch database credentials: {e}[/yellow]")
-
-                if database_obj:
-                    table = Table(show_header=False, box=None, padding=(0, 2))
-                    table.add_row("Host:", database_obj.get('host', 'N/A'))
-                    table.add_row("Port:", str(database_obj.get('port', 'N/A')))
-                    username = database_obj.get('username', '')
-                    password = database_obj.get('password', '')
-                    if username and password:
-                        table.add_row("Username:", username)
-                        table.add_row("Password:", password)
-                    console.print(table)
-
+                    provisioning_future = executor.submit(client.wait_for_database, database_obj['id'])
             except Exception as e:
-                console.print(f"[red]✗ Error creating database: {e}[/red]")
-                console.print("[dim]You can create a database later from the web dashboard.[/dim]")
+                if events is not None:
+                    events.emit('warning', phase='database', message=f"Error creating database: {e}")
+                _say(f"[red]✗ Error creating database: {e}[/red]")
+                _say("[dim]You can create a database later from the web dashboard.[/dim]")
 
     # Save before the scaffolding prompts so an abort cannot orphan the website.
     config = {
@@ -313,6 +442,9 @@ def create(
     if build_folder:
         config['build_folder'] = build_folder
     save_website_config(project_dir, config)
+    client.pending.finish(create_op)
+    if events is not None:
+        events.emit('config.saved', path=os.path.join(project_dir, '.ufazien.json'))
 
     # Scaffolding overwrites files like index.html.
     if no_structure:
@@ -323,38 +455,107 @@ def create(
         create_structure = Confirm.ask("\nCreate project structure?", default=True)
     
     # Always create essential files (regardless of create_structure choice)
-    with console.status("[bold green]Creating essential files...", spinner="dots"):
+    with _spinner("[bold green]Creating essential files..."):
         # Always create .gitignore and README.md (append if exists)
         create_gitignore(project_dir)
         create_readme_section(project_dir, website_type, name, build_folder)
         
-        if website_type == 'php':
-            # For PHP: create .env (if database) and .ufazienignore
-            if database_obj:
-                username = database_obj.get('username', '')
-                password = database_obj.get('password', '')
-                if username and password:
-                    create_env_file(project_dir, {
-                        'host': database_obj.get('host', 'mysql.ufazien.com'),
-                        'port': database_obj.get('port', 3306),
-                        'name': database_obj.get('name', ''),
-                        'username': username,
-                        'password': password
-                    })
-                    console.print("[green]✓ Created .env file with database credentials[/green]")
-                else:
-                    console.print("[yellow]⚠ Skipping .env file creation - database credentials not yet available[/yellow]")
-            create_ufazienignore(project_dir)
-        elif website_type == 'static':
-            # For Static: create .ufazienignore
+        if website_type in ('php', 'static'):
             create_ufazienignore(project_dir)
         # For Build: no .ufazienignore needed
         
-        console.print("[green]✓ Created essential files[/green]")
+        _say("[green]✓ Created essential files[/green]")
+
+    if create_structure and website_type == 'static':
+        if not service_worker and not noninteractive:
+            service_worker = Confirm.ask("Add a service worker for offline caching?", default=False)
+        with _spinner("[bold green]Creating project structure..."):
+            create_static_project_structure(project_dir, name, service_worker=service_worker)
+            _say("[green]✓ Created project structure[/green]")
+        if service_worker:
+            # Deploys fill the worker's precache manifest only when asked to.
+            config['service_worker'] = True
+            save_website_config(project_dir, config)
+
+    # Wait for database provisioning
+    if provisioning_future is not None:
+        _say("[dim]Waiting for database provisioning...[/dim]")
+        status: Optional[str] = None
+        if events is not None:
+            try:
+                database_obj = provisioning_future.result()
+                status = database_obj.get('status', 'creating')
+                events.emit('database.provisioned', database_id=database_obj['id'], status=status)
+            except Exception as e:
+                events.emit('warning', phase='database', message=f"Error checking database status: {e}")
+        else:
+            with Progress(
+                SpinnerColumn(),
+                TextColumn("[progress.description]{task.description}"),
+                console=console,
+            ) as progress:
+                task = progress.add_task("Provisioning database...", total=None)
+                try:
+                    database_obj = provisioning_future.result()
+                    status = database_obj.get('status', 'creating')
+                    if status == 'active':
+                        progress.update(task, description="[green]Database is ready![/green]")
+                except Exception as e:
+                    _say(f"[yellow]⚠ Error checking database status: {e}[/yellow]")
+
+        if status == 'error':
+            error_msg = database_obj.get('error_message', 'Unknown error')
+            if events is not None:
+                events.emit('warning', phase='database', message=f"Database provisioning failed: {error_msg}")
+            _say(f"[red]✗ Database provisioning failed: {error_msg}[/red]")
+            database_obj = None
+            config['database_id'] = None
+            save_website_config(project_dir, config)
+        elif status is not None and status != 'active':
+            if events is not None:
+                events.emit('warning', phase='database', message="Timeout waiting for database provisioning.")
+            _say("[yellow]⚠ Timeout waiting for database provisioning.[/yellow]")
+            _say("[dim]It may still be processing. Check status later.[/dim]")
+    executor.shutdown(wait=False)
+
+    if database_obj:
+        # The provisioning poll usually returns credentials already.
+        if database_obj.get('status') == 'active' and not (database_obj.get('username') and database_obj.get('password')):
+            try:
+                database_obj = client.get_database(database_obj['id'], use_cache=False)
+            except Exception as e:
+                _say(f"[yellow]⚠ Warning: Could not fetch database credentials: {e}[/yellow]")
+
+        if events is None:
+            table = Table(show_header=False, box=None, padding=(0, 2))
+            table.add_row("Host:", database_obj.get('host', 'N/A'))
+            table.add_row("Port:", str(database_obj.get('port', 'N/A')))
+            username = database_obj.get('username', '')
+            password = database_obj.get('password', '')
+            if username and password:
+                table.add_row("Username:", username)
+                table.add_row("Password:", password)
+            console.print(table)
+
+    if website_type == 'php' and database_obj:
+        # For PHP: create .env with the provisioned credentials
+        username = database_obj.get('username', '')
+        password = database_obj.get('password', '')
+        if username and password:
+            create_env_file(project_dir, {
+                'host': database_obj.get('host', 'mysql.ufazien.com'),
+                'port': database_obj.get('port', 3306),
+                'name': database_obj.get('name', ''),
+                'username': username,
+                'password': password
+            })
+            _say("[green]✓ Created .env file with database credentials[/green]")
+        else:
+            _say("[yellow]⚠ Skipping .env file creation - database credentials not yet available[/yellow]")
     
     # Create optional boilerplate files (only if user wants project structure)
-    if create_structure:
-        with console.status("[bold green]Creating project structure...", spinner="dots"):
+    if create_structure and website_type != 'static':
+        with _spinner("[bold green]Creating project structure..."):
             if website_type == 'php':
                 has_db = database_obj is not None and database_obj.get('status') == 'active'
                 create_php_project_structure(project_dir, name, has_database=has_db)
@@ -364,7 +565,7 @@ def create(
                     password = database_obj.get('password', '')
                     if username and password:
                         create_config_file(project_dir, database_obj)
-                        console.print("[green]✓ Created config.php[/green]")
+                        _say("[green]✓ Created config.php[/green]")
                     else:
                         create_config_file(project_dir, {
                             'host': database_obj.get('host', 'mysql.ufazien.com'),
@@ -373,28 +574,273 @@ def create(
                             'username': '',
                             'password': ''
                         })
-            elif website_type == 'static':
-                create_static_project_structure(project_dir, name)
             # Build projects don't need boilerplate files
             
-            console.print("[green]✓ Created project structure[/green]")
+            _say("[green]✓ Created project structure[/green]")
             
             if website_type == 'build':
-                console.print(f"\n[yellow]ℹ Build Project Setup:[/yellow]")
-                console.print(f"  1. Build your project (creates {build_folder} folder)")
-                console.print(f"  2. Run [cyan]ufazien deploy[/cyan] to deploy the {build_folder} folder")
+                _say(f"\n[yellow]ℹ Build Project Setup:[/yellow]")
+                _say(f"  1. Build your project (creates {build_folder} folder)")
+                _say(f"  2. Run [cyan]ufazien deploy[/cyan] to deploy the {build_folder} folder")
+
+    if events is not None:
+        events.emit(
+            'create.finished',
+            website_id=website['id'],
+            domain=website['domain']['name'],
+            website_type=website_type,
+            database_id=database_obj['id'] if database_obj else None,
+            database_status=database_obj.get('status') if database_obj else None,
+        )
+        return
 
     # Success message
-    console.print("\n[bold green]✓ Website setup complete![/bold green]")
-    console.print("\n[bold]Next steps:[/bold]")
-    console.print("  1. Add your website files to this directory")
-    console.print("  2. Run [cyan]ufazien deploy[/cyan] to deploy your website")
+    _say("\n[bold green]✓ Website setup complete![/bold green]")
+    _say("\n[bold]Next steps:[/bold]")
+    _say("  1. Add your website files to this directory")
+    _say("  2. Run [cyan]ufazien deploy[/cyan] to deploy your website")
+
+
+EXIT_DEPLOY_FAILED = 3
+EXIT_DEPLOY_TIMEOUT = 4
+EXIT_BUDGET_EXCEEDED = 5
+
+
+def _configure_upload_throttle(
+    client: UfazienAPIClient,
+    config: Dict[str, Any],
+    max_bandwidth: Optional[str],
+    adaptive: bool
+) -> None:
+    """Apply --max-bandwidth / "max_bandwidth" (or UFAZIEN_MAX_BANDWIDTH) to the client's uploads."""
+    value = max_bandwidth or config.get('max_bandwidth') or os.environ.get('UFAZIEN_MAX_BANDWIDTH')
+    adaptive = adaptive or bool(config.get('adaptive_bandwidth'))
+    if not value and not adaptive:
+        return
+    try:
+        limit = parse_size(value) if value else None
+    except ValueError:
+        raise _fail(f"Error: invalid bandwidth '{value}'. Use bytes per second, e.g. 2MB.")
+    client.upload_throttle = UploadThrottle(limit, adaptive=adaptive)
+    if events is not None:
+        events.emit('upload.throttle', max_bandwidth=limit, adaptive=adaptive)
+    elif limit:
+        mode = " (adaptive)" if adaptive else ""
+        console.print(f"[dim]Upload bandwidth limited to {_format_size(limit)}/s{mode}[/dim]")
+    else:
+        console.print("[dim]Upload bandwidth adapts to network conditions[/dim]")
+
+
+def _format_size(size: float) -> str:
+    """Format a byte count for display."""
+    for unit in ('B', 'KB', 'MB'):
+        if abs(size) < 1024:
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+def _print_minify_report(report: List[Dict[str, Any]]) -> None:
+    """Print per-file and total minification savings."""
+    original = sum(entry['original'] for entry in report)
+    minified = sum(entry['minified'] for entry in report)
+    saved = original - minified
+    percent = f" ({saved / original:.0%})" if original else ""
+    console.print(f"[green]✓ Minified {len(report)} file(s)[/green], saved {_format_size(saved)}{percent}")
+
+    table = Table(show_header=False, box=None, padding=(0, 2))
+    for entry in sorted(report, key=lambda e: e['original'] - e['minified'], reverse=True):
+        if entry['original'] == entry['minified']:
+            continue
+        table.add_row(
+            f"[dim]{entry['path']}[/dim]",
+            f"{_format_size(entry['original'])} → {_format_size(entry['minified'])}",
+            f"-{_format_size(entry['original'] - entry['minified'])}",
+        )
+    if table.row_count:
+        console.print(table)
+
+
+def _print_deploy_report(report: Dict[str, Any]) -> None:
+    """Print a deploy composition report as tables."""
+    console.print(
+        f"[bold]{report['files']} file(s)[/bold], {_format_size(report['bytes'])} uncompressed, "
+        f"~{_format_size(report['estimated_compressed_bytes'])} compressed\n"
+    )
+
+    for title, key in (("Directory", 'directories'), ("Extension", 'extensions')):
+        table = Table(box=None, padding=(0, 2))
+        table.add_column(title)
+        table.add_column("Files", justify="right")
+        table.add_column("Size", justify="right")
+        for group in report[key]:
+            table.add_row(group['name'], str(group['files']), _format_size(group['bytes']))
+        console.print(table)
+        console.print()
+
+    table = Table(box=None, padding=(0, 2))
+    table.add_column("Largest files")
+    table.add_column("Size", justify="right")
+    for entry in report['largest']:
+        table.add_row(entry['path'], _format_size(entry['bytes']))
+    console.print(table)
+
+    if report['ignored']:
+        console.print()
+        table = Table(box=None, padding=(0, 2))
+        table.add_column(".ufazienignore rule")
+        table.add_column("Hits", justify="right")
+        table.add_column("Files", justify="right")
+        table.add_column("Size", justify="right")
+        table.add_column("Match time", justify="right")
+        table.add_column("Examples")
+        for rule in report['ignored']:
+            table.add_row(
+                rule['rule'],
+                str(rule['hits']),
+                str(rule['files']),
+                _format_size(rule['bytes']),
+                f"{rule['seconds'] * 1000:.2f} ms",
+                f"[dim]{', '.join(rule['examples'])}[/dim]",
+            )
+        console.print(table)
+
+    timings = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in report['timings'].items())
+    console.print(f"\n[dim]Report timings: {timings}[/dim]")
+
+
+def _print_budget_checks(checks: List[Dict[str, Any]]) -> None:
+    """Print budget checks that failed, and totals, with the change since the last deploy."""
+    table = Table(box=None, padding=(0, 2))
+    table.add_column("Budget")
+    table.add_column("Size", justify="right")
+    table.add_column("Limit", justify="right")
+    table.add_column("Previous", justify="right")
+    table.add_column("Change", justify="right")
+    passed = 0
+    for check in checks:
+        if check['ok'] and check['name'] not in ('Total size', 'Archive size'):
+            passed += 1
+            continue
+        if check['previous'] is None:
+            previous, change = "-", "new"
+        else:
+            delta = check['size'] - check['previous']
+            previous = _format_size(check['previous'])
+            change = f"{'+' if delta >= 0 else '-'}{_format_size(abs(delta))}"
+        mark = "[green]✓[/green]" if check['ok'] else "[red]✗[/red]"
+        table.add_row(
+            f"{mark} {check['name']}", _format_size(check['size']), _format_size(check['limit']), previous, change
+        )
+    if table.row_count:
+        console.print(table)
+    if passed:
+        console.print(f"[dim]{passed} other file budget(s) within limits[/dim]")
+
+
+def _render_deploy_event(event: DeployEvent, spinner: Optional[Status]) -> None:
+    """Show a deploy progress event on the console, or write it as JSON."""
+    data = event.data
+    if events is not None:
+        events.emit(
+            'deploy.phase',
+            phase=event.phase,
+            status=event.status,
+            message=event.message,
+            seconds=round(event.seconds, 6) if event.seconds is not None else None,
+            data=data
+        )
+        return
+    assert spinner is not None
+    if event.status in ('started', 'progress'):
+        spinner.update(f"[bold green]{event.message}...")
+        if event.phase == 'scan' and data.get('build_folder'):
+            console.print(f"[dim]Deploying build folder: {data['build_folder']}[/dim]")
+        if event.phase == 'scan' and data.get('git_ref'):
+            console.print(f"[dim]Reading files from git ref: {data['git_ref']}[/dim]")
+    elif event.status == 'warning':
+        prefix = "" if event.phase == 'scan' else "Warning: "
+        console.print(f"[yellow]⚠ {prefix}{event.message}[/yellow]")
+        if event.phase == 'trigger':
+            console.print("[dim]Files have been uploaded. Deployment may start automatically.[/dim]")
+    elif event.phase == 'env':
+        if data['files']:
+            console.print(f"[green]✓ {event.message}[/green]")
+    elif event.phase == 'service_worker':
+        if data['files']:
+            console.print(f"[green]✓ {event.message}[/green]")
+    elif event.phase == 'htaccess':
+        if data['updated']:
+            console.print(
+                f"[green]✓ {event.message}[/green] ({data['fingerprinted']} fingerprinted, "
+                f"precompressed: {', '.join(sorted(data['precompressed'])) or 'none'})"
+            )
+    elif event.phase == 'minify':
+        _print_minify_report(data['report'])
+    elif event.phase == 'precompress':
+        console.print(f"[green]✓ Precompressed assets[/green] ({data['gz']} gzip, {data['br']} brotli)")
+    elif event.phase == 'budgets':
+        _print_budget_checks(data['checks'])
+    elif event.phase == 'archive':
+        console.print(f"[green]✓ {event.message}[/green] ({_format_size(data['size'])})")
+        if data['reproducible']:
+            console.print(f"  SHA-256: [dim]{data['sha256']}[/dim]")
+        if data['checks']:
+            _print_budget_checks(data['checks'])
+    elif event.phase in ('fingerprint', 'upload', 'trigger'):
+        console.print(f"[green]✓ {event.message}[/green]")
+        if data.get('throttled_seconds'):
+            console.print(f"  [dim]Throttled for {data['throttled_seconds']:.1f}s[/dim]")
+        if event.phase == 'trigger':
+            console.print(f"  Status: {data['status']}")
+
+
+def _print_wait_result(result: Dict[str, Any]) -> None:
+    """Print the status and timings of a finished (or timed out) deployment."""
+    table = Table(show_header=False, box=None, padding=(0, 2))
+    table.add_row("Status:", result['status'])
+    table.add_row("Queue time:", f"{result['queue_time']:.1f}s")
+    if result['build_time'] is not None:
+        table.add_row("Build/activation time:", f"{result['build_time']:.1f}s")
+    console.print(table)
 
 
 @app.command()
-def deploy() -> None:
+def deploy(
+    wait: bool = typer.Option(False, "--wait", help="Wait until the deployment has finished"),
+    timeout: float = typer.Option(600, "--timeout", min=1, help="Seconds to wait with --wait"),
+    force: bool = typer.Option(False, "--force", "-f", help="Deploy even if nothing has changed"),
+    reproducible: bool = typer.Option(False, "--reproducible", help="Build a byte-for-byte reproducible archive"),
+    precompress: bool = typer.Option(False, "--precompress", help="Add .gz/.br siblings for text assets"),
+    minify: bool = typer.Option(False, "--minify", help="Minify HTML, CSS, JS and JSON in the archive"),
+    fingerprint: bool = typer.Option(False, "--fingerprint", help="Rename assets to content-hashed names"),
+    archive_format: str = typer.Option("auto", "--archive-format", help="Archive format: auto, zip or tar.zst"),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Scan files without building or uploading anything"),
+    report: bool = typer.Option(False, "--report", help="Show what the archive would contain"),
+    report_format: str = typer.Option("table", "--report-format", help="Report format: table or json"),
+    top: int = typer.Option(10, "--top", min=1, help="Number of largest files in the report"),
+    from_git: bool = typer.Option(False, "--from-git", help="Deploy the files tracked by git"),
+    git_ref: Optional[str] = typer.Option(
+        None, "--git-ref", help="Deploy files from a commit, branch or tag (implies --from-git)"
+    ),
+    max_bandwidth: Optional[str] = typer.Option(
+        None, "--max-bandwidth", help="Limit upload speed, in bytes per second (e.g. 2MB)"
+    ),
+    adaptive_bandwidth: bool = typer.Option(
+        False, "--adaptive-bandwidth", help="Slow uploads down when the network gets congested"
+    ),
+) -> None:
     """Deploy your website."""
-    console.print(Panel.fit("[bold cyan]🚀 Deploy Website[/bold cyan]", border_style="cyan"))
+    if report_format not in ('table', 'json'):
+        raise _fail("Error: --report-format must be 'table' or 'json'.")
+    json_report = report and report_format == 'json'
+    if json_report and not dry_run and events is None:
+        raise _fail("Error: --report-format json requires --dry-run.")
+    # Nothing but the JSON report (or the events) goes to stdout.
+    quiet = json_report or events is not None
+
+    if not quiet:
+        console.print(Panel.fit("[bold cyan]🚀 Deploy Website[/bold cyan]", border_style="cyan"))
 
     client = UfazienAPIClient()
     require_auth(client)
@@ -403,75 +849,544 @@ def deploy() -> None:
     config = find_website_config(project_dir)
 
     if not config:
-        console.print("[red]✗ Error: .ufazien.json not found in current directory.[/red]")
-        console.print("Please run [cyan]ufazien create[/cyan] first or navigate to a project directory.")
-        raise typer.Exit(1)
+        raise _fail(
+            "Error: .ufazien.json not found in current directory.",
+            hint="Please run [cyan]ufazien create[/cyan] first or navigate to a project directory."
+        )
 
     website_id = config.get('website_id')
     if not website_id:
-        console.print("[red]✗ Error: website_id not found in .ufazien.json[/red]")
-        raise typer.Exit(1)
+        raise _fail("Error: website_id not found in .ufazien.json")
 
-    console.print(f"Website: [bold]{config.get('website_name', 'Unknown')}[/bold]")
-    console.print(f"Website ID: [dim]{website_id}[/dim]\n")
+    if archive_format not in ('auto', 'zip', 'tar.zst'):
+        raise _fail("Error: --archive-format must be 'auto', 'zip' or 'tar.zst'.")
 
-    # Check if this is a build project
-    website_type = config.get('website_type', '')
-    build_folder = config.get('build_folder')
-    
-    # Create ZIP
-    with console.status("[bold green]Creating ZIP archive...", spinner="dots"):
+    if events is not None:
+        events.emit('deploy.started', website_id=website_id, website_name=config.get('website_name'))
+    elif not quiet:
+        console.print(f"Website: [bold]{config.get('website_name', 'Unknown')}[/bold]")
+        console.print(f"Website ID: [dim]{website_id}[/dim]\n")
+
+    if report or dry_run:
+        website_type = config.get('website_type', '')
+        build_folder = config.get('build_folder')
+        with _spinner("[bold green]Scanning files..."):
+            try:
+                if website_type == 'build' and build_folder and not quiet:
+                    console.print(f"[dim]Deploying build folder: {build_folder}[/dim]")
+                if git_ref and not quiet:
+                    console.print(f"[dim]Reading files from git ref: {git_ref}[/dim]")
+                files = list_deploy_files(project_dir, config, from_git or bool(git_ref), git_ref)
+            except Exception as e:
+                raise _fail(f"Error scanning files: {e}", phase='scan')
+
+        if report:
+            with _spinner("[bold green]Analyzing files..."):
+                try:
+                    deploy_report = build_deploy_report(
+                        files, project_dir, ignore_rules=not (website_type == 'build' and build_folder), top=top
+                    )
+                except Exception as e:
+                    raise _fail(f"Error building report: {e}", phase='report')
+            if events is not None:
+                events.emit('deploy.report', report=deploy_report)
+            elif json_report:
+                typer.echo(json.dumps(deploy_report, indent=2))
+            else:
+                _print_deploy_report(deploy_report)
+
+        if dry_run:
+            total = sum(path.stat().st_size for path, _ in files)
+            if events is not None:
+                events.emit('deploy.dry_run', website_id=website_id, files=len(files), bytes=total)
+            elif not json_report:
+                console.print(
+                    f"\n[green]✓ Dry run:[/green] {len(files)} file(s), {_format_size(total)} would be deployed."
+                )
+            return
+
+    _configure_upload_throttle(client, config, max_bandwidth, adaptive_bandwidth)
+    options = DeployOptions(
+        force=force,
+        reproducible=reproducible,
+        precompress=precompress,
+        minify=minify,
+        fingerprint=fingerprint,
+        archive_format=archive_format,
+        from_git=from_git,
+        git_ref=git_ref,
+        wait=wait,
+        timeout=timeout,
+    )
+    with _spinner("[bold green]Scanning files...") as spinner:
         try:
-            if website_type == 'build' and build_folder:
-                console.print(f"[dim]Deploying build folder: {build_folder}[/dim]")
-                zip_path = create_zip_from_folder(project_dir, build_folder)
+            result = deploy_project(
+                project_dir,
+                client=client,
+                options=options,
+                on_event=lambda event: _render_deploy_event(event, spinner)
+            )
+        except BudgetExceeded as e:
+            if events is not None:
+                raise _fail(str(e), EXIT_BUDGET_EXCEEDED, phase=e.phase)
+            if e.limit is not None:
+                _print_budget_checks(e.checks)
+                console.print(
+                    f"[red]✗ Archive exceeds the {_format_size(e.limit)} budget "
+                    f"(stopped at {_format_size(e.size or 0)}). Nothing was uploaded.[/red]"
+                )
             else:
-                zip_path = create_zip(project_dir)
-            console.print(f"[green]✓ Created ZIP archive[/green]")
+                console.print(f"[red]✗ {e}[/red]")
+            raise typer.Exit(EXIT_BUDGET_EXCEEDED)
+        except DeploymentFailed as e:
+            if e.result is not None and events is None:
+                _print_wait_result(e.result)
+            raise _fail(str(e), EXIT_DEPLOY_TIMEOUT if e.timed_out else EXIT_DEPLOY_FAILED, phase=e.phase)
+        except DeployError as e:
+            raise _fail(str(e), EXIT_DEPLOY_FAILED if e.phase == 'wait' else 1, phase=e.phase)
+
+    if events is not None:
+        events.emit(
+            'deploy.finished',
+            website_id=website_id,
+            status=result.status,
+            url=f"https://{config.get('domain', '')}",
+            files=result.files,
+            bytes=result.archive_size,
+            archive_format=result.archive_format,
+            archive_sha256=result.archive_sha256,
+            deployment_id=(result.deployment or {}).get('id'),
+            deployment_status=result.wait['status'] if result.wait else None,
+            timings={phase: round(seconds, 6) for phase, seconds in result.timings.items()},
+            duration=round(result.duration, 6),
+            warnings=result.warnings,
+        )
+        return
+
+    if result.status == 'unchanged':
+        console.print("[green]✓ Nothing to deploy[/green] - no changes since the last deploy.")
+        console.print("[dim]Use --force to deploy anyway.[/dim]")
+        return
+    if result.wait is not None:
+        _print_wait_result(result.wait)
+
+    console.print(f"\n[bold green]✓ Deployment complete![/bold green]")
+    console.print(f"Your website should be available at: [cyan]https://{config.get('domain', '')}[/cyan]")
+
+
+@app.command()
+def rollback(
+    to: Optional[str] = typer.Option(
+        None, "--to", help="Deploys to go back (~N or N, default 1) or an archive hash prefix (4+ characters)"
+    ),
+    list_archives: bool = typer.Option(False, "--list", help="List stored archives instead of rolling back"),
+    wait: bool = typer.Option(False, "--wait", help="Wait until the deployment has finished"),
+    timeout: float = typer.Option(600, "--timeout", min=1, help="Seconds to wait with --wait"),
+    max_bandwidth: Optional[str] = typer.Option(
+        None, "--max-bandwidth", help="Limit upload speed, in bytes per second (e.g. 2MB)"
+    ),
+    adaptive_bandwidth: bool = typer.Option(
+        False, "--adaptive-bandwidth", help="Slow uploads down when the network gets congested"
+    ),
+) -> None:
+    """Redeploy a previously deployed archive."""
+    _say(Panel.fit("[bold cyan]⏪ Rollback[/bold cyan]", border_style="cyan"))
+
+    client = UfazienAPIClient()
+    require_auth(client)
+
+    config = find_website_config(os.getcwd())
+    if not config:
+        raise _fail(
+            "Error: .ufazien.json not found in current directory.",
+            hint="Please run [cyan]ufazien create[/cyan] first or navigate to a project directory."
+        )
+
+    website_id = config.get('website_id')
+    if not website_id:
+        raise _fail("Error: website_id not found in .ufazien.json")
+
+    _configure_upload_throttle(client, config, max_bandwidth, adaptive_bandwidth)
+
+    store = archive_store(client, config.get('rollback_history', DEFAULT_KEEP) or DEFAULT_KEEP)
+    history = store.history(website_id)
+    if list_archives:
+        if events is not None:
+            events.emit('rollback.archives', website_id=website_id, archives=[
+                dict(entry, current=index == 0) for index, entry in enumerate(history)
+            ])
+            return
+        if not history:
+            console.print("[dim]No stored archives for this website yet.[/dim]")
+            return
+        table = Table(box=None, padding=(0, 2))
+        for column in ("#", "Hash", "Format", "Size", "Deployed"):
+            table.add_column(column)
+        for index, entry in enumerate(history):
+            deployed = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['deployed_at']))
+            marker = " [green](current)[/green]" if index == 0 else ""
+            table.add_row(
+                str(index), entry['hash'][:12], entry['format'], _format_size(entry['size']), deployed + marker
+            )
+        console.print(table)
+        return
+
+    entry = store.resolve(website_id, to)
+    if entry is None:
+        raise _fail(
+            f"No stored archive matches '{to or 1}'.",
+            hint="[dim]Run [cyan]ufazien rollback --list[/cyan] to see stored archives.[/dim]"
+        )
+
+    formats = client.get_capabilities().get('archive_formats')
+    if entry['format'] != 'zip' and formats is not None and entry['format'] not in formats:
+        raise _fail(f"The server no longer accepts {entry['format']} archives.")
+
+    if events is not None:
+        events.emit(
+            'rollback.started',
+            website_id=website_id,
+            archive_sha256=entry['hash'],
+            archive_format=entry['format'],
+            bytes=entry['size'],
+        )
+    _say(f"Website: [bold]{config.get('website_name', 'Unknown')}[/bold]")
+    _say(f"Archive: [dim]{entry['hash'][:12]}[/dim] ({entry['format']}, {_format_size(entry['size'])})\n")
+
+    with _spinner("[bold green]Uploading archive..."):
+        try:
+            response = client.upload_archive(website_id, str(store.object_path(entry)), entry['format'])
+            store.touch(entry)
         except Exception as e:
-            console.print(f"[red]✗ Error creating ZIP file: {e}[/red]")
-            raise typer.Exit(1)
+            raise _fail(f"Error uploading archive: {e}", phase='upload')
+    if events is not None:
+        events.emit('rollback.uploaded')
+    _say("[green]✓ Archive uploaded successfully[/green]")
 
-    # Upload files
-    with console.status("[bold green]Uploading files...", spinner="dots"):
+    with _spinner("[bold green]Triggering deployment..."):
         try:
-            response = client.upload_zip(website_id, zip_path)
-            console.print("[green]✓ Files uploaded successfully[/green]")
+            deployment = client.deploy_website(website_id)
         except Exception as e:
-            console.print(f"[red]✗ Error uploading files: {e}[/red]")
-            try:
-                os.remove(zip_path)
-            except Exception:
-                pass
-            raise typer.Exit(1)
+            raise _fail(f"Error triggering deployment: {e}", EXIT_DEPLOY_FAILED, phase='trigger')
+    if events is not None:
+        events.emit('rollback.triggered', deployment_id=deployment.get('id'), status=deployment.get('status'))
+    _say("[green]✓ Deployment triggered successfully[/green]")
 
-    # Clean up ZIP
+    store.promote(website_id, entry)
     try:
-        os.remove(zip_path)
-    except Exception:
-        pass
+        # Only the fingerprint is known, so the next watch starts with a full upload.
+        save_deploy_state(client.config_dir, website_id, {
+            'fingerprint': entry.get('fingerprint'),
+            'files': {},
+            'archive_hash': server_archive_hash(response) or server_archive_hash(deployment),
+            'deployed_at': time.time(),
+        })
+    except OSError as e:
+        if events is not None:
+            events.emit('warning', phase='state', message=f"Could not record deploy state: {e}")
+        _say(f"[yellow]⚠ Warning: Could not record deploy state: {e}[/yellow]")
+
+    result = None
+    if wait:
+        with _spinner("[bold green]Waiting for deployment...") as spinner:
+            def on_status(status: str) -> None:
+                if events is not None:
+                    events.emit('rollback.status', status=status)
+                else:
+                    spinner.update(f"[bold green]Deployment {status}...")
 
-    # Trigger deployment
-    with console.status("[bold green]Triggering deployment...", spinner="dots"):
+            try:
+                result = client.wait_for_deployment(website_id, deployment, timeout=timeout, on_status=on_status)
+            except Exception as e:
+                raise _fail(f"Error tracking deployment: {e}", EXIT_DEPLOY_FAILED, phase='wait')
+        if result['timed_out']:
+            raise _fail(
+                f"Timed out after {timeout:g}s waiting for the deployment.", EXIT_DEPLOY_TIMEOUT, phase='wait'
+            )
+        if not result['succeeded']:
+            raise _fail(f"Deployment {result['status']}.", EXIT_DEPLOY_FAILED, phase='wait')
+
+    if events is not None:
+        events.emit(
+            'rollback.finished',
+            website_id=website_id,
+            archive_sha256=entry['hash'],
+            deployment_id=deployment.get('id'),
+            deployment_status=result['status'] if result else None,
+        )
+        return
+    console.print(f"\n[bold green]✓ Rolled back to {entry['hash'][:12]}[/bold green]")
+
+
+def _push_changes(
+    client: UfazienAPIClient,
+    website_id: str,
+    files: List[Tuple[Path, str]],
+    deleted: List[str],
+    incremental: bool,
+    timeout: float
+) -> Dict[str, Any]:
+    """Upload a set of files (incrementally when possible) and wait until they are live."""
+    archive_path = create_zip_from_files(files)
+    try:
+        if incremental:
+            client.upload_files(website_id, archive_path, deleted)
+        else:
+            client.upload_archive(website_id, archive_path, 'zip')
+    finally:
         try:
-            deployment = client.deploy_website(website_id)
-            console.print("[green]✓ Deployment triggered successfully[/green]")
-            console.print(f"  Status: {deployment.get('status', 'queued')}")
-        except Exception as e:
-            console.print(f"[yellow]⚠ Warning: Could not trigger deployment: {e}[/yellow]")
-            console.print("[dim]Files have been uploaded. Deployment may start automatically.[/dim]")
+            os.remove(archive_path)
+        except OSError:
+            pass
+    deployment = client.deploy_website(website_id)
+    result = client.wait_for_deployment(website_id, deployment, timeout=timeout)
+    result['deployment'] = deployment
+    return result
 
-    console.print(f"\n[bold green]✓ Deployment complete![/bold green]")
-    console.print(f"Your website should be available at: [cyan]https://{config.get('domain', '')}[/cyan]")
+
+@app.command()
+def watch(
+    debounce: float = typer.Option(0.3, "--debounce", min=0.05, help="Seconds of quiet before redeploying"),
+    poll: bool = typer.Option(False, "--poll", help="Poll for changes instead of using inotify"),
+    interval: float = typer.Option(1.0, "--interval", min=0.1, help="Polling interval in seconds"),
+    timeout: float = typer.Option(120, "--timeout", min=1, help="Seconds to wait for each deployment"),
+    max_bandwidth: Optional[str] = typer.Option(
+        None, "--max-bandwidth", help="Limit upload speed, in bytes per second (e.g. 2MB)"
+    ),
+    adaptive_bandwidth: bool = typer.Option(
+        False, "--adaptive-bandwidth", help="Slow uploads down when the network gets congested"
+    ),
+) -> None:
+    """Watch the project and redeploy changed files."""
+    _say(Panel.fit("[bold cyan]👀 Watch & Deploy[/bold cyan]", border_style="cyan"))
+
+    client = UfazienAPIClient()
+    require_auth(client)
+
+    project_dir = os.getcwd()
+    config = find_website_config(project_dir)
+
+    if not config:
+        raise _fail(
+            "Error: .ufazien.json not found in current directory.",
+            hint="Please run [cyan]ufazien create[/cyan] first or navigate to a project directory."
+        )
+
+    website_id = config.get('website_id')
+    if not website_id:
+        raise _fail("Error: website_id not found in .ufazien.json")
+
+    _configure_upload_throttle(client, config, max_bandwidth, adaptive_bandwidth)
+
+    # Watch mode uploads files as they are on disk; deploy transforms are left
+    # to `ufazien deploy`, which redeploys because the recorded settings differ.
+    configured = deploy_settings(config)
+    if any(configured[key] for key in ('reproducible', 'precompress', 'minify', 'fingerprint')):
+        if events is not None:
+            events.emit('warning', phase='watch', message="Deploy transforms are not applied in watch mode.")
+        _say("[yellow]⚠ Deploy transforms from .ufazien.json are not applied in watch mode.[/yellow]")
+    settings = deploy_settings({})
+
+    project_path = Path(project_dir).resolve()
+    ufazienignore_path = project_path / '.ufazienignore'
+    if config.get('website_type') == 'build' and config.get('build_folder'):
+        watch_root = project_path / config['build_folder']
+        exclude = lambda path: False  # noqa: E731 - build folders are deployed as-is
+    else:
+        watch_root = project_path
+        exclude = lambda path: should_exclude_file(path, project_path, ufazienignore_path)  # noqa: E731
+
+    incremental = bool(client.get_capabilities().get('incremental_upload'))
+    if not incremental:
+        _say("[dim]Server does not support incremental uploads; changes are uploaded in full.[/dim]")
+
+    try:
+        files = list_deploy_files(project_dir, config)
+        state = load_deploy_state(client.config_dir, website_id)
+        tree_fingerprint, index = compute_tree_fingerprint(files, state.get('files'), settings)
+    except Exception as e:
+        raise _fail(f"Error scanning files: {e}", phase='scan')
+
+    # Changes can only be sent incrementally on top of a tree deployed from
+    # here without transforms; anything else starts with a full upload.
+    deployed_fingerprint = state.get('fingerprint')
+    deployed_index: Dict[str, List[Any]] = state.get('files') or {}
+    full_upload = not deployed_index or index_fingerprint(deployed_index, settings) != deployed_fingerprint
+
+    watcher = create_watcher(poll, interval)
+    watcher.sync(list_watch_dirs(watch_root, exclude))
+    mode = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+    if events is not None:
+        events.emit('watch.started', website_id=website_id, root=str(watch_root), mode=mode, incremental=incremental)
+    _say(f"Watching [bold]{watch_root}[/bold] ({mode}). Press Ctrl+C to stop.\n")
+    try:
+        while True:
+            if tree_fingerprint != deployed_fingerprint:
+                if full_upload:
+                    changed, deleted = files, []
+                else:
+                    changed = [
+                        (path, arcname) for path, arcname in files
+                        if deployed_index.get(arcname, [None, None, None])[2] != index[arcname][2]
+                    ]
+                    deleted = sorted(set(deployed_index) - set(index))
+                started = time.monotonic()
+                try:
+                    result = _push_changes(
+                        client, website_id, changed, deleted, incremental and not full_upload, timeout
+                    )
+                except Exception as e:
+                    if events is not None:
+                        events.emit('watch.failed', message=f"Error deploying changes: {e}")
+                    _say(f"[red]✗ Error deploying changes: {e}[/red]")
+                    result = None
+                if result is not None and result['succeeded']:
+                    elapsed = time.monotonic() - started
+                    if events is not None:
+                        events.emit(
+                            'watch.deployed',
+                            full=full_upload,
+                            changed=len(changed),
+                            deleted=len(deleted),
+                            deployment_id=result['deployment'].get('id'),
+                            seconds=round(elapsed, 6),
+                        )
+                    label = "uploaded in full" if full_upload else f"{len(changed)} changed, {len(deleted)} deleted"
+                    _say(f"[green]✓[/green] {label} → live in {elapsed:.1f}s")
+                    deployed_fingerprint, deployed_index, full_upload = tree_fingerprint, index, False
+                    try:
+                        save_deploy_state(client.config_dir, website_id, {
+                            'fingerprint': tree_fingerprint,
+                            'files': index,
+                            'archive_hash': server_archive_hash(result['deployment']),
+                            'deployed_at': time.time(),
+                        })
+                    except OSError as e:
+                        if events is not None:
+                            events.emit('warning', phase='state', message=f"Could not record deploy state: {e}")
+                        _say(f"[yellow]⚠ Warning: Could not record deploy state: {e}[/yellow]")
+                elif result is not None:
+                    status = 'timed out' if result['timed_out'] else result['status']
+                    if events is not None:
+                        events.emit('watch.failed', status=result['status'], timed_out=result['timed_out'])
+                    _say(f"[red]✗ Deployment {status}[/red]; will retry on the next change.")
+
+            watcher.wait(debounce)
+            try:
+                files = list_deploy_files(project_dir, config)
+                tree_fingerprint, index = compute_tree_fingerprint(files, index, settings)
+            except Exception as e:
+                if events is not None:
+                    events.emit('warning', phase='scan', message=f"Error scanning files: {e}")
+                _say(f"[red]✗ Error scanning files: {e}[/red]")
+                continue
+            watcher.sync(list_watch_dirs(watch_root, exclude))
+    except KeyboardInterrupt:
+        if events is not None:
+            events.emit('watch.stopped')
+        _say("\n[dim]Stopped watching.[/dim]")
+    finally:
+        watcher.close()
+
+
+DEFAULT_SITE_FIELDS = "name,domain,website_type"
+SITE_FIELD_WIDTHS = {'id': 36, 'name': 20, 'domain': 28, 'website_type': 12, 'status': 10}
+
+
+def _format_site_field(value: object) -> str:
+    """Render a website field value for the sites table."""
+    if value is None:
+        return ''
+    if isinstance(value, dict):
+        return str(value.get('name', value.get('id', '')))
+    return str(value)
+
+
+@app.command()
+def sites(
+    fields: str = typer.Option(DEFAULT_SITE_FIELDS, "--fields", "-f", help="Comma-separated fields to show"),
+    details: bool = typer.Option(False, "--details", help="Fetch full details for each website"),
+    workers: int = typer.Option(8, "--workers", "-w", min=1, help="Concurrent detail requests"),
+    page_size: Optional[int] = typer.Option(None, "--page-size", min=1, help="Websites per page"),
+) -> None:
+    """List your websites."""
+    client = UfazienAPIClient()
+    require_auth(client)
+
+    field_names = [f.strip() for f in fields.split(',') if f.strip()]
+    if not field_names:
+        raise _fail("Error: --fields cannot be empty.")
+
+    # Details are fetched by ID, so the listing must include it even when not shown.
+    requested_fields = field_names + ['id'] if details and 'id' not in field_names else field_names
+
+    # Rows are printed page by page, so columns use fixed widths to stay aligned.
+    count = 0
+    executor = ThreadPoolExecutor(max_workers=workers) if details else None
+    try:
+        for page in client.iter_website_pages(page_size=page_size, fields=requested_fields):
+            if executor is not None:
+                page = list(executor.map(lambda site: client.get_website(site['id']), page))
+
+            if events is not None:
+                for site in page:
+                    events.emit('sites.website', website={field: site.get(field) for field in field_names})
+                count += len(page)
+                continue
+
+            table = Table(box=None, padding=(0, 2), show_header=count == 0)
+            for field in field_names:
+                table.add_column(field, width=SITE_FIELD_WIDTHS.get(field, 16), no_wrap=True, overflow="ellipsis")
+            for site in page:
+                table.add_row(*(_format_site_field(site.get(field)) for field in field_names))
+            if page:
+                console.print(table)
+            count += len(page)
+    except Exception as e:
+        raise _fail(f"Error fetching websites: {e}", phase='list')
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    stats = client.rate_limiter.stats()
+    if events is not None:
+        events.emit('sites.finished', count=count, rate_limit=stats)
+        return
+
+    if count == 0:
+        console.print("[dim]No websites yet. Run [cyan]ufazien create[/cyan] to add one.[/dim]")
+    else:
+        console.print(f"\n[dim]{count} website(s)[/dim]")
+
+    if stats['rate_limited'] or stats['paused_seconds']:
+        console.print(
+            f"[dim]Rate limited {stats['rate_limited']} time(s), "
+            f"paused {stats['paused_seconds']:.1f}s, {stats['retries']} retr(ies)[/dim]"
+        )
 
 
 @app.command()
 def status() -> None:
     """Check your login status and profile."""
-    console.print(Panel.fit("[bold cyan]👤 Account Status[/bold cyan]", border_style="cyan"))
-
     client = UfazienAPIClient()
 
+    if events is not None:
+        if not client.access_token:
+            events.emit('status', logged_in=False)
+            return
+        try:
+            profile = client.get_profile()
+        except Exception as e:
+            raise _fail(f"Error fetching profile: {e}", phase='profile')
+        events.emit(
+            'status',
+            logged_in=True,
+            user={key: profile.get(key) for key in ('id', 'email', 'first_name', 'last_name')}
+        )
+        return
+
+    console.print(Panel.fit("[bold cyan]👤 Account Status[/bold cyan]", border_style="cyan"))
+
     if not client.access_token:
         console.print("[yellow]⚠ Not logged in[/yellow]")
         console.print("Run [cyan]ufazien login[/cyan] to authenticate.")
@@ -490,6 +1405,138 @@ def status() -> None:
             console.print(f"[red]✗ Error fetching profile: {e}[/red]")
 
 
+db_app = typer.Typer(help="Import and export database contents")
+app.add_typer(db_app, name="db")
+
+
+def _resolve_database_id(database: Optional[str]) -> str:
+    """Return --database, or the database_id from .ufazien.json."""
+    if database:
+        return database
+    config = find_website_config(os.getcwd())
+    if not config or not config.get('database_id'):
+        raise _fail(
+            "Error: No database given and no database_id in .ufazien.json.",
+            hint="Pass [cyan]--database ID[/cyan] or run this in a project created with a database."
+        )
+    return config['database_id']
+
+
+def _transfer_progress() -> Progress:
+    return Progress(
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        DownloadColumn(),
+        TransferSpeedColumn(),
+        TimeRemainingColumn(),
+        console=console,
+    )
+
+
+@db_app.command("import")
+def db_import(
+    file: Path = typer.Argument(..., exists=True, dir_okay=False, help="SQL dump (.sql, .sql.gz or .sql.zst)"),
+    database: Optional[str] = typer.Option(
+        None, "--database", "-d", help="Database ID (defaults to database_id in .ufazien.json)"
+    ),
+    compression: Optional[str] = typer.Option(
+        None, "--compression", "-c", help="Upload compression: gzip, zstd or none (default zstd if installed)"
+    ),
+    batch_size: int = typer.Option(500, "--batch-size", min=1, help="Statements per uploaded batch"),
+    restart: bool = typer.Option(False, "--restart", help="Start over instead of resuming an interrupted import"),
+) -> None:
+    """Import a SQL dump into a database."""
+    client = UfazienAPIClient()
+    require_auth(client)
+    database_id = _resolve_database_id(database)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise _fail("Error: --compression must be gzip, zstd or none.")
+
+    if events is not None:
+        events.emit('db.import.started', database_id=database_id, file=str(file), size=file.stat().st_size)
+        try:
+            result = import_dump(
+                client, database_id, str(file), compression, max_statements=batch_size, restart=restart,
+                on_progress=lambda done, total: events.emit('db.import.progress', bytes=done, total=total),
+            )
+        except Exception as e:
+            raise _fail(f"Import failed: {e}", phase='import')
+        events.emit('db.import.finished', database_id=database_id, statements=result.get('statements'))
+        return
+
+    console.print(Panel.fit("[bold cyan]🗄️ Database Import[/bold cyan]", border_style="cyan"))
+    with _transfer_progress() as progress:
+        task = progress.add_task(f"Importing {file.name}", total=file.stat().st_size)
+        try:
+            result = import_dump(
+                client, database_id, str(file), compression, max_statements=batch_size, restart=restart,
+                on_progress=lambda done, total: progress.update(task, completed=done, total=total),
+            )
+        except Exception as e:
+            progress.stop()
+            raise _fail(
+                f"Import failed: {e}",
+                hint="[dim]Run the same command again to resume from the last applied batch.[/dim]"
+            )
+    console.print(f"[green]✓ Imported {result.get('statements', 0)} statement(s)[/green]")
+
+
+@db_app.command("export")
+def db_export(
+    output: Optional[Path] = typer.Option(
+        None, "--output", "-o", dir_okay=False, help="File to write (default <database name>.sql.gz)"
+    ),
+    database: Optional[str] = typer.Option(
+        None, "--database", "-d", help="Database ID (defaults to database_id in .ufazien.json)"
+    ),
+    compression: Optional[str] = typer.Option(
+        None, "--compression", "-c", help="gzip, zstd or none (default from the output file extension)"
+    ),
+    restart: bool = typer.Option(False, "--restart", help="Start a new export instead of resuming a download"),
+) -> None:
+    """Export a database to a SQL dump."""
+    client = UfazienAPIClient()
+    require_auth(client)
+    database_id = _resolve_database_id(database)
+    if compression is not None and compression not in COMPRESSIONS:
+        raise _fail("Error: --compression must be gzip, zstd or none.")
+
+    if output is None:
+        try:
+            name = client.get_database(database_id).get('name') or database_id
+        except Exception as e:
+            raise _fail(f"Error fetching database: {e}")
+        output = Path(f"{name}.sql{COMPRESSION_EXTENSIONS[compression or 'gzip']}")
+
+    if events is not None:
+        events.emit('db.export.started', database_id=database_id, output=str(output))
+        try:
+            export = export_dump(
+                client, database_id, str(output), compression, restart=restart,
+                on_progress=lambda done, total: events.emit('db.export.progress', bytes=done, total=total),
+            )
+        except Exception as e:
+            raise _fail(f"Export failed: {e}", phase='export')
+        events.emit('db.export.finished', output=str(output), size=export.get('size'), sha256=export.get('sha256'))
+        return
+
+    console.print(Panel.fit("[bold cyan]🗄️ Database Export[/bold cyan]", border_style="cyan"))
+    with _transfer_progress() as progress:
+        task = progress.add_task(f"Downloading {output.name}", total=None)
+        try:
+            export = export_dump(
+                client, database_id, str(output), compression, restart=restart,
+                on_progress=lambda done, total: progress.update(task, completed=done, total=total),
+            )
+        except Exception as e:
+            progress.stop()
+            raise _fail(
+                f"Export failed: {e}",
+                hint="[dim]Run the same command again to resume the download.[/dim]"
+            )
+    console.print(f"[green]✓ Exported to {output} ({_format_size(export.get('size', 0))})[/green]")
+
+
 def main() -> None:
     """Main entry point."""
     app()
@@ -3,27 +3,65 @@ Ufazien API Client
 Handles all API communication with the Ufazien platform.
 """
 
+import io
 import json
 import os
 import sys
+import tempfile
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlencode, urlsplit
 
 import requests
 
+from ufazien.cache import ResponseCache
+from ufazien.filelock import get_file_lock
+from ufazien.operations import PendingOperations, new_idempotency_key, operation_id
+from ufazien.ratelimit import (
+    IDEMPOTENT_METHODS,
+    MAX_RETRIES,
+    RETRY_STATUSES,
+    RateLimiter,
+    get_rate_limiter,
+    jittered_backoff,
+    parse_retry_after,
+)
+from ufazien.upload import MultipartStream, UploadThrottle, is_replayable, upload_timeout
+from ufazien.utils import backoff_delays
+
+DEPLOYMENT_QUEUED = ('queued', 'pending')
+DEPLOYMENT_SUCCEEDED = ('active', 'deployed', 'success', 'succeeded', 'completed')
+DEPLOYMENT_FAILED = ('failed', 'error', 'cancelled')
+
+# Import sessions that still accept chunks, that have been submitted for
+# execution, and that are gone for good.
+IMPORT_RECEIVING = ('receiving',)
+IMPORT_RUNNING = ('importing',)
+IMPORT_FAILED = ('failed', 'expired')
+
 
 class UfazienAPIClient:
     """Client for interacting with the Ufazien API."""
 
-    def __init__(self, base_url: Optional[str] = None, config_dir: Optional[str] = None):
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        config_dir: Optional[str] = None,
+        cache: Optional[bool] = None,
+        rate_limit: Optional[float] = None
+    ):
         """
         Initialize the API client.
 
         Args:
-            base_url: Base URL for the API (defaults to https://api.ufazien.com/api)
+            base_url: Base URL for the API (defaults to UFAZIEN_API_URL or https://api.ufazien.com/api)
             config_dir: Directory to store config files (defaults to ~/.ufazien)
+            cache: Cache read-only responses on disk (defaults to the UFAZIEN_CACHE env var)
+            rate_limit: Requests per second shared by all clients of this API in the process
+                (defaults to the UFAZIEN_RATE_LIMIT env var, then 10)
         """
-        self.base_url = base_url or "https://api.ufazien.com/api"
+        self.base_url = base_url or os.environ.get('UFAZIEN_API_URL') or "https://api.ufazien.com/api"
         if not self.base_url.endswith('/api'):
             if self.base_url.endswith('/'):
                 self.base_url = self.base_url.rstrip('/') + '/api'
@@ -40,10 +78,64 @@ class UfazienAPIClient:
         self.config_file = self.config_dir / 'config.json'
         self.tokens_file = self.config_dir / 'tokens.json'
 
+        self._token_lock = get_file_lock(self.tokens_file)
+
+        if cache is None:
+            cache = os.environ.get('UFAZIEN_CACHE', '').lower() in ('1', 'true', 'yes', 'on')
+        self.cache: Optional[ResponseCache] = ResponseCache(self.config_dir / 'cache') if cache else None
+
         self.access_token: Optional[str] = None
         self.refresh_token: Optional[str] = None
+        # Account the tokens belong to, recorded at login to separate cache entries.
+        self.user_id: Optional[str] = None
         self._load_tokens()
 
+        self._capabilities: Optional[Dict[str, Any]] = None
+
+        # One session per client so repeated calls reuse pooled connections.
+        self.session = requests.Session()
+
+        if rate_limit is None and os.environ.get('UFAZIEN_RATE_LIMIT'):
+            rate_limit = float(os.environ['UFAZIEN_RATE_LIMIT'])
+        self.rate_limiter: RateLimiter = get_rate_limiter(self.base_url, rate_limit)
+
+        # Optional bandwidth limit shared by all uploads of this client.
+        self.upload_throttle: Optional[UploadThrottle] = None
+        self.upload_stats_file = self.config_dir / 'upload_stats.json'
+
+        # Idempotency keys of mutating calls that have not been confirmed yet.
+        self.pending = PendingOperations(self.config_dir / 'pending.json')
+
+    def _upload_throughput(self) -> Optional[float]:
+        """Expected upload throughput: the observed average, bounded by the throttle."""
+        observed = None
+        try:
+            with open(self.upload_stats_file, 'r') as f:
+                observed = json.load(f).get('throughput')
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        rate = self.upload_throttle.rate if self.upload_throttle else None
+        if observed and rate:
+            return min(observed, rate)
+        return observed or rate
+
+    def _record_upload_throughput(self, throughput: float) -> None:
+        """Fold a measured upload throughput into the running average."""
+        previous = None
+        try:
+            with open(self.upload_stats_file, 'r') as f:
+                previous = json.load(f).get('throughput')
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        average = throughput if not previous else 0.7 * previous + 0.3 * throughput
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'throughput': average}, f)
+            os.replace(tmp_path, self.upload_stats_file)
+        except OSError:
+            pass
+
     def _load_tokens(self) -> None:
         """Load tokens from file."""
         if self.tokens_file.exists():
@@ -52,32 +144,63 @@ class UfazienAPIClient:
                     tokens = json.load(f)
                     self.access_token = tokens.get('access_token')
                     self.refresh_token = tokens.get('refresh_token')
+                    self.user_id = tokens.get('user')
             except (json.JSONDecodeError, IOError):
                 pass
+        self._update_cache_namespace()
 
-    def _save_tokens(self, access_token: str, refresh_token: str) -> None:
-        """Save tokens to file."""
+    def _update_cache_namespace(self) -> None:
+        """Scope cached responses to the API server and the logged-in user."""
+        if self.cache is not None:
+            self.cache.namespace = f'{self.base_url} {self.user_id or ""}'
+
+    def _save_tokens(self, access_token: str, refresh_token: str, user_id: Optional[str] = None) -> None:
+        """Save tokens (and the account they belong to) to file atomically (temp file plus rename)."""
         self.access_token = access_token
         self.refresh_token = refresh_token
+        if user_id is not None:
+            self.user_id = user_id
+        self._update_cache_namespace()
+        tokens = {
+            'access_token': access_token,
+            'refresh_token': refresh_token
+        }
+        if self.user_id:
+            tokens['user'] = self.user_id
+        tmp_path = None
         try:
-            with open(self.tokens_file, 'w') as f:
-                json.dump({
-                    'access_token': access_token,
-                    'refresh_token': refresh_token
-                }, f)
-            os.chmod(self.tokens_file, 0o600)
-        except IOError as e:
+            with self._token_lock.hold():
+                fd, tmp_path = tempfile.mkstemp(dir=self.config_dir, prefix='.tokens.', suffix='.tmp')
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(tokens, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self.tokens_file)
+                tmp_path = None
+        except (IOError, OSError) as e:
             print(f"Warning: Could not save tokens: {e}", file=sys.stderr)
+        finally:
+            if tmp_path:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
 
     def _clear_tokens(self) -> None:
         """Clear tokens from memory and file."""
         self.access_token = None
         self.refresh_token = None
-        if self.tokens_file.exists():
-            try:
-                self.tokens_file.unlink()
-            except IOError:
-                pass
+        self.user_id = None
+        if self.cache is not None:
+            self.cache.clear()
+        self._update_cache_namespace()
+        with self._token_lock.hold():
+            if self.tokens_file.exists():
+                try:
+                    self.tokens_file.unlink()
+                except IOError:
+                    pass
 
     def _make_request(
         self,
@@ -85,7 +208,9 @@ class UfazienAPIClient:
         endpoint: str,
         data: Optional[Dict[str, Any]] = None,
         files: Optional[Dict[str, Any]] = None,
-        headers: Optional[Dict[str, str]] = None
+        headers: Optional[Dict[str, str]] = None,
+        idempotency_key: Optional[str] = None,
+        use_cache: bool = True
     ) -> Any:
         """
         Make an HTTP request to the API.
@@ -96,6 +221,10 @@ class UfazienAPIClient:
             data: Request data (for JSON requests)
             files: Files to upload (for multipart requests)
             headers: Additional headers
+            idempotency_key: Key sent with a mutating request so the server performs it at most
+                once (generated per call when not given)
+            use_cache: Read and store a cacheable GET in the response cache (disable for
+                polling and other lookups that must see the current state)
 
         Returns:
             Response data (parsed JSON or raw bytes)
@@ -109,53 +238,52 @@ class UfazienAPIClient:
         if headers:
             request_headers.update(headers)
 
-        if self.access_token:
-            request_headers['Authorization'] = f'Bearer {self.access_token}'
+        # Remember the token actually sent, so a 401 can tell whether another
+        # thread has refreshed it in the meantime.
+        sent_token = self.access_token
+        if sent_token:
+            request_headers['Authorization'] = f'Bearer {sent_token}'
+
+        # Only keys chosen by the caller belong to operations the server
+        # deduplicates; generated ones are sent but do not make a call retryable.
+        keyed = idempotency_key is not None
+        if method.upper() not in IDEMPOTENT_METHODS:
+            idempotency_key = idempotency_key or new_idempotency_key()
+            request_headers['Idempotency-Key'] = idempotency_key
+
+        read_cache = None
+        cache_entry = None
+        if (self.cache is not None and use_cache and method == 'GET' and not files
+                and self.cache.ttl_for(endpoint) is not None):
+            read_cache = self.cache
+            cache_entry = read_cache.get(endpoint)
+            if cache_entry is not None:
+                if read_cache.is_fresh(cache_entry):
+                    return cache_entry['body']
+                request_headers.update(read_cache.conditional_headers(cache_entry))
 
         try:
-            if files:
-                # Multipart form data request
-                file_data = {}
-                for key, file_path in files.items():
-                    if isinstance(file_path, str):
-                        file_data[key] = ('file', open(file_path, 'rb'), 'application/octet-stream')
-                    else:
-                        file_data[key] = file_path
-
-                response = requests.request(
-                    method,
-                    url,
-                    data=data,
-                    files=file_data,
-                    headers=request_headers,
-                    timeout=300  # 5 minutes for file uploads
-                )
-
-                # Close file handles
-                for file_tuple in file_data.values():
-                    if isinstance(file_tuple, tuple) and len(file_tuple) > 1:
-                        file_obj = file_tuple[1]
-                        if hasattr(file_obj, 'close'):
-                            file_obj.close()
-            else:
-                # JSON request
-                if data:
-                    request_headers['Content-Type'] = 'application/json'
-
-                response = requests.request(
-                    method,
-                    url,
-                    json=data if data else None,
-                    headers=request_headers,
-                    timeout=30
-                )
-
+            response = self._send(method, url, request_headers, data, files, keyed)
             response.raise_for_status()
 
+            if read_cache is not None and cache_entry is not None and response.status_code == 304:
+                read_cache.revalidated(cache_entry)
+                return cache_entry['body']
+            if self.cache is not None and method != 'GET':
+                self.cache.invalidate(endpoint)
+
             # Parse JSON response
             content_type = response.headers.get('Content-Type', '')
             if 'application/json' in content_type:
-                return response.json()
+                result = response.json()
+                if read_cache is not None:
+                    read_cache.store(
+                        endpoint,
+                        result,
+                        etag=response.headers.get('ETag'),
+                        last_modified=response.headers.get('Last-Modified')
+                    )
+                return result
             else:
                 return response.content
 
@@ -169,8 +297,12 @@ class UfazienAPIClient:
 
             # Handle 401 Unauthorized - try to refresh token
             if e.response.status_code == 401 and self.refresh_token and endpoint != '/auth/token/refresh/':
-                if self._refresh_access_token():
-                    return self._make_request(method, endpoint, data, files, headers)
+                if self._refresh_access_token(sent_token):
+                    if not is_replayable(files):
+                        raise Exception("Session expired during the upload. Please run the command again")
+                    return self._make_request(
+                        method, endpoint, data, files, headers, idempotency_key, use_cache
+                    )
                 else:
                     self._clear_tokens()
                     raise Exception("Authentication failed. Please login again using 'ufazien login'")
@@ -183,31 +315,139 @@ class UfazienAPIClient:
         except requests.exceptions.RequestException as e:
             raise Exception(f"Connection error: {str(e)}")
 
-    def _refresh_access_token(self) -> bool:
-        """Refresh the access token using the refresh token."""
-        if not self.refresh_token:
-            return False
+    def _send_once(
+        self,
+        method: str,
+        url: str,
+        request_headers: Dict[str, str],
+        data: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, Any]]
+    ) -> requests.Response:
+        """Send a single HTTP request."""
+        if files:
+            # Multipart form data request, streamed from disk (and throttled)
+            body = MultipartStream(data, files, throttle=self.upload_throttle)
+            request_headers['Content-Type'] = body.content_type
+            try:
+                response = self.session.request(
+                    method,
+                    url,
+                    data=body,
+                    headers=request_headers,
+                    timeout=upload_timeout(len(body), self._upload_throughput())
+                )
+            finally:
+                body.close()
+            if body.throughput and len(body) >= 1024 * 1024:
+                self._record_upload_throughput(body.throughput)
+        else:
+            # JSON request
+            if data:
+                request_headers['Content-Type'] = 'application/json'
 
-        try:
-            url = f"{self.base_url}/auth/token/refresh/"
-            response = requests.post(
+            response = self.session.request(
+                method,
                 url,
-                json={'refresh': self.refresh_token},
-                headers={'Content-Type': 'application/json'},
-                timeout=10
+                json=data if data else None,
+                headers=request_headers,
+                timeout=30
             )
-            response.raise_for_status()
-            response_data = response.json()
-            new_access_token = response_data.get('access')
+        return response
 
-            if new_access_token:
-                self._save_tokens(new_access_token, self.refresh_token)
+    def _send(
+        self,
+        method: str,
+        url: str,
+        request_headers: Dict[str, str],
+        data: Optional[Dict[str, Any]],
+        files: Optional[Dict[str, Any]],
+        keyed: bool = False
+    ) -> requests.Response:
+        """
+        Send a request through the shared rate limiter, retrying when it is safe.
+
+        Only bodies that can be sent again are retried (see is_replayable).
+        429 responses are retried for every method, since the server refused
+        them unprocessed, after Retry-After (which pauses all requests).
+        Connection errors and 502/503/504 are retried for idempotent methods
+        and for calls whose Idempotency-Key was chosen by the caller, with
+        jittered exponential backoff.
+        """
+        replayable = is_replayable(files)
+        idempotent = replayable and (method.upper() in IDEMPOTENT_METHODS or keyed)
+        delays = jittered_backoff()
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            try:
+                response = self._send_once(method, url, request_headers, data, files)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if not idempotent or attempt >= MAX_RETRIES:
+                    raise
+                attempt += 1
+                self.rate_limiter.record_retry()
+                time.sleep(next(delays))
+                continue
+
+            self.rate_limiter.update_from_headers(response.headers)
+            retryable = (
+                (replayable and response.status_code == 429)
+                or (idempotent and response.status_code in RETRY_STATUSES)
+            )
+            if not retryable or attempt >= MAX_RETRIES:
+                return response
+
+            attempt += 1
+            self.rate_limiter.record_retry()
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if response.status_code == 429:
+                self.rate_limiter.record_rate_limited()
+                self.rate_limiter.pause(retry_after if retry_after is not None else next(delays))
+            else:
+                time.sleep(retry_after if retry_after is not None else next(delays))
+
+    def _refresh_access_token(self, stale_access_token: Optional[str] = None) -> bool:
+        """
+        Refresh the access token using the refresh token.
+
+        Single-flight: the first caller holds the token lock and refreshes,
+        while other threads and processes wait on the lock and then reuse the
+        token it stored instead of refreshing again.
+
+        Args:
+            stale_access_token: The token the server rejected (defaults to the current one)
+        """
+        if stale_access_token is None:
+            stale_access_token = self.access_token
+
+        with self._token_lock.hold():
+            self._load_tokens()
+            if self.access_token and self.access_token != stale_access_token:
                 return True
 
-            return False
+            if not self.refresh_token:
+                return False
 
-        except Exception:
-            return False
+            try:
+                url = f"{self.base_url}/auth/token/refresh/"
+                response = self.session.post(
+                    url,
+                    json={'refresh': self.refresh_token},
+                    headers={'Content-Type': 'application/json'},
+                    timeout=10
+                )
+                response.raise_for_status()
+                response_data = response.json()
+                new_access_token = response_data.get('access')
+
+                if new_access_token:
+                    self._save_tokens(new_access_token, response_data.get('refresh', self.refresh_token))
+                    return True
+
+                return False
+
+            except Exception:
+                return False
 
     def login(self, email: str, password: str) -> Dict[str, Any]:
         """
@@ -225,10 +465,11 @@ class UfazienAPIClient:
             'password': password
         })
 
+        user = response.get('user') or {}
         if 'access' in response and 'refresh' in response:
-            self._save_tokens(response['access'], response['refresh'])
+            self._save_tokens(response['access'], response['refresh'], str(user.get('id') or user.get('email') or email))
 
-        return response.get('user', {})
+        return user
 
     def logout(self) -> None:
         """Logout and clear tokens."""
@@ -256,6 +497,11 @@ class UfazienAPIClient:
         """
         Create a new website.
 
+        The idempotency keys (and the domain, once created) are kept in the
+        pending operations until the website exists, so calling again with
+        the same arguments after a failure never creates a second domain or
+        website.
+
         Args:
             name: Website name
             subdomain: Subdomain (without .ufazien.com)
@@ -267,6 +513,15 @@ class UfazienAPIClient:
         Returns:
             Created website data
         """
+        op_id = operation_id('create_website', {
+            'api': self.base_url,
+            'name': name,
+            'subdomain': subdomain,
+            'website_type': website_type,
+            'domain_id': domain_id,
+        })
+        operation = self.pending.begin(op_id)
+
         data: Dict[str, Any] = {
             'name': name,
             'website_type': website_type,
@@ -280,15 +535,22 @@ class UfazienAPIClient:
 
         if domain_id:
             data['domain_id'] = domain_id
+        elif operation.get('domain_id'):
+            data['domain_id'] = operation['domain_id']
         else:
             domain_data = {
                 'name': f'{subdomain}.ufazien.com',
                 'domain_type': 'subdomain'
             }
-            domain = self._make_request('POST', '/hosting/domains/', domain_data)
+            domain = self._make_request(
+                'POST', '/hosting/domains/', domain_data, idempotency_key=f"{operation['key']}-domain"
+            )
             data['domain_id'] = domain['id']
+            self.pending.update(op_id, domain_id=domain['id'])
 
-        return self._make_request('POST', '/hosting/websites/', data)
+        website = self._make_request('POST', '/hosting/websites/', data, idempotency_key=operation['key'])
+        self.pending.finish(op_id)
+        return website
 
     def create_database(
         self,
@@ -315,7 +577,11 @@ class UfazienAPIClient:
         if description:
             data['description'] = description
 
-        return self._make_request('POST', '/hosting/databases/', data)
+        op_id = operation_id('create_database', {'api': self.base_url, 'name': name, 'db_type': db_type})
+        operation = self.pending.begin(op_id)
+        database = self._make_request('POST', '/hosting/databases/', data, idempotency_key=operation['key'])
+        self.pending.finish(op_id)
+        return database
 
     def upload_zip(self, website_id: str, zip_file_path: str) -> Dict[str, Any]:
         """
@@ -334,13 +600,137 @@ class UfazienAPIClient:
             files={'zip_file': zip_file_path}
         )
 
+    def upload_archive(self, website_id: str, archive_path: str, archive_format: str = 'zip') -> Dict[str, Any]:
+        """
+        Upload and extract an archive to a website.
+
+        Args:
+            website_id: Website ID
+            archive_path: Path to the archive
+            archive_format: 'zip' or a format returned by negotiate_archive_format
+
+        Returns:
+            Upload response
+        """
+        if archive_format == 'zip':
+            return self.upload_zip(website_id, archive_path)
+        return self._make_request(
+            'POST',
+            f'/hosting/websites/{website_id}/upload_archive/',
+            data={'format': archive_format},
+            files={'archive': archive_path}
+        )
+
+    def upload_files(self, website_id: str, archive_path: str, deleted: List[str]) -> Dict[str, Any]:
+        """
+        Incrementally update a website's files.
+
+        Only available when get_capabilities() reports 'incremental_upload'.
+
+        Args:
+            website_id: Website ID
+            archive_path: ZIP of added and changed files
+            deleted: Paths to remove from the website
+
+        Returns:
+            Upload response
+        """
+        return self._make_request(
+            'POST',
+            f'/hosting/websites/{website_id}/upload_files/',
+            data={'deleted': json.dumps(deleted)},
+            files={'archive': archive_path}
+        )
+
+    def get_capabilities(self) -> Dict[str, Any]:
+        """Get optional server capabilities (empty if the server does not report any)."""
+        if self._capabilities is None:
+            try:
+                capabilities = self._make_request('GET', '/hosting/capabilities/')
+            except Exception:
+                capabilities = {}
+            self._capabilities = capabilities if isinstance(capabilities, dict) else {}
+        return self._capabilities
+
+    def negotiate_archive_format(self, local_formats: List[str]) -> str:
+        """
+        Pick the upload archive format.
+
+        Args:
+            local_formats: Formats the client can produce, most preferred first
+
+        Returns:
+            The first local format the server accepts ('zip' if none)
+        """
+        server_formats = self.get_capabilities().get('archive_formats') or ['zip']
+        for archive_format in local_formats:
+            if archive_format in server_formats:
+                return archive_format
+        return 'zip'
+
     def get_websites(self) -> List[Dict[str, Any]]:
         """Get list of user's websites."""
         return self._make_request('GET', '/hosting/websites/')
 
-    def get_website(self, website_id: str) -> Dict[str, Any]:
-        """Get website details."""
-        return self._make_request('GET', f'/hosting/websites/{website_id}/')
+    def iter_website_pages(
+        self,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Lazily iterate over the user's websites one page at a time.
+
+        Follows the server's ``next`` link, so both page-number and cursor
+        pagination work. An unpaginated list is yielded as a single page.
+
+        Args:
+            page_size: Requested number of websites per page
+            fields: Website fields to ask the server for
+
+        Yields:
+            Lists of website data
+        """
+        params: Dict[str, Any] = {}
+        if page_size:
+            params['page_size'] = page_size
+        if fields:
+            params['fields'] = ','.join(fields)
+
+        endpoint: Optional[str] = '/hosting/websites/'
+        if params:
+            endpoint = f'{endpoint}?{urlencode(params)}'
+
+        while endpoint:
+            page = self._make_request('GET', endpoint)
+            if isinstance(page, list):
+                yield page
+                return
+            yield page.get('results', [])
+            endpoint = self._endpoint_from_url(page.get('next'))
+
+    def iter_websites(
+        self,
+        page_size: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily iterate over the user's websites across all pages."""
+        for page in self.iter_website_pages(page_size=page_size, fields=fields):
+            yield from page
+
+    def _endpoint_from_url(self, url: Optional[str]) -> Optional[str]:
+        """Turn an absolute pagination link into an endpoint relative to base_url."""
+        if not url:
+            return None
+        parts = urlsplit(url)
+        path = parts.path
+        base_path = urlsplit(self.base_url).path
+        if path.startswith(base_path):
+            path = path[len(base_path):]
+        return f'{path}?{parts.query}' if parts.query else path
+
+    def get_website(self, website_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get website details (pass use_cache=False to bypass the response cache)."""
+        return self._make_request('GET', f'/hosting/websites/{website_id}/', use_cache=use_cache)
 
     def deploy_website(self, website_id: str) -> Dict[str, Any]:
         """Trigger a website deployment."""
@@ -350,7 +740,269 @@ class UfazienAPIClient:
         """Get list of available domains."""
         return self._make_request('GET', '/hosting/domains/available/')
 
-    def get_database(self, database_id: str) -> Dict[str, Any]:
-        """Get database details."""
-        return self._make_request('GET', f'/hosting/databases/{database_id}/')
+    def get_database(self, database_id: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get database details (pass use_cache=False to bypass the response cache)."""
+        return self._make_request('GET', f'/hosting/databases/{database_id}/', use_cache=use_cache)
+
+    def wait_for_database(self, database_id: str, timeout: float = 60.0) -> Dict[str, Any]:
+        """
+        Poll a database until provisioning finishes.
+
+        Polls with exponential backoff and jitter so short provisioning is
+        picked up quickly without hammering the API on long ones.
+
+        Args:
+            database_id: Database ID
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            Last database details seen ('active', 'error', or still provisioning on timeout)
+        """
+        deadline = time.monotonic() + timeout
+        database: Dict[str, Any] = {}
+        for delay in backoff_delays():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            database = self.get_database(database_id, use_cache=False)
+            if database.get('status') in ('active', 'error'):
+                break
+        return database
+
+    def start_database_import(
+        self,
+        database_id: str,
+        filename: str,
+        size: int,
+        compression: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Open an import session that receives a SQL dump in chunks.
+
+        Args:
+            database_id: Database ID
+            filename: Name of the dump (informational)
+            size: Size of the dump file in bytes (informational)
+            compression: Compression of the uploaded chunks ('gzip', 'zstd' or 'none')
+            idempotency_key: Key identifying this import attempt
+
+        Returns:
+            Import session ('id', 'status', 'offset', 'cursor', 'statements')
+        """
+        return self._make_request(
+            'POST',
+            f'/hosting/databases/{database_id}/imports/',
+            {'filename': filename, 'size': size, 'compression': compression},
+            idempotency_key=idempotency_key
+        )
+
+    def get_database_import(self, database_id: str, import_id: str) -> Dict[str, Any]:
+        """Get an import session, including the cursor of the last applied chunk."""
+        return self._make_request(
+            'GET', f'/hosting/databases/{database_id}/imports/{import_id}/', use_cache=False
+        )
+
+    def wait_for_database_import(
+        self,
+        database_id: str,
+        import_id: str,
+        session: Optional[Dict[str, Any]] = None,
+        timeout: float = 600.0
+    ) -> Dict[str, Any]:
+        """
+        Poll a submitted import session until the server has finished running it.
+
+        Args:
+            database_id: Database ID
+            import_id: Import session ID
+            session: Last known state of the session (fetched when not given)
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            Last session state seen (still 'importing' on timeout)
+        """
+        if session is None:
+            session = self.get_database_import(database_id, import_id)
+        deadline = time.monotonic() + timeout
+        for delay in backoff_delays():
+            if session.get('status') not in IMPORT_RUNNING:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+            session = self.get_database_import(database_id, import_id)
+        return session
+
+    def upload_database_import_chunk(
+        self,
+        database_id: str,
+        import_id: str,
+        chunk: bytes,
+        offset: int,
+        cursor: str,
+        statements: int,
+        compression: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload one batch of statements to an import session.
+
+        The server applies the batch in a single transaction and rejects it
+        with 409 unless ``offset`` matches the end of the previous batch.
+
+        Args:
+            database_id: Database ID
+            import_id: Import session ID
+            chunk: Compressed, framed statements (see ufazien.database.frame_statements)
+            offset: Position in the dump where the batch starts
+            cursor: Opaque resume state stored with the session once the batch is applied
+            statements: Number of statements in the batch
+            compression: Compression of ``chunk``
+            idempotency_key: Key identifying this batch
+
+        Returns:
+            Updated import session
+        """
+        return self._make_request(
+            'POST',
+            f'/hosting/databases/{database_id}/imports/{import_id}/chunks/',
+            data={
+                'offset': offset,
+                'cursor': cursor,
+                'statements': statements,
+                'compression': compression,
+            },
+            files={'chunk': ('chunk', io.BytesIO(chunk), 'application/octet-stream')},
+            idempotency_key=idempotency_key
+        )
+
+    def complete_database_import(self, database_id: str, import_id: str) -> Dict[str, Any]:
+        """Close an import session once every batch is applied."""
+        return self._make_request('POST', f'/hosting/databases/{database_id}/imports/{import_id}/complete/')
+
+    def start_database_export(
+        self,
+        database_id: str,
+        compression: str,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Have the server write a compressed snapshot of a database.
+
+        Args:
+            database_id: Database ID
+            compression: 'gzip', 'zstd' or 'none'
+            idempotency_key: Key identifying this export
+
+        Returns:
+            Export ('id', 'size', 'sha256', 'compression')
+        """
+        return self._make_request(
+            'POST',
+            f'/hosting/databases/{database_id}/exports/',
+            {'compression': compression},
+            idempotency_key=idempotency_key
+        )
+
+    def get_database_export(self, database_id: str, export_id: str) -> Dict[str, Any]:
+        """Get an export's details."""
+        return self._make_request(
+            'GET', f'/hosting/databases/{database_id}/exports/{export_id}/', use_cache=False
+        )
+
+    def download_database_export(self, database_id: str, export_id: str, start: int, length: int) -> bytes:
+        """
+        Download part of an export.
+
+        Args:
+            database_id: Database ID
+            export_id: Export ID
+            start: First byte to download
+            length: Number of bytes to download
+
+        Returns:
+            The requested bytes
+        """
+        return self._make_request(
+            'GET',
+            f'/hosting/databases/{database_id}/exports/{export_id}/download/',
+            headers={'Range': f'bytes={start}-{start + length - 1}'},
+            use_cache=False
+        )
+
+    @staticmethod
+    def _deployment_status(website: Dict[str, Any], deployment_id: Optional[str] = None) -> str:
+        """Extract the status of a deployment from website details."""
+        deployment = website.get('latest_deployment') or website.get('last_deployment')
+        if isinstance(deployment, dict):
+            if deployment_id and deployment.get('id') not in (None, deployment_id):
+                # Our deployment has not replaced the previous one yet.
+                return 'queued'
+            return str(deployment.get('status', 'queued'))
+        return str(website.get('deployment_status') or website.get('status') or 'queued')
+
+    def wait_for_deployment(
+        self,
+        website_id: str,
+        deployment: Optional[Dict[str, Any]] = None,
+        timeout: float = 600.0,
+        on_status: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Track a triggered deployment until it succeeds, fails or times out.
+
+        Polls the website with exponential backoff and jitter and measures how
+        long the deployment waited in the queue separately from how long it
+        took to build and activate.
 
+        Args:
+            website_id: Website ID
+            deployment: Response returned by deploy_website
+            timeout: Maximum number of seconds to wait
+            on_status: Called with each newly observed status
+
+        Returns:
+            Dict with 'status', 'succeeded', 'timed_out', 'queue_time',
+            'build_time' (seconds, None when not observed) and 'website'
+        """
+        deployment = deployment or {}
+        deployment_id = deployment.get('id')
+        status = str(deployment.get('status', 'queued'))
+        started = time.monotonic()
+        deadline = started + timeout
+        building_since: Optional[float] = None if status in DEPLOYMENT_QUEUED else started
+        website: Dict[str, Any] = {}
+
+        if on_status:
+            on_status(status)
+
+        for delay in backoff_delays(initial=1.0, maximum=10.0):
+            if status in DEPLOYMENT_SUCCEEDED or status in DEPLOYMENT_FAILED:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            time.sleep(min(delay, remaining))
+
+            website = self.get_website(website_id, use_cache=False)
+            new_status = self._deployment_status(website, deployment_id)
+            if new_status != status:
+                status = new_status
+                if building_since is None and status not in DEPLOYMENT_QUEUED:
+                    building_since = time.monotonic()
+                if on_status:
+                    on_status(status)
+
+        finished = time.monotonic()
+        done = status in DEPLOYMENT_SUCCEEDED or status in DEPLOYMENT_FAILED
+        return {
+            'status': status,
+            'succeeded': status in DEPLOYMENT_SUCCEEDED,
+            'timed_out': not done,
+            'queue_time': (building_since if building_since is not None else finished) - started,
+            'build_time': finished - building_since if building_since is not None and done else None,
+            'website': website,
+        }
@@ -0,0 +1,510 @@
+"""
+Streaming database import and export.
+
+Imports read a SQL dump (plain, .gz or .zst) in fixed-size blocks, split it
+into statements without loading it, and upload batches of statements as
+compressed chunks. The server runs each chunk as one batch and records how
+far into the dump it got, so an interrupted import resumes from the last
+acknowledged statement. Exports are written by the server to a snapshot and
+downloaded with HTTP ranges into a .part file that survives interruptions.
+Memory use is bounded by the batch size either way.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Pattern, Tuple
+
+from ufazien.client import IMPORT_FAILED, IMPORT_RECEIVING, IMPORT_RUNNING, UfazienAPIClient
+from ufazien.operations import operation_id
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+READ_SIZE = 1024 * 1024
+DEFAULT_BATCH_STATEMENTS = 500
+DEFAULT_BATCH_BYTES = 4 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+COMPRESSIONS = ('gzip', 'zstd', 'none')
+COMPRESSION_EXTENSIONS = {'gzip': '.gz', 'zstd': '.zst', 'none': ''}
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+# (framed statements, statement count, dump offset after the batch, delimiter in effect)
+Batch = Tuple[bytes, int, int, bytes]
+
+
+def default_compression() -> str:
+    """Transfer compression used when none is requested: zstd if available, else gzip."""
+    return 'zstd' if zstandard is not None else 'gzip'
+
+
+def compression_for_path(path: str) -> str:
+    """Guess a file's compression from its extension."""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return 'none'
+
+
+def _require_zstd() -> None:
+    if zstandard is None:
+        raise Exception("zstd compression requires the 'zstandard' package (pip install ufazien-cli[zstd]).")
+
+
+def open_dump(raw: IO[bytes], compression: str) -> IO[bytes]:
+    """
+    Wrap a dump file so it reads decompressed SQL.
+
+    Args:
+        raw: The file as stored on disk
+        compression: gzip, zstd or none (see compression_for_path)
+    """
+    if compression == 'gzip':
+        return gzip.GzipFile(fileobj=raw, mode='rb')  # type: ignore[return-value]
+    if compression == 'zstd':
+        _require_zstd()
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=False)
+    return raw
+
+
+def compress(data: bytes, compression: str) -> bytes:
+    """Compress one chunk for transfer."""
+    if compression == 'gzip':
+        return gzip.compress(data, compresslevel=6)
+    if compression == 'zstd':
+        _require_zstd()
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def frame_statements(statements: List[bytes]) -> bytes:
+    """Encode statements as ``<length>\\n<statement>\\n`` records, so delimiters inside them are safe."""
+    return b''.join(b'%d\n%s\n' % (len(statement), statement) for statement in statements)
+
+
+def parse_frames(data: bytes) -> List[bytes]:
+    """Decode the records written by frame_statements."""
+    statements = []
+    pos = 0
+    while pos < len(data):
+        newline = data.index(b'\n', pos)
+        length = int(data[pos:newline])
+        start = newline + 1
+        statements.append(data[start:start + length])
+        pos = start + length + 1
+    return statements
+
+
+_WHITESPACE = re.compile(rb'\s*')
+_patterns: Dict[bytes, Pattern[bytes]] = {}
+
+
+def _normal_pattern(delimiter: bytes) -> Pattern[bytes]:
+    pattern = _patterns.get(delimiter)
+    if pattern is None:
+        pattern = _patterns[delimiter] = re.compile(rb"['\"`#]|--|/\*|" + re.escape(delimiter))
+    return pattern
+
+
+_QUOTE_PATTERNS = {quote: re.compile(rb'[\\' + quote + rb']') for quote in (b"'", b'"', b'`')}
+
+
+class StatementSplitter:
+    """
+    Incrementally splits MySQL-style SQL into statements.
+
+    Understands quoted strings and identifiers, ``--``/``#``/``/* */``
+    comments and mysqldump's ``DELIMITER`` lines. Statements that are only
+    comments are dropped, except executable ``/*! ... */`` comments.
+    """
+
+    def __init__(self, delimiter: bytes = b';', offset: int = 0):
+        """
+        Initialize the splitter.
+
+        Args:
+            delimiter: Statement delimiter in effect at the start
+            offset: Position of the first byte fed in the whole dump
+        """
+        self.delimiter = delimiter
+        self._buf = b''
+        self._base = offset
+        self._start = 0
+        self._pos = 0
+        self._state: Optional[bytes] = None
+        self._at_start = True
+        self._significant = False
+
+    def feed(self, data: bytes, final: bool = False) -> List[Tuple[bytes, int, bytes]]:
+        """
+        Add dump data and return the statements it completes.
+
+        Returns:
+            (statement, dump offset just after it, delimiter in effect after it) tuples
+        """
+        buf = self._buf + data if self._buf else data
+        pos = self._pos
+        done: List[Tuple[bytes, int, bytes]] = []
+
+        while True:
+            if self._state is None:
+                if self._at_start:
+                    ws_end = _WHITESPACE.match(buf, pos).end()  # type: ignore[union-attr]
+                    head = buf[ws_end:ws_end + 10]
+                    if not final and len(head) < 10 and b'DELIMITER '.startswith(head.upper()):
+                        pos = ws_end
+                        break
+                    if head.upper().startswith(b'DELIMITER') and head[9:10].isspace():
+                        newline = buf.find(b'\n', ws_end)
+                        if newline < 0 and not final:
+                            pos = ws_end
+                            break
+                        end = newline + 1 if newline >= 0 else len(buf)
+                        words = buf[ws_end:end].split()
+                        if len(words) > 1:
+                            self.delimiter = words[1]
+                        pos = self._start = end
+                        continue
+                    self._at_start = False
+
+                match = _normal_pattern(self.delimiter).search(buf, pos)
+                if match is None:
+                    # Leave a possibly split token (e.g. '-' of '--') for the next feed.
+                    scan_to = len(buf) if final else max(pos, len(buf) - max(2, len(self.delimiter)) + 1)
+                    if buf[pos:scan_to].strip():
+                        self._significant = True
+                    pos = scan_to
+                    break
+                token = match.group()
+                if buf[pos:match.start()].strip():
+                    self._significant = True
+                if token == self.delimiter:
+                    if self._significant:
+                        statement = buf[self._start:match.start()].strip()
+                        done.append((statement, self._base + match.end(), self.delimiter))
+                    pos = self._start = match.end()
+                    self._significant = False
+                    self._at_start = True
+                elif token in (b"'", b'"', b'`'):
+                    self._significant = True
+                    self._state = token
+                    pos = match.end()
+                elif token == b'#':
+                    self._state = b'\n'
+                    pos = match.end()
+                elif token == b'--':
+                    if match.end() >= len(buf) and not final:
+                        pos = match.start()
+                        break
+                    if buf[match.end():match.end() + 1] in (b' ', b'\t', b'\r', b'\n', b''):
+                        self._state = b'\n'
+                    else:
+                        self._significant = True
+                    pos = match.end()
+                else:  # '/*'
+                    if match.end() >= len(buf) and not final:
+                        pos = match.start()
+                        break
+                    if buf[match.end():match.end() + 1] == b'!':
+                        self._significant = True
+                    self._state = b'*/'
+                    pos = match.end()
+
+            elif self._state == b'\n':
+                newline = buf.find(b'\n', pos)
+                if newline < 0:
+                    pos = len(buf)
+                    break
+                self._state = None
+                pos = newline + 1
+
+            elif self._state == b'*/':
+                end = buf.find(b'*/', pos)
+                if end < 0:
+                    pos = max(pos, len(buf) - 1)
+                    break
+                self._state = None
+                pos = end + 2
+
+            else:
+                match = _QUOTE_PATTERNS[self._state].search(buf, pos)
+                if match is None:
+                    pos = len(buf)
+                    break
+                if match.end() >= len(buf) and not final:
+                    pos = match.start()
+                    break
+                if match.group() == b'\\':
+                    pos = match.end() + 1
+                elif buf[match.end():match.end() + 1] == self._state:
+                    pos = match.end() + 1  # doubled quote
+                else:
+                    self._state = None
+                    pos = match.end()
+
+        if final:
+            if self._significant and buf[self._start:].strip():
+                done.append((buf[self._start:].strip(), self._base + len(buf), self.delimiter))
+            self._buf, self._base, self._start, self._pos = b'', self._base + len(buf), 0, 0
+            return done
+
+        # Keep only the unfinished statement.
+        self._buf = buf[self._start:]
+        self._base += self._start
+        self._pos = pos - self._start
+        self._start = 0
+        return done
+
+
+def iter_batches(
+    reader: IO[bytes],
+    offset: int = 0,
+    delimiter: bytes = b';',
+    max_statements: int = DEFAULT_BATCH_STATEMENTS,
+    max_bytes: int = DEFAULT_BATCH_BYTES
+) -> Iterator[Batch]:
+    """
+    Read a dump and yield batches of statements.
+
+    Args:
+        reader: Decompressed dump
+        offset: Skip this many bytes (a statement boundary reported by an earlier batch)
+        delimiter: Delimiter in effect at ``offset``
+        max_statements: Statements per batch
+        max_bytes: Approximate size limit of a batch
+    """
+    remaining = offset
+    while remaining:
+        skipped = reader.read(min(remaining, READ_SIZE))
+        if not skipped:
+            raise Exception("The dump is shorter than the position the import stopped at.")
+        remaining -= len(skipped)
+
+    splitter = StatementSplitter(delimiter, offset)
+    statements: List[bytes] = []
+    size = 0
+    end, current_delimiter = offset, delimiter
+    while True:
+        data = reader.read(READ_SIZE)
+        for statement, end, current_delimiter in splitter.feed(data, final=not data):
+            statements.append(statement)
+            size += len(statement)
+            if len(statements) >= max_statements or size >= max_bytes:
+                yield frame_statements(statements), len(statements), end, current_delimiter
+                statements, size = [], 0
+        if not data:
+            break
+    if statements:
+        yield frame_statements(statements), len(statements), end, current_delimiter
+
+
+def import_dump(
+    client: UfazienAPIClient,
+    database_id: str,
+    path: str,
+    compression: Optional[str] = None,
+    max_statements: int = DEFAULT_BATCH_STATEMENTS,
+    max_bytes: int = DEFAULT_BATCH_BYTES,
+    restart: bool = False,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Import a SQL dump into a database, resuming an interrupted import of the same file.
+
+    An interrupted import that was already submitted (completed, or still
+    running on the server) is not run again; its result is returned. Only
+    failed or expired sessions start over.
+
+    Args:
+        client: Authenticated client
+        database_id: Database ID
+        path: SQL dump (.sql, .sql.gz or .sql.zst)
+        compression: Transfer compression (defaults to default_compression())
+        max_statements: Statements per batch
+        max_bytes: Approximate uncompressed size of a batch
+        restart: Start over instead of resuming
+        on_progress: Called with (bytes of the dump file read, file size)
+
+    Returns:
+        The completed import (with 'statements' executed in total)
+    """
+    compression = compression or default_compression()
+    if compression not in COMPRESSIONS:
+        raise Exception(f"Unknown compression '{compression}'. Use gzip, zstd or none.")
+    if compression == 'zstd':
+        _require_zstd()
+
+    stat = os.stat(path)
+    op_id = operation_id('db_import', {
+        'api': client.base_url,
+        'database_id': database_id,
+        'path': str(Path(path).resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    })
+    if restart:
+        client.pending.finish(op_id)
+    operation = client.pending.begin(op_id)
+
+    session = None
+    if operation.get('import_id'):
+        try:
+            session = client.get_database_import(database_id, operation['import_id'])
+        except Exception as e:
+            # Starting over could run statements twice, so never guess.
+            raise Exception(
+                f"Could not look up the interrupted import: {e}. "
+                "Try again, or pass --restart to start a new import."
+            )
+        status = session.get('status')
+        if status in IMPORT_FAILED:
+            session = None
+        elif status is not None and status not in IMPORT_RECEIVING:
+            return _finish_import(client, database_id, op_id, session)
+    if session is None:
+        session = client.start_database_import(
+            database_id,
+            filename=os.path.basename(path),
+            size=stat.st_size,
+            compression=compression,
+            idempotency_key=f"{operation['key']}-{operation.get('attempt', 0)}",
+        )
+        client.pending.update(op_id, import_id=session['id'], attempt=operation.get('attempt', 0) + 1)
+
+    cursor = json.loads(session['cursor']) if session.get('cursor') else {}
+    offset = cursor.get('offset', 0)
+    delimiter = cursor.get('delimiter', ';').encode('utf-8')
+
+    with open(path, 'rb') as raw:
+        reader = open_dump(raw, compression_for_path(path))
+        for payload, count, end, current_delimiter in iter_batches(
+            reader, offset, delimiter, max_statements, max_bytes
+        ):
+            new_cursor = json.dumps({'offset': end, 'delimiter': current_delimiter.decode('utf-8')})
+            session = client.upload_database_import_chunk(
+                database_id,
+                session['id'],
+                compress(payload, compression),
+                offset=offset,
+                cursor=new_cursor,
+                statements=count,
+                compression=compression,
+                idempotency_key=f"{operation['key']}-{session['id']}-{offset}",
+            )
+            offset = end
+            if on_progress is not None:
+                # Progress is measured in bytes of the file on disk, compressed or not.
+                on_progress(raw.tell(), stat.st_size)
+
+    result = client.complete_database_import(database_id, session['id'])
+    return _finish_import(client, database_id, op_id, result)
+
+
+def _finish_import(
+    client: UfazienAPIClient,
+    database_id: str,
+    op_id: str,
+    session: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Wait for a submitted import to run and forget the pending operation."""
+    if session.get('status') in IMPORT_RUNNING:
+        session = client.wait_for_database_import(database_id, session['id'], session)
+        if session.get('status') in IMPORT_RUNNING:
+            raise Exception(
+                "The import is still running on the server; run the command again to check on it."
+            )
+    client.pending.finish(op_id)
+    if session.get('status') in IMPORT_FAILED:
+        raise Exception(f"The import {session.get('status')}: {session.get('error') or 'no details'}")
+    return session
+
+
+def export_dump(
+    client: UfazienAPIClient,
+    database_id: str,
+    output: str,
+    compression: Optional[str] = None,
+    restart: bool = False,
+    on_progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """
+    Export a database to a SQL dump, resuming an interrupted download of the same file.
+
+    Args:
+        client: Authenticated client
+        database_id: Database ID
+        output: File to write; the server compresses the dump as it is written
+        compression: gzip, zstd or none (defaults to the output's extension)
+        restart: Start a new export instead of resuming
+        on_progress: Called with (bytes downloaded, total size)
+
+    Returns:
+        The export (with 'size' and 'sha256')
+    """
+    compression = compression or compression_for_path(output)
+    if compression not in COMPRESSIONS:
+        raise Exception(f"Unknown compression '{compression}'. Use gzip, zstd or none.")
+
+    part_path = output + '.part'
+    op_id = operation_id('db_export', {
+        'api': client.base_url,
+        'database_id': database_id,
+        'output': str(Path(output).resolve()),
+        'compression': compression,
+    })
+    if restart:
+        client.pending.finish(op_id)
+    operation = client.pending.begin(op_id)
+
+    export = None
+    if operation.get('export_id') and os.path.exists(part_path):
+        try:
+            export = client.get_database_export(database_id, operation['export_id'])
+        except Exception:
+            export = None
+    if export is None:
+        export = client.start_database_export(
+            database_id, compression, idempotency_key=f"{operation['key']}-{operation.get('attempt', 0)}"
+        )
+        client.pending.update(op_id, export_id=export['id'], attempt=operation.get('attempt', 0) + 1)
+        with open(part_path, 'wb'):
+            pass
+
+    total = export['size']
+    done = os.path.getsize(part_path)
+    if done > total:
+        raise Exception(f"{part_path} is larger than the export; remove it and try again.")
+    with open(part_path, 'ab') as f:
+        while done < total:
+            data = client.download_database_export(
+                database_id, export['id'], done, min(DOWNLOAD_CHUNK_SIZE, total - done)
+            )
+            if not data:
+                raise Exception("The server returned no data for the export.")
+            f.write(data)
+            done += len(data)
+            if on_progress is not None:
+                on_progress(done, total)
+
+    if export.get('sha256'):
+        digest = hashlib.sha256()
+        with open(part_path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_SIZE), b''):
+                digest.update(block)
+        if digest.hexdigest() != export['sha256']:
+            os.remove(part_path)
+            client.pending.finish(op_id)
+            raise Exception("The downloaded export is corrupt (checksum mismatch); run the export again.")
+
+    os.replace(part_path, output)
+    client.pending.finish(op_id)
+    return export
+
@@ -0,0 +1,41 @@
+"""
+Machine-readable event output (``ufazien --output json``).
+
+Each event is one JSON object per line on stdout. Every event has
+``event``, ``command``, ``timestamp`` (Unix seconds) and ``elapsed``
+(seconds since the command started), plus fields specific to the event.
+Failures are reported as an ``error`` event carrying the exit code.
+"""
+
+import json
+import sys
+import time
+from typing import IO, Any, Optional
+
+
+class EventStream:
+    """Writes newline-delimited JSON events."""
+
+    def __init__(self, command: Optional[str] = None, stream: Optional[IO[str]] = None):
+        """
+        Initialize the stream.
+
+        Args:
+            command: Name of the command the events belong to
+            stream: Where to write (defaults to stdout)
+        """
+        self.command = command
+        self.stream = stream or sys.stdout
+        self.started = time.monotonic()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        """Write one event."""
+        record = {
+            'event': event,
+            'command': self.command,
+            'timestamp': round(time.time(), 6),
+            'elapsed': round(time.monotonic() - self.started, 6),
+        }
+        record.update(fields)
+        self.stream.write(json.dumps(record, default=str) + '\n')
+        self.stream.flush()
@@ -0,0 +1,66 @@
+"""
+Locks around files shared by threads and CLI processes.
+
+State files under ~/.ufazien (tokens, pending operations) are read,
+modified and written back by whichever process is running. An exclusive
+``fcntl.flock`` on a sibling ``.lock`` file serializes those updates across
+processes; a re-entrant thread lock does the same within one process.
+"""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+class FileLock:
+    """Re-entrant lock around a file, shared by threads and processes."""
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = lock_path
+        self.thread_lock = threading.RLock()
+        self.depth = 0
+        self.handle: Optional[Any] = None
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self.thread_lock:
+            if self.depth == 0 and fcntl is not None:
+                try:
+                    self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+                    self.handle = open(self.lock_path, 'a')
+                    fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+                except OSError:
+                    self.handle = None
+            self.depth += 1
+            try:
+                yield
+            finally:
+                self.depth -= 1
+                if self.depth == 0 and self.handle is not None:
+                    try:
+                        fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+                    finally:
+                        self.handle.close()
+                        self.handle = None
+
+
+_file_locks: Dict[str, FileLock] = {}
+_file_locks_guard = threading.Lock()
+
+
+def get_file_lock(path: Path) -> FileLock:
+    """Return the process-wide lock for ``path`` (held on ``<path>.lock``)."""
+    path = Path(path)
+    key = str(path.resolve())
+    with _file_locks_guard:
+        lock = _file_locks.get(key)
+        if lock is None:
+            lock = FileLock(path.with_name(path.name + '.lock'))
+            _file_locks[key] = lock
+        return lock
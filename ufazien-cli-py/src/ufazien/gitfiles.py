@@ -0,0 +1,229 @@
+"""
+Deploy file lists taken from git instead of walking the file system.
+
+Without a ref, the tracked files in the git index are deployed from the
+working tree, so untracked build output and junk are skipped without any
+.ufazienignore rules. With a ref, contents are read straight from git
+objects (no checkout) into a cache keyed by blob ID under ~/.ufazien/git.
+
+In both modes a symlink to a tracked file of the project is deployed as that
+file, like a file system deploy; other symlinks are skipped. The .env file
+is usually gitignored, so it is added from the working tree.
+"""
+
+import os
+import posixpath
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ufazien.utils import ignore_rule_matches, read_ignore_patterns
+
+GIT_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Tree entry modes for regular and executable files and for symlinks, which
+# are followed; submodules (160000) are not deployed.
+_FILE_MODES = ('100644', '100755')
+_LINK_MODE = '120000'
+_MAX_LINK_DEPTH = 40
+
+# Gitignored files that are still deployed, from the working tree.
+WORKING_TREE_FILES = ('.env',)
+
+
+def _git(project_dir: str, *args: str) -> bytes:
+    try:
+        result = subprocess.run(
+            ['git', '-C', project_dir, *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except FileNotFoundError:
+        raise Exception("git is not installed or not on PATH.")
+    except subprocess.CalledProcessError as e:
+        message = e.stderr.decode('utf-8', 'replace').strip() or f"git {args[0]} failed"
+        raise Exception(message)
+    return result.stdout
+
+
+def _strip_folder(name: str, folder: Optional[str]) -> Optional[str]:
+    if not folder:
+        return name
+    prefix = folder.strip('/') + '/'
+    return name[len(prefix):] if name.startswith(prefix) else None
+
+
+def _ignored(name: str, patterns: List[str]) -> bool:
+    return any(ignore_rule_matches(pattern, name) for pattern in patterns)
+
+
+def _cache_dir() -> Path:
+    return Path.home() / '.ufazien' / 'git'
+
+
+def _export_blobs(project_dir: str, blobs: List[Tuple[str, str]], cache_dir: Path) -> None:
+    """Stream missing blobs (object ID, mode) into ``cache_dir`` through one git cat-file."""
+    missing = [(oid, mode) for oid, mode in blobs if not (cache_dir / oid).exists()]
+    if not missing:
+        return
+
+    process = subprocess.Popen(
+        ['git', '-C', project_dir, 'cat-file', '--batch'],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+    stdin, stdout = process.stdin, process.stdout
+    assert stdin is not None and stdout is not None
+
+    def feed() -> None:
+        with stdin:
+            for oid, _ in missing:
+                stdin.write(f'{oid}\n'.encode())
+
+    # Feed object IDs from a thread so neither pipe can fill up and block.
+    writer = threading.Thread(target=feed, daemon=True)
+    writer.start()
+    try:
+        for oid, mode in missing:
+            header = stdout.readline().split()
+            if len(header) != 3:
+                raise Exception(f"Could not read git object {oid}")
+            remaining = int(header[2])
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                while remaining:
+                    chunk = stdout.read(min(remaining, 1024 * 1024))
+                    if not chunk:
+                        raise Exception(f"Unexpected end of git object {oid}")
+                    f.write(chunk)
+                    remaining -= len(chunk)
+            stdout.read(1)  # newline after each object
+            os.chmod(tmp_path, 0o755 if mode == '100755' else 0o644)
+            os.replace(tmp_path, cache_dir / oid)
+    finally:
+        stdout.close()
+        process.wait()
+        writer.join()
+
+
+def _inside(name: str) -> bool:
+    return not (name == '..' or name.startswith('../') or posixpath.isabs(name))
+
+
+def _resolve_tree_link(name: str, tree: Dict[str, Tuple[str, str]], cache_dir: Path) -> Optional[Tuple[str, str]]:
+    """Follow a symlink entry of ``tree`` to the (mode, object ID) of the file it points to."""
+    for _ in range(_MAX_LINK_DEPTH):
+        mode, oid = tree[name]
+        if mode in _FILE_MODES:
+            return mode, oid
+        if mode != _LINK_MODE:
+            return None
+        # Symlink blobs hold the link target, exported like any other blob.
+        link = (cache_dir / oid).read_bytes().decode('utf-8', 'surrogateescape')
+        name = posixpath.normpath(posixpath.join(posixpath.dirname(name), link))
+        if not _inside(name) or name not in tree:
+            return None
+    return None
+
+
+def _prune(cache_dir: Path, keep: set) -> None:
+    cutoff = time.time() - GIT_CACHE_MAX_AGE
+    for path in cache_dir.iterdir():
+        if path.name in keep:
+            os.utime(path, None)
+            continue
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def list_git_files(
+    project_dir: str,
+    ref: Optional[str] = None,
+    folder: Optional[str] = None,
+    apply_ignore: bool = True
+) -> List[Tuple[Path, str]]:
+    """
+    List deployable files as (path, archive name) from git.
+
+    Symlinks to tracked files of the project are listed as the files they
+    point to; a working-tree .env missing from git is added.
+
+    Args:
+        project_dir: Project directory inside a git work tree
+        ref: Commit, branch or tag to read from; the index and working tree if None
+        folder: Only deploy this subfolder, with names relative to it (build projects)
+        apply_ignore: Filter the list with the project's .ufazienignore
+
+    Returns:
+        Sorted (path, archive name) pairs; with a ref, paths point into the blob cache
+    """
+    project_path = Path(project_dir).resolve()
+    patterns = read_ignore_patterns(project_path / '.ufazienignore') if apply_ignore else []
+
+    # The whole project is listed so symlinks can be followed out of the folder.
+    result = []
+    if ref is None:
+        output = _git(str(project_path), 'ls-files', '-z', '--cached', '--', '.')
+        tracked = {name for name in output.decode('utf-8').split('\0') if name}
+        for name in tracked:
+            arcname = _strip_folder(name, folder)
+            if not arcname or _ignored(name, patterns):
+                continue
+            file_path = project_path / name
+            if file_path.is_symlink():
+                target = os.path.relpath(os.path.realpath(file_path), project_path).replace(os.sep, '/')
+                if not _inside(target) or target not in tracked:
+                    continue
+                file_path = project_path / target
+            # Deleted but not yet staged, or replaced by a directory
+            if file_path.is_file():
+                result.append((file_path, arcname))
+    else:
+        output = _git(str(project_path), 'ls-tree', '-r', '-z', ref, '--', '.')
+        tree: Dict[str, Tuple[str, str]] = {}
+        for line in output.decode('utf-8').split('\0'):
+            if not line:
+                continue
+            meta, name = line.split('\t', 1)
+            mode, kind, oid = meta.split()
+            if kind == 'blob':
+                tree[name] = (mode, oid)
+
+        cache_dir = _cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        links = [(oid, mode) for mode, oid in tree.values() if mode == _LINK_MODE]
+        _export_blobs(str(project_path), links, cache_dir)
+
+        blobs = []
+        entries = []
+        for name, (mode, oid) in tree.items():
+            arcname = _strip_folder(name, folder)
+            if not arcname or _ignored(name, patterns):
+                continue
+            resolved = _resolve_tree_link(name, tree, cache_dir)
+            if resolved is None:
+                continue
+            blobs.append((resolved[1], resolved[0]))
+            entries.append((resolved[1], arcname))
+
+        _export_blobs(str(project_path), blobs, cache_dir)
+        _prune(cache_dir, {oid for oid, _ in blobs + links})
+        result = [(cache_dir / oid, arcname) for oid, arcname in entries]
+
+    arcnames = {arcname for _, arcname in result}
+    for arcname in WORKING_TREE_FILES:
+        name = f"{folder.strip('/')}/{arcname}" if folder else arcname
+        file_path = project_path / name
+        if arcname not in arcnames and file_path.is_file() and not _ignored(name, patterns):
+            result.append((file_path, arcname))
+
+    result.sort(key=lambda item: item[1])
+    return result
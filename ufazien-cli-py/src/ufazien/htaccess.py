@@ -0,0 +1,170 @@
+"""
+Apache .htaccess rules for caching and compression.
+
+Scaffolded projects get an ``.htaccess`` with a managed block between
+``# BEGIN Ufazien`` and ``# END Ufazien``. The block turns on on-the-fly
+compression and sets cache headers; on deploy it is rebuilt from the files
+actually being shipped (see ufazien.transforms.sync_htaccess_files), so
+precompressed sidecars are served where they exist and fingerprinted assets
+are cached as immutable. Rules outside the block are left alone.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+HTACCESS_NAME = '.htaccess'
+BEGIN_MARKER = '# BEGIN Ufazien'
+END_MARKER = '# END Ufazien'
+
+HTML_CACHE_CONTROL = 'public, max-age=300, must-revalidate'
+ASSET_CACHE_CONTROL = 'public, max-age=3600'
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+COMPRESSIBLE_TYPES = (
+    'text/html text/plain text/css text/javascript application/javascript '
+    'application/json application/xml image/svg+xml'
+)
+# Content types of precompressed sidecars, by extension of the original file.
+SIDECAR_TYPES = {
+    'html': 'text/html',
+    'htm': 'text/html',
+    'css': 'text/css',
+    'js': 'text/javascript',
+    'mjs': 'text/javascript',
+    'svg': 'image/svg+xml',
+    'json': 'application/json',
+}
+# Encodings in order of preference: (sidecar suffix, Content-Encoding, Accept-Encoding token).
+SIDECAR_ENCODINGS = (('br', 'br', 'br'), ('gz', 'gzip', 'gzip'))
+ASSET_EXTENSIONS = (
+    'css', 'js', 'mjs', 'json', 'svg', 'png', 'jpe?g', 'gif', 'webp', 'avif', 'ico',
+    'woff2?', 'ttf', 'otf', 'eot',
+)
+
+# Apache reads configuration lines of up to 16 KiB; stay well below that.
+MAX_PATTERN_LENGTH = 4000
+
+_BLOCK = re.compile(
+    r'^' + re.escape(BEGIN_MARKER) + r'$.*?^' + re.escape(END_MARKER) + r'$\n?', re.M | re.S
+)
+
+
+def _alternatives(names: Iterable[str]) -> List[str]:
+    """Split names into ``a|b|c`` regex alternations no longer than MAX_PATTERN_LENGTH."""
+    groups: List[str] = []
+    current = ''
+    for name in sorted(set(names)):
+        escaped = re.escape(name)
+        if current and len(current) + len(escaped) + 1 > MAX_PATTERN_LENGTH:
+            groups.append(current)
+            current = ''
+        current = f'{current}|{escaped}' if current else escaped
+    if current:
+        groups.append(current)
+    return groups
+
+
+def render_block(
+    fingerprinted: Optional[Iterable[str]] = None,
+    precompressed: Optional[Dict[str, Set[str]]] = None
+) -> str:
+    """
+    Render the managed .htaccess block.
+
+    Args:
+        fingerprinted: Base names of content-hashed assets, cached as immutable
+        precompressed: Sidecar suffix ('gz' or 'br') to the extensions of files that have one
+
+    Returns:
+        The block, including the BEGIN and END markers
+    """
+    precompressed = precompressed or {}
+    lines = [
+        BEGIN_MARKER,
+        '# Generated by ufazien and rebuilt on every deploy from the deployed files.',
+        '# Add your own rules outside this block.',
+        '',
+        '# Validate cached copies by modification time and size',
+        'FileETag MTime Size',
+        '',
+        '# Compress text responses on the fly',
+        '<IfModule mod_brotli.c>',
+        f'    AddOutputFilterByType BROTLI_COMPRESS {COMPRESSIBLE_TYPES}',
+        '</IfModule>',
+        '<IfModule mod_deflate.c>',
+        f'    AddOutputFilterByType DEFLATE {COMPRESSIBLE_TYPES}',
+        '</IfModule>',
+    ]
+
+    served = [
+        (suffix, encoding, token, sorted(precompressed[suffix] & set(SIDECAR_TYPES)))
+        for suffix, encoding, token in SIDECAR_ENCODINGS
+        if precompressed.get(suffix, set()) & set(SIDECAR_TYPES)
+    ]
+    if served:
+        lines += [
+            '',
+            '# Serve precompressed files to clients that accept them',
+            '<IfModule mod_rewrite.c>',
+            '<IfModule mod_headers.c>',
+            '    RewriteEngine On',
+        ]
+        for suffix, _, token, extensions in served:
+            lines += [
+                f'    RewriteCond %{{HTTP:Accept-Encoding}} \\b{token}\\b',
+                f'    RewriteCond %{{REQUEST_FILENAME}}.{suffix} -s',
+                f'    RewriteRule ^(.+)\\.({"|".join(extensions)})$ $1.$2.{suffix} [L]',
+            ]
+        all_extensions = sorted({ext for *_, extensions in served for ext in extensions})
+        suffixes = '|'.join(suffix for suffix, *_ in served)
+        for ext in all_extensions:
+            lines.append(
+                f'    RewriteRule \\.{ext}\\.({suffixes})$ - [T={SIDECAR_TYPES[ext]},E=no-gzip:1,E=no-brotli:1]'
+            )
+        for suffix, encoding, _, extensions in served:
+            lines += [
+                f'    <FilesMatch "\\.({"|".join(extensions)})\\.{suffix}$">',
+                f'        Header set Content-Encoding {encoding}',
+                '        Header append Vary Accept-Encoding',
+                '    </FilesMatch>',
+            ]
+        lines += ['</IfModule>', '</IfModule>']
+
+    sidecar = r'(\.(br|gz))?'
+    lines += [
+        '',
+        '# HTML is revalidated after a few minutes so deploys show up quickly;',
+        '# other static files are cached for an hour',
+        '<IfModule mod_headers.c>',
+        f'    <FilesMatch "\\.html?{sidecar}$">',
+        f'        Header set Cache-Control "{HTML_CACHE_CONTROL}"',
+        '    </FilesMatch>',
+        f'    <FilesMatch "\\.({"|".join(ASSET_EXTENSIONS)}){sidecar}$">',
+        f'        Header set Cache-Control "{ASSET_CACHE_CONTROL}"',
+        '    </FilesMatch>',
+    ]
+    groups = _alternatives(fingerprinted or [])
+    if groups:
+        lines.append('    # Fingerprinted assets never change under the same name')
+        for group in groups:
+            lines += [
+                f'    <FilesMatch "^({group}){sidecar}$">',
+                f'        Header set Cache-Control "{IMMUTABLE_CACHE_CONTROL}"',
+                '    </FilesMatch>',
+            ]
+    lines += ['</IfModule>', END_MARKER]
+    return '\n'.join(lines) + '\n'
+
+
+def has_block(text: str) -> bool:
+    """Check whether an .htaccess contains the managed block."""
+    return _BLOCK.search(text) is not None
+
+
+def replace_block(text: str, block: str) -> str:
+    """Replace the managed block in an .htaccess, or append it if there is none."""
+    if has_block(text):
+        return _BLOCK.sub(lambda _: block, text, count=1)
+    if text and not text.endswith('\n'):
+        text += '\n'
+    return f'{text}\n{block}' if text else block
@@ -0,0 +1,276 @@
+"""
+Conservative minifiers for HTML, CSS, JavaScript and JSON.
+
+These only remove what is provably safe to remove (comments and redundant
+whitespace); they never rename, reorder or rewrite code. License comments
+(``/*! ... */``, ``@license``, ``@preserve``) and the contents of ``<pre>``,
+``<textarea>``, ``<script>`` and ``<style>`` elements are kept verbatim. When
+input cannot be scanned reliably a ``MinifyError`` is raised and callers
+should ship the original.
+"""
+
+import json
+import re
+
+
+class MinifyError(Exception):
+    """Raised when input cannot be minified safely."""
+
+
+def _is_license_comment(comment: str) -> bool:
+    return comment.startswith('/*!') or '@license' in comment or '@preserve' in comment
+
+
+def _read_string(source: str, start: int) -> int:
+    """Return the index just past the quoted string starting at ``start``."""
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == quote:
+            return i + 1
+        if ch == '\n' and quote != '`':
+            break
+        i += 1
+    raise MinifyError('unterminated string')
+
+
+def minify_css(source: str) -> str:
+    """Strip comments and redundant whitespace from CSS."""
+    out = []
+    i = 0
+    pending_space = False
+    while i < len(source):
+        ch = source[i]
+        if ch in '"\'':
+            end = _read_string(source, i)
+            if pending_space and out and out[-1][-1:] not in '{};,>(:':
+                out.append(' ')
+            pending_space = False
+            out.append(source[i:end])
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            if end < 0:
+                raise MinifyError('unterminated comment')
+            comment = source[i:end + 2]
+            if _is_license_comment(comment):
+                out.append(comment)
+            else:
+                pending_space = True
+            i = end + 2
+        elif ch.isspace():
+            pending_space = True
+            i += 1
+        else:
+            if ch in '{};,>)':
+                pending_space = False
+                if ch == '}' and out and out[-1] == ';':
+                    out.pop()
+            elif pending_space and out and out[-1][-1:] not in '{};,>(:':
+                out.append(' ')
+            pending_space = False
+            out.append(ch)
+            i += 1
+    return ''.join(out).strip()
+
+
+# Tokens after which a '/' starts a regular expression rather than a division.
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+_REGEX_KEYWORDS = ('return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw', 'case', 'do', 'else')
+
+
+def _regex_allowed(out: list) -> bool:
+    text = ''.join(out[-8:]).rstrip()
+    if not text:
+        return True
+    if text[-1] in _REGEX_PRECEDERS:
+        return True
+    match = re.search(r'([A-Za-z_$][\w$]*)$', text)
+    return bool(match and match.group(1) in _REGEX_KEYWORDS)
+
+
+def _read_regex(source: str, start: int) -> int:
+    i = start + 1
+    in_class = False
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '\n':
+            break
+        if ch == '[':
+            in_class = True
+        elif ch == ']':
+            in_class = False
+        elif ch == '/' and not in_class:
+            i += 1
+            while i < len(source) and (source[i].isalnum() or source[i] in '_$'):
+                i += 1
+            return i
+        i += 1
+    raise MinifyError('unterminated regular expression')
+
+
+def _read_template(source: str, start: int) -> int:
+    """Return the index just past the template literal starting at ``start``."""
+    i = start + 1
+    while i < len(source):
+        ch = source[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '`':
+            return i + 1
+        if source.startswith('${', i):
+            i = _skip_js_expression(source, i + 2)
+            continue
+        i += 1
+    raise MinifyError('unterminated template literal')
+
+
+def _skip_js_expression(source: str, start: int) -> int:
+    """Skip a ``${ ... }`` template substitution, returning the index past its brace."""
+    depth = 1
+    i = start
+    while i < len(source):
+        ch = source[i]
+        if ch in '"\'':
+            i = _read_string(source, i)
+            continue
+        if ch == '`':
+            i = _read_template(source, i)
+            continue
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise MinifyError('unterminated template substitution')
+
+
+def minify_js(source: str) -> str:
+    """
+    Strip comments, indentation and blank lines from JavaScript.
+
+    Line breaks are kept so automatic semicolon insertion behaves exactly as
+    in the original source.
+    """
+    out: list = []
+
+    def emit_space(ch: str) -> None:
+        if ch == '\n':
+            while out and out[-1] in (' ', '\t'):
+                out.pop()
+            if out and out[-1] != '\n':
+                out.append('\n')
+        elif out and out[-1] not in (' ', '\t', '\n'):
+            out.append(' ')
+
+    i = 0
+    while i < len(source):
+        ch = source[i]
+        if ch in '"\'':
+            end = _read_string(source, i)
+            out.append(source[i:end])
+            i = end
+        elif ch == '`':
+            end = _read_template(source, i)
+            out.append(source[i:end])
+            i = end
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            end = len(source) if end < 0 else end
+            comment = source[i:end]
+            if '@license' in comment or '@preserve' in comment:
+                out.append(comment)
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            if end < 0:
+                raise MinifyError('unterminated comment')
+            comment = source[i:end + 2]
+            if _is_license_comment(comment):
+                out.append(comment)
+            else:
+                emit_space('\n' if '\n' in comment else ' ')
+            i = end + 2
+        elif ch == '/' and _regex_allowed(out):
+            end = _read_regex(source, i)
+            out.append(source[i:end])
+            i = end
+        elif ch in ' \t\r\n':
+            emit_space('\n' if ch == '\n' else ' ')
+            i += 1
+        else:
+            out.append(ch)
+            i += 1
+
+    return ''.join(out).strip()
+
+
+def minify_json(source: str) -> str:
+    """Strip whitespace outside strings from JSON, leaving values untouched."""
+    try:
+        json.loads(source)
+    except ValueError as e:
+        raise MinifyError(f'invalid JSON: {e}')
+    out = []
+    i = 0
+    while i < len(source):
+        ch = source[i]
+        if ch == '"':
+            end = _read_string(source, i)
+            out.append(source[i:end])
+            i = end
+        else:
+            if not ch.isspace():
+                out.append(ch)
+            i += 1
+    return ''.join(out)
+
+
+_HTML_RAW_ELEMENTS = re.compile(r'(<(pre|textarea|script|style)\b.*?</\2\s*>)', re.IGNORECASE | re.DOTALL)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if|<!).*?-->', re.DOTALL)
+_HTML_TAG = re.compile(r"""(<[^>"']*(?:(?:"[^"]*"|'[^']*')[^>"']*)*>)""")
+
+
+def _collapse_html_text(text: str) -> str:
+    text = re.sub(r'\s*\n\s*', '\n', text)
+    return re.sub(r'[ \t\r\f\v]{2,}', ' ', text)
+
+
+def minify_html(source: str) -> str:
+    """
+    Strip comments and collapse whitespace in HTML text.
+
+    Whitespace runs are collapsed rather than removed, so inline layout is
+    unchanged. Tags and their attribute values, conditional comments and
+    raw-text elements are preserved.
+    """
+    parts = _HTML_RAW_ELEMENTS.split(source)
+    out = []
+    # re.split yields [text, raw element, tag name, text, ...]
+    for index in range(0, len(parts), 3):
+        text = _HTML_COMMENT.sub('', parts[index])
+        for piece in _HTML_TAG.split(text):
+            out.append(piece if piece.startswith('<') else _collapse_html_text(piece))
+        if index + 1 < len(parts):
+            out.append(parts[index + 1])
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {
+    '.html': minify_html,
+    '.htm': minify_html,
+    '.css': minify_css,
+    '.js': minify_js,
+    '.mjs': minify_js,
+    '.json': minify_json,
+}
@@ -0,0 +1,107 @@
+"""
+Locally persisted pending operations.
+
+Mutating API calls carry a client-generated idempotency key. The key (and
+any intermediate results) is written to ~/.ufazien/pending.json before the
+call is made and removed once it succeeds, so a call that timed out or was
+interrupted is retried with the same key - and the server answers with the
+original result instead of creating a duplicate. Updates hold a file lock,
+so several CLI processes (say ``watch`` and a manual deploy) can share the
+file without losing each other's keys.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ufazien.filelock import get_file_lock
+
+# Pending operations older than this are assumed abandoned.
+PENDING_MAX_AGE = 7 * 24 * 3600
+
+
+def new_idempotency_key() -> str:
+    """Generate a fresh idempotency key."""
+    return str(uuid.uuid4())
+
+
+def operation_id(kind: str, params: Dict[str, Any]) -> str:
+    """Derive a stable ID for an operation from its kind and parameters."""
+    encoded = json.dumps(params, sort_keys=True, default=str).encode('utf-8')
+    return f'{kind}:{hashlib.sha256(encoded).hexdigest()[:16]}'
+
+
+class PendingOperations:
+    """JSON file of operations that have started but not yet been confirmed."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = get_file_lock(self.path)
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                records = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+        cutoff = time.time() - PENDING_MAX_AGE
+        return {op: record for op, record in records.items() if record.get('created_at', 0) >= cutoff}
+
+    def _write(self, records: Dict[str, Dict[str, Any]]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix='.pending.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(records, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def get(self, op_id: str) -> Optional[Dict[str, Any]]:
+        """Return a pending operation, or None."""
+        with self._lock.hold():
+            return self._read().get(op_id)
+
+    def begin(self, op_id: str, **fields: Any) -> Dict[str, Any]:
+        """
+        Return the pending operation ``op_id``, creating it with a new key if needed.
+
+        Args:
+            op_id: Operation ID (see operation_id)
+            fields: Extra data stored with a newly created operation
+        """
+        with self._lock.hold():
+            records = self._read()
+            record = records.get(op_id)
+            if record is None:
+                record = dict(fields, key=new_idempotency_key(), created_at=time.time())
+                records[op_id] = record
+                self._write(records)
+            return record
+
+    def update(self, op_id: str, **fields: Any) -> None:
+        """Store intermediate results of a pending operation."""
+        with self._lock.hold():
+            records = self._read()
+            if op_id in records:
+                records[op_id].update(fields)
+                self._write(records)
+
+    def finish(self, op_id: str) -> None:
+        """Forget an operation that has completed."""
+        with self._lock.hold():
+            records = self._read()
+            if records.pop(op_id, None) is not None:
+                self._write(records)
@@ -5,23 +5,28 @@ Project structure creation utilities.
 from pathlib import Path
 from typing import Any, Dict, Optional
 
+from ufazien.htaccess import render_block, replace_block
+from ufazien.serviceworker import REGISTRATION_SNIPPET, SERVICE_WORKER_NAME, SERVICE_WORKER_TEMPLATE
+
 
 def create_config_file(project_dir: str, db_creds: Dict[str, Any]) -> None:
-    """Create config.php file to load environment variables."""
+    """
+    Create config.php file to load environment variables.
+
+    On deploy, ``.env`` is compiled to ``.env.php`` (see
+    ufazien.transforms.compile_env_files), which config.php loads instead of
+    parsing ``.env`` on every request.
+    """
     db_name = db_creds.get('name', '')
     config_content = f"""<?php
 /**
  * Ufazien Configuration
- * Loads environment variables from .env file
+ * Loads environment variables from .env.php (compiled on deploy) or .env
  */
 
-// Load environment variables from .env file
-function loadEnv($path) {{
-    if (!file_exists($path)) {{
-        // .env file not found, use defaults or environment variables
-        return;
-    }}
-    
+// Parse a .env file (only used when no compiled .env.php exists, e.g. locally)
+function parseEnv($path) {{
+    $values = [];
     $lines = file($path, FILE_IGNORE_NEW_LINES | FILE_SKIP_EMPTY_LINES);
     foreach ($lines as $line) {{
         if (strpos(trim($line), '#') === 0) {{
@@ -34,28 +39,40 @@ function loadEnv($path) {{
         
         list($name, $value) = explode('=', $line, 2);
         $name = trim($name);
-        $value = trim($value);
-        
-        if (!array_key_exists($name, $_ENV)) {{
-            putenv("$name=$value");
-            $_ENV[$name] = $value;
+        if (!array_key_exists($name, $values)) {{
+            $values[$name] = trim($value);
+        }}
+    }}
+    return $values;
+}}
+
+// Load environment variables - the compiled array is cached by opcache
+function loadEnv() {{
+    $compiled = __DIR__ . '/.env.php';
+    if (is_file($compiled)) {{
+        return require $compiled;
+    }}
+    
+    // Try multiple possible locations
+    $envPaths = [
+        __DIR__ . '/.env',           // Same directory as config.php (root)
+        dirname(__DIR__) . '/.env',  // Parent directory (if config.php is in subdirectory)
+        getcwd() . '/.env',          // Current working directory
+    ];
+    foreach ($envPaths as $envPath) {{
+        if (file_exists($envPath)) {{
+            return parseEnv($envPath);
         }}
     }}
+    
+    // .env file not found, use defaults or environment variables
+    return [];
 }}
 
-// Load .env file - try multiple possible locations
-$envPaths = [
-    __DIR__ . '/.env',           // Same directory as config.php (root)
-    dirname(__DIR__) . '/.env',  // Parent directory (if config.php is in subdirectory)
-    getcwd() . '/.env',          // Current working directory
-];
-
-$envLoaded = false;
-foreach ($envPaths as $envPath) {{
-    if (file_exists($envPath)) {{
-        loadEnv($envPath);
-        $envLoaded = true;
-        break;
+foreach (loadEnv() as $name => $value) {{
+    if (!array_key_exists($name, $_ENV)) {{
+        putenv("$name=$value");
+        $_ENV[$name] = $value;
     }}
 }}
 
@@ -65,15 +82,24 @@ define('DB_USER', getenv('DB_USER') ?: 'root');
 define('DB_PASSWORD', getenv('DB_PASSWORD') ?: '');
 define('DB_NAME', getenv('DB_NAME') ?: '{db_name}');
 define('DB_PORT', getenv('DB_PORT') ?: '3306');
+// Reuse connections across requests (PDO::ATTR_PERSISTENT)
+define('DB_PERSISTENT', filter_var(getenv('DB_PERSISTENT'), FILTER_VALIDATE_BOOLEAN));
 
-// Create database connection
+// Get the database connection, opened once per request
 function getDBConnection() {{
+    static $conn = null;
+    if ($conn !== null) {{
+        return $conn;
+    }}
+    
     try {{
         $dsn = "mysql:host=" . DB_HOST . ";port=" . DB_PORT . ";dbname=" . DB_NAME . ";charset=utf8mb4";
-        $conn = new PDO($dsn, DB_USER, DB_PASSWORD);
-        $conn->setAttribute(PDO::ATTR_ERRMODE, PDO::ERRMODE_EXCEPTION);
-        $conn->setAttribute(PDO::ATTR_DEFAULT_FETCH_MODE, PDO::FETCH_ASSOC);
-        $conn->setAttribute(PDO::ATTR_EMULATE_PREPARES, false);
+        $conn = new PDO($dsn, DB_USER, DB_PASSWORD, [
+            PDO::ATTR_PERSISTENT => DB_PERSISTENT,
+            PDO::ATTR_ERRMODE => PDO::ERRMODE_EXCEPTION,
+            PDO::ATTR_DEFAULT_FETCH_MODE => PDO::FETCH_ASSOC,
+            PDO::ATTR_EMULATE_PREPARES => false,
+        ]);
         
         return $conn;
     }} catch (PDOException $e) {{
@@ -100,6 +126,8 @@ DB_PORT={db_creds['port']}
 DB_NAME={db_creds['name']}
 DB_USER={db_creds['username']}
 DB_PASSWORD={db_creds['password']}
+# Set to true to reuse MySQL connections across requests
+DB_PERSISTENT=false
 """
 
     env_path = Path(project_dir) / '.env'
@@ -317,6 +345,14 @@ ENV/
         f.write(ufazienignore_content)
 
 
+def create_htaccess(project_dir: str) -> None:
+    """Create .htaccess with caching and compression rules (or add them to an existing one)."""
+    htaccess_path = Path(project_dir) / '.htaccess'
+    content = htaccess_path.read_text(encoding='utf-8') if htaccess_path.exists() else ''
+    with open(htaccess_path, 'w', encoding='utf-8') as f:
+        f.write(replace_block(content, render_block()))
+
+
 def create_php_project_structure(project_dir: str, website_name: str, has_database: bool = False) -> None:
     """Create PHP project structure with boilerplate code."""
     project_path = Path(project_dir)
@@ -582,9 +618,20 @@ $conn = get_connection();
         with open(database_path, 'w', encoding='utf-8') as f:
             f.write(database_php_content)
 
+    # Create .htaccess with caching and compression rules
+    create_htaccess(project_dir)
 
-def create_static_project_structure(project_dir: str, website_name: str) -> None:
-    """Create static website project structure with boilerplate code."""
+
+def create_static_project_structure(project_dir: str, website_name: str, service_worker: bool = False) -> None:
+    """
+    Create static website project structure with boilerplate code.
+
+    Args:
+        project_dir: Project directory
+        website_name: Website name shown in the pages
+        service_worker: Also create sw.js, which `ufazien deploy` fills with a
+            precache manifest, and register it from main.js
+    """
     project_path = Path(project_dir)
 
     # Create src directory
@@ -795,10 +842,22 @@ document.addEventListener('DOMContentLoaded', function() {
 });
 """
 
+    if service_worker:
+        js_content += REGISTRATION_SNIPPET
+
     js_path = js_dir / 'main.js'
     with open(js_path, 'w') as f:
         f.write(js_content)
 
+    # Create service worker for offline caching
+    if service_worker:
+        sw_path = project_path / SERVICE_WORKER_NAME
+        with open(sw_path, 'w', encoding='utf-8') as f:
+            f.write(SERVICE_WORKER_TEMPLATE)
+
+    # Create .htaccess with caching and compression rules
+    create_htaccess(project_dir)
+
 
 def create_build_project_structure(project_dir: str, website_name: str) -> None:
     """Create build project structure for Vite/React/etc. projects."""
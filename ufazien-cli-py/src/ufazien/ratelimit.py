@@ -0,0 +1,183 @@
+"""
+Client-side API rate limiting.
+
+Every request first takes a token from a limiter shared by all clients of
+the same API in the process, so fleet operations spread over threads (or
+asyncio tasks, via ``acquire_async``) stay under one budget. Rate-limit
+headers sent by the API tighten that budget until their window resets,
+and 429 responses pause the whole limiter for the ``Retry-After`` period.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+from ufazien.upload import TokenBucket
+
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+MAX_RETRIES = 4
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+RETRY_STATUSES = (502, 503, 504)
+
+# Never let server headers slow us below this many requests per second.
+MIN_RATE = 0.1
+
+
+def jittered_backoff(initial: float = 0.5, maximum: float = 30.0, factor: float = 2.0) -> Iterator[float]:
+    """Yield exponentially growing delays with full jitter."""
+    delay = initial
+    while True:
+        yield random.uniform(0, delay)
+        delay = min(delay * factor, maximum)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds from now."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return float(value)
+            except ValueError:
+                return None
+    return None
+
+
+class RateLimiter:
+    """Token-bucket request limiter that follows the API's rate-limit headers."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Requests per second allowed by default
+            burst: Requests that may be sent back to back
+        """
+        self.rate = rate
+        self.burst = burst
+        self.bucket = TokenBucket(rate, burst)
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self._restore_at: Optional[float] = None
+        self.requests = 0
+        self.rate_limited = 0
+        self.retries = 0
+        self.paused_seconds = 0.0
+
+    def reserve(self) -> float:
+        """Claim one request slot and return how long to wait before sending it."""
+        now = time.monotonic()
+        with self._lock:
+            self.requests += 1
+            if self._restore_at is not None and now >= self._restore_at:
+                self._restore_at = None
+                self.bucket.set_rate(self.rate, self.burst)
+            pause = max(0.0, self._paused_until - now)
+        return max(pause, self.bucket.reserve(1))
+
+    def acquire(self) -> float:
+        """Block until a request may be sent; returns the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Like acquire, but awaits instead of blocking the event loop."""
+        import asyncio
+
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds`` (e.g. after a 429)."""
+        now = time.monotonic()
+        with self._lock:
+            # Overlapping pauses (e.g. concurrent 429s) only count the extension.
+            paused_until = max(self._paused_until, now)
+            self.paused_seconds += max(0.0, now + seconds - paused_until)
+            self._paused_until = max(paused_until, now + seconds)
+
+    def record_rate_limited(self) -> None:
+        with self._lock:
+            self.rate_limited += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Adapt to X-RateLimit-Remaining / X-RateLimit-Reset (or RateLimit-*).
+
+        When the window is exhausted requests pause until it resets;
+        otherwise the remaining budget is spread evenly over the window.
+        """
+        remaining = _header_number(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+        reset = _header_number(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        # Large values are epoch timestamps, small ones are seconds from now.
+        seconds = reset - time.time() if reset > 1e9 else reset
+        if seconds <= 0:
+            return
+        if remaining <= 0:
+            self.pause(seconds)
+            return
+        sustainable = max(MIN_RATE, remaining / seconds)
+        with self._lock:
+            if sustainable < self.rate:
+                self.bucket.set_rate(sustainable, min(self.burst, max(1.0, remaining)))
+                self._restore_at = time.monotonic() + seconds
+            elif self._restore_at is not None:
+                self._restore_at = None
+                self.bucket.set_rate(self.rate, self.burst)
+
+    @property
+    def throttled_seconds(self) -> float:
+        """Time requests were held back by the local budget or server pauses."""
+        return self.bucket.throttled_seconds + self.paused_seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Return request, throttling and retry counters."""
+        return {
+            'requests': self.requests,
+            'throttled_seconds': round(self.throttled_seconds, 3),
+            'paused_seconds': round(self.paused_seconds, 3),
+            'rate_limited': self.rate_limited,
+            'retries': self.retries,
+        }
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_guard = threading.Lock()
+
+
+def get_rate_limiter(base_url: str, rate: Optional[float] = None) -> RateLimiter:
+    """Return the limiter shared by every client of ``base_url`` in this process."""
+    with _rate_limiters_guard:
+        limiter = _rate_limiters.get(base_url)
+        if limiter is None:
+            limiter = RateLimiter(rate, max(1, int(2 * rate))) if rate else RateLimiter()
+            _rate_limiters[base_url] = limiter
+        return limiter
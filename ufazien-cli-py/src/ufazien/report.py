@@ -0,0 +1,166 @@
+"""
+Deploy composition reports for ``ufazien deploy --dry-run --report``.
+
+A report breaks the files a deploy would upload down by top-level directory
+and extension, lists the largest files, estimates the compressed archive
+size, and attributes every file left out to the .ufazienignore rule that
+excluded it.
+"""
+
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from ufazien.utils import ignore_rule_matches, read_ignore_patterns
+
+# Files up to this size are compressed in full for the estimate; larger
+# ones are sampled from the start and the ratio is extrapolated.
+ESTIMATE_SAMPLE_BYTES = 1024 * 1024
+
+# Excluded paths listed per ignore rule.
+IGNORED_EXAMPLES = 5
+
+
+def estimate_compressed_size(file_path: Path, level: int = 6) -> int:
+    """Estimate the deflated size of a file as stored in a ZIP archive."""
+    size = file_path.stat().st_size
+    if size == 0:
+        return 0
+    with open(file_path, 'rb') as f:
+        sample = f.read(ESTIMATE_SAMPLE_BYTES)
+    compressed = len(zlib.compress(sample, level))
+    # ZIP stores incompressible members as-is.
+    return min(size, round(compressed * size / len(sample)))
+
+
+def _breakdown(files: List[Tuple[Path, str, int]], key: Callable[[str], str]) -> List[Dict[str, Any]]:
+    groups: Dict[str, Dict[str, Any]] = {}
+    for _, arcname, size in files:
+        name = key(arcname)
+        group = groups.setdefault(name, {'name': name, 'files': 0, 'bytes': 0})
+        group['files'] += 1
+        group['bytes'] += size
+    return sorted(groups.values(), key=lambda g: (-g['bytes'], g['name']))
+
+
+def _top_level(arcname: str) -> str:
+    return arcname.split('/', 1)[0] + '/' if '/' in arcname else '.'
+
+
+def _extension(arcname: str) -> str:
+    return os.path.splitext(arcname)[1].lower() or '(none)'
+
+
+def scan_ignored(project_dir: str) -> List[Dict[str, Any]]:
+    """
+    Walk a project and attribute excluded paths to .ufazienignore rules.
+
+    Each rule is tried against every path it could apply to, and the time
+    spent matching is recorded per rule. The first matching rule gets the hit,
+    as in list_project_files.
+
+    Returns:
+        One entry per rule: hits (excluded paths), files and bytes beneath
+        them, matching time in seconds and a few example paths
+    """
+    project_path = Path(project_dir).resolve()
+    patterns = read_ignore_patterns(project_path / '.ufazienignore')
+    rules = {
+        pattern: {'rule': pattern, 'hits': 0, 'files': 0, 'bytes': 0, 'seconds': 0.0, 'examples': []}
+        for pattern in patterns
+    }
+
+    def match(rel_path: str):
+        for pattern in patterns:
+            started = time.perf_counter()
+            matched = ignore_rule_matches(pattern, rel_path)
+            rules[pattern]['seconds'] += time.perf_counter() - started
+            if matched:
+                return rules[pattern]
+        return None
+
+    def record(rule: Dict[str, Any], rel_path: str, files: int, size: int) -> None:
+        rule['hits'] += 1
+        rule['files'] += files
+        rule['bytes'] += size
+        if len(rule['examples']) < IGNORED_EXAMPLES:
+            rule['examples'].append(rel_path)
+
+    for root, dirs, files in os.walk(project_path):
+        kept = []
+        for d in dirs:
+            dir_path = Path(root) / d
+            rule = match(dir_path.relative_to(project_path).as_posix())
+            if rule is None:
+                kept.append(d)
+                continue
+            count = size = 0
+            for sub_root, _, sub_files in os.walk(dir_path):
+                for name in sub_files:
+                    try:
+                        size += (Path(sub_root) / name).stat().st_size
+                    except OSError:
+                        continue
+                    count += 1
+            record(rule, dir_path.relative_to(project_path).as_posix() + '/', count, size)
+        dirs[:] = kept
+
+        for name in files:
+            file_path = Path(root) / name
+            rel_path = file_path.relative_to(project_path).as_posix()
+            rule = match(rel_path)
+            if rule is not None:
+                try:
+                    size = file_path.stat().st_size
+                except OSError:
+                    size = 0
+                record(rule, rel_path, 1, size)
+
+    return [rules[pattern] for pattern in patterns]
+
+
+def build_deploy_report(
+    files: List[Tuple[Path, str]],
+    project_dir: str,
+    ignore_rules: bool = True,
+    top: int = 10
+) -> Dict[str, Any]:
+    """
+    Build a composition report for a deploy file set.
+
+    Args:
+        files: (path, archive name) pairs that would be uploaded
+        project_dir: Project root, used to attribute ignored files
+        ignore_rules: Whether .ufazienignore applies to this file set
+        top: Number of largest files to list
+
+    Returns:
+        JSON-serializable report
+    """
+    timings: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    sized = [(path, arcname, path.stat().st_size) for path, arcname in files]
+    timings['stat'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    compressed = sum(estimate_compressed_size(path) for path, _, _ in sized)
+    timings['estimate'] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ignored = scan_ignored(project_dir) if ignore_rules else []
+    timings['ignore'] = time.perf_counter() - started
+
+    largest = sorted(sized, key=lambda item: (-item[2], item[1]))[:top]
+    return {
+        'files': len(sized),
+        'bytes': sum(size for _, _, size in sized),
+        'estimated_compressed_bytes': compressed,
+        'directories': _breakdown(sized, _top_level),
+        'extensions': _breakdown(sized, _extension),
+        'largest': [{'path': arcname, 'bytes': size} for _, arcname, size in largest],
+        'ignored': ignored,
+        'timings': timings,
+    }
@@ -0,0 +1,122 @@
+"""
+Service worker with a deploy-time precache manifest.
+
+Static scaffolds can include an ``sw.js`` whose ``PRECACHE_MANIFEST`` is
+empty on disk. On deploy it is filled with the URL and content hash of every
+cacheable file being shipped (see ufazien.transforms.add_precache_manifest).
+Browsers install the new worker because its bytes changed, and it downloads
+only the files whose hash differs from what it already cached.
+"""
+
+import json
+import re
+from typing import List, Tuple
+
+SERVICE_WORKER_NAME = 'sw.js'
+REVISION_LENGTH = 12
+
+# Files worth precaching; sidecars, dotfiles and server-side scripts are never included.
+PRECACHE_EXTENSIONS = (
+    '.html', '.htm', '.css', '.js', '.mjs', '.json', '.webmanifest', '.svg',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+    '.woff', '.woff2', '.ttf', '.otf',
+)
+
+# The placeholder on disk is `[]`; minification may remove the spaces around `=`.
+# A filled manifest is a list of [url, revision] lists of JSON strings.
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_MANIFEST = re.compile(
+    r'\bPRECACHE_MANIFEST\s*=\s*\[(?:[^\[\]"]|' + _STRING + r'|\[(?:[^\]"]|' + _STRING + r')*\])*\]'
+)
+
+SERVICE_WORKER_TEMPLATE = """// Service worker generated by ufazien.
+// `ufazien deploy` fills PRECACHE_MANIFEST with [url, revision] pairs for the
+// deployed files; leave the empty list below as it is.
+const PRECACHE_MANIFEST = [];
+
+const CACHE_NAME = 'ufazien-precache';
+const SCOPE = new URL(self.registration.scope);
+const REVISIONS = new Map(
+    PRECACHE_MANIFEST.map(([url, revision]) => [new URL(url, SCOPE).href, revision])
+);
+
+// Cached copies are keyed by URL and revision, so a deploy only fetches changed files.
+function cacheKey(url, revision) {
+    return url + (url.includes('?') ? '&' : '?') + '__revision=' + revision;
+}
+
+self.addEventListener('install', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        await Promise.all([...REVISIONS].map(async ([url, revision]) => {
+            const key = cacheKey(url, revision);
+            if (await cache.match(key)) {
+                return;
+            }
+            const response = await fetch(url, { cache: 'no-cache' });
+            if (!response.ok) {
+                throw new Error(`Precaching ${url} failed with ${response.status}`);
+            }
+            await cache.put(key, response);
+        }));
+        await self.skipWaiting();
+    })());
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil((async () => {
+        const cache = await caches.open(CACHE_NAME);
+        const current = new Set([...REVISIONS].map(([url, revision]) => cacheKey(url, revision)));
+        for (const request of await cache.keys()) {
+            if (!current.has(request.url)) {
+                await cache.delete(request);
+            }
+        }
+        await self.clients.claim();
+    })());
+});
+
+self.addEventListener('fetch', (event) => {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+    url.hash = '';
+    url.search = '';
+    if (url.pathname.endsWith('/')) {
+        url.pathname += 'index.html';
+    }
+    const revision = REVISIONS.get(url.href);
+    if (revision === undefined) {
+        return;
+    }
+    const key = cacheKey(url.href, revision);
+    if (request.mode === 'navigate') {
+        // Pages come from the network when possible, so a deploy shows up at once.
+        event.respondWith(fetch(request).catch(() => caches.match(key)));
+    } else {
+        event.respondWith(caches.match(key).then((cached) => cached || fetch(request)));
+    }
+});
+"""
+
+REGISTRATION_SNIPPET = """
+// Register the service worker, which caches the site for offline use and fast repeat visits
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', function() {
+        navigator.serviceWorker.register('/sw.js');
+    });
+}
+"""
+
+
+def has_manifest(text: str) -> bool:
+    """Check whether a service worker script has a PRECACHE_MANIFEST to fill."""
+    return _MANIFEST.search(text) is not None
+
+
+def inject_manifest(text: str, entries: List[Tuple[str, str]]) -> str:
+    """Replace the PRECACHE_MANIFEST list with ``[url, revision]`` pairs."""
+    manifest = json.dumps([list(entry) for entry in entries], separators=(',', ':'))
+    return _MANIFEST.sub(lambda _: f'PRECACHE_MANIFEST = {manifest}', text, count=1)
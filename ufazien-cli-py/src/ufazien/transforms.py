@@ -0,0 +1,628 @@
+"""
+Deploy-time transforms applied to the archive file list.
+
+Each transform takes the list of (path, archive name) pairs produced by
+``list_project_files`` / ``list_folder_files`` and returns a new list. Files
+on disk are never modified: generated content is written to a
+content-addressed cache under ~/.ufazien and referenced from there.
+"""
+
+import fnmatch
+import gzip
+import hashlib
+import json
+import os
+import posixpath
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ufazien.htaccess import HTACCESS_NAME, has_block, render_block, replace_block
+from ufazien.minify import MINIFIERS, MinifyError
+from ufazien.serviceworker import (
+    PRECACHE_EXTENSIONS,
+    REVISION_LENGTH,
+    SERVICE_WORKER_NAME,
+    has_manifest,
+    inject_manifest,
+)
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+FileList = List[Tuple[Path, str]]
+
+PRECOMPRESS_EXTENSIONS = ('.html', '.htm', '.css', '.js', '.mjs', '.svg', '.json')
+PRECOMPRESS_MIN_SIZE = 1024
+
+FINGERPRINT_EXTENSIONS = (
+    '.css', '.js', '.mjs',
+    '.woff', '.woff2', '.ttf', '.otf', '.eot',
+    '.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp', '.avif', '.ico',
+)
+# Files whose references to fingerprinted assets are rewritten.
+FINGERPRINT_REWRITE_EXTENSIONS = ('.html', '.htm', '.php', '.css')
+# Text files that are not rewritten; assets they mention keep their names.
+FINGERPRINT_OPAQUE_EXTENSIONS = ('.js', '.mjs', '.json', '.map', '.webmanifest', '.xml', '.txt')
+FINGERPRINT_HASH_LENGTH = 10
+ASSET_MANIFEST_NAME = 'asset-manifest.json'
+
+ENV_FILE_NAME = '.env'
+COMPILED_ENV_SUFFIX = '.php'
+# Permissions of the compiled-env cache, which holds credentials.
+SECRET_DIR_MODE = 0o700
+SECRET_FILE_MODE = 0o600
+# Characters PHP's trim() removes.
+_PHP_TRIM = ' \t\n\r\0\x0b'
+
+# A relative or root-relative path to a fingerprintable asset, starting at a
+# token boundary so that paths inside absolute URLs are not matched.
+_ASSET_REFERENCE = re.compile(
+    r'(?<![\w.~%@+/:\\-])'
+    r'(?P<url>(?:[\w.~%@+-]+/|\.{1,2}/|/)*[\w.~%@+-]+'
+    r'(?:' + '|'.join(re.escape(ext) for ext in FINGERPRINT_EXTENSIONS) + r'))'
+    r'(?=[?#"\')\s,>]|$)',
+    re.IGNORECASE,
+)
+_ALREADY_FINGERPRINTED = re.compile(r'[.-][0-9a-f]{8,}\.[a-z0-9]+$', re.IGNORECASE)
+
+# Bump when minifier output changes so stale cache entries are not reused.
+MINIFY_VERSION = '1'
+
+# Cached artifacts not used for this long are pruned.
+CACHE_MAX_AGE = 30 * 24 * 3600
+
+
+def default_cache_dir(name: str) -> Path:
+    """Return the cache directory for a transform (~/.ufazien/<name>)."""
+    return Path.home() / '.ufazien' / name
+
+
+def _write_atomic(path: Path, data: bytes, mode: int = 0o644) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # Artifacts are archived as-is, so give them normal file permissions
+        # unless they hold secrets.
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _prune_cache(cache_dir: Path, max_age: float = CACHE_MAX_AGE) -> None:
+    cutoff = time.time() - max_age
+    for path in cache_dir.iterdir():
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def _cached_variant(cache_dir: Path, key: str, suffix: str) -> Optional[Path]:
+    path = cache_dir / f'{key}{suffix}'
+    if path.exists():
+        os.utime(path, None)
+        return path
+    return None
+
+
+def matches_patterns(arcname: str, patterns: List[str]) -> bool:
+    """
+    Check an archive name against exclude patterns.
+
+    ``dir/`` matches a directory anywhere in the path; other patterns are
+    globs matched against the full archive name and the basename.
+    """
+    segments = arcname.split('/')
+    for pattern in patterns:
+        if pattern.endswith('/'):
+            if pattern.rstrip('/') in segments[:-1] or arcname.startswith(pattern):
+                return True
+        elif fnmatch.fnmatchcase(arcname, pattern) or fnmatch.fnmatchcase(segments[-1], pattern):
+            return True
+    return False
+
+
+def _minify_file(file_path: str, cache_dir: str, suffix: str) -> Tuple[Optional[str], int, int]:
+    """Minify one file, reusing the cached result for identical input."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    key = hashlib.sha256(MINIFY_VERSION.encode() + suffix.encode() + data).hexdigest()
+    cache = Path(cache_dir)
+
+    cached = _cached_variant(cache, key, suffix)
+    if cached is not None:
+        return str(cached), len(data), cached.stat().st_size
+    if (cache / f'{key}.skip').exists():
+        return None, len(data), len(data)
+
+    try:
+        minified = MINIFIERS[suffix](data.decode('utf-8')).encode('utf-8')
+    except (MinifyError, UnicodeDecodeError, RecursionError):
+        minified = data
+    if len(minified) >= len(data):
+        # Remember inputs that cannot be shrunk so they are not retried.
+        _write_atomic(cache / f'{key}.skip', b'')
+        return None, len(data), len(data)
+
+    cached = cache / f'{key}{suffix}'
+    _write_atomic(cached, minified)
+    return str(cached), len(data), len(minified)
+
+
+def minify_assets(
+    files: FileList,
+    exclude: Optional[List[str]] = None,
+    cache_dir: Optional[Path] = None,
+    workers: Optional[int] = None
+) -> Tuple[FileList, List[Dict[str, Any]]]:
+    """
+    Replace HTML, CSS, JS and JSON files with minified copies.
+
+    Minification runs in a process pool and results are cached by input
+    hash. Already minified files (``*.min.js``, ``*.min.css``) and archive
+    names matching ``exclude`` are left alone, as are files the minifiers
+    cannot shrink or parse.
+
+    Returns:
+        Tuple of the new file list and a per-file report
+        ([{'path': arcname, 'original': bytes, 'minified': bytes}])
+    """
+    cache_dir = cache_dir or default_cache_dir('minified')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    exclude = exclude or []
+
+    candidates = []
+    for index, (file_path, arcname) in enumerate(files):
+        suffix = Path(arcname).suffix.lower()
+        if suffix not in MINIFIERS or arcname.lower().endswith(('.min.js', '.min.css')):
+            continue
+        if matches_patterns(arcname, exclude):
+            continue
+        candidates.append((index, file_path, suffix))
+
+    args = [(str(file_path), str(cache_dir), suffix) for _, file_path, suffix in candidates]
+    if len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_minify_file, *zip(*args)))
+    else:
+        results = [_minify_file(*arg) for arg in args]
+
+    result = list(files)
+    report = []
+    for (index, _, _), (minified_path, original_size, minified_size) in zip(candidates, results):
+        arcname = files[index][1]
+        if minified_path:
+            result[index] = (Path(minified_path), arcname)
+        report.append({'path': arcname, 'original': original_size, 'minified': minified_size})
+
+    _prune_cache(cache_dir)
+    return result, report
+
+
+def _file_digest(file_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hashed_name(arcname: str, digest: str) -> str:
+    stem, ext = posixpath.splitext(arcname)
+    return f'{stem}.{digest[:FINGERPRINT_HASH_LENGTH]}{ext}'
+
+
+def _resolve_reference(url: str, referrer: str) -> List[str]:
+    """Candidate archive names a reference may point to, most specific first."""
+    if url.startswith('//'):
+        return []
+    if url.startswith('/'):
+        return [posixpath.normpath(url.lstrip('/'))]
+    candidates = [posixpath.normpath(posixpath.join(posixpath.dirname(referrer), url))]
+    # PHP templates are usually included from pages in the document root.
+    if referrer.lower().endswith('.php'):
+        candidates.append(posixpath.normpath(url))
+    return [c for c in candidates if not c.startswith('..')]
+
+
+def _rewrite_references(text: str, referrer: str, renamed: Dict[str, str]) -> str:
+    def replace(match: 're.Match[str]') -> str:
+        url = match.group('url')
+        for candidate in _resolve_reference(url, referrer):
+            if candidate in renamed:
+                # Only the basename changes, so relative URLs keep resolving.
+                return url[:len(url) - len(posixpath.basename(url))] + posixpath.basename(renamed[candidate])
+        return url
+    return _ASSET_REFERENCE.sub(replace, text)
+
+
+def _read_text(file_path: Path) -> Optional[str]:
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read().decode('utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def fingerprint_assets(
+    files: FileList,
+    exclude: Optional[List[str]] = None,
+    cache_dir: Optional[Path] = None
+) -> Tuple[FileList, Dict[str, str]]:
+    """
+    Rename CSS, JS, font and image files to content-hashed names.
+
+    References in HTML, CSS and PHP files are rewritten to the new names and
+    an ``asset-manifest.json`` mapping original to hashed names is added to
+    the archive root. Assets mentioned by files that are not rewritten (such
+    as JS modules importing each other) keep their original names, as do
+    names that already carry a hash and paths matching ``exclude``.
+
+    Returns:
+        Tuple of the new file list and the manifest ({original: hashed})
+    """
+    cache_dir = cache_dir or default_cache_dir('fingerprinted')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    exclude = exclude or []
+
+    sources = {arcname: file_path for file_path, arcname in files}
+    texts: Dict[str, str] = {}
+    for arcname, file_path in sources.items():
+        if arcname.lower().endswith(FINGERPRINT_REWRITE_EXTENSIONS + FINGERPRINT_OPAQUE_EXTENSIONS):
+            text = _read_text(file_path)
+            if text is not None:
+                texts[arcname] = text
+
+    pinned = set()
+    for arcname, text in texts.items():
+        if arcname.lower().endswith(FINGERPRINT_OPAQUE_EXTENSIONS):
+            for match in _ASSET_REFERENCE.finditer(text):
+                pinned.update(_resolve_reference(match.group('url'), arcname))
+                pinned.add(posixpath.basename(match.group('url')))
+
+    assets = [
+        arcname for arcname in sources
+        if arcname.lower().endswith(FINGERPRINT_EXTENSIONS)
+        and arcname not in pinned
+        and posixpath.basename(arcname) not in pinned
+        and not _ALREADY_FINGERPRINTED.search(arcname)
+        and not matches_patterns(arcname, exclude)
+        and arcname != SERVICE_WORKER_NAME  # must keep a stable URL
+    ]
+
+    renamed: Dict[str, str] = {}
+    rewritten: Dict[str, Path] = {}
+
+    def store_text(arcname: str, text: str) -> None:
+        data = text.encode('utf-8')
+        path = cache_dir / f'{hashlib.sha256(data).hexdigest()}{posixpath.splitext(arcname)[1]}'
+        if not path.exists():
+            _write_atomic(path, data)
+        os.utime(path, None)
+        rewritten[arcname] = path
+
+    # Binary assets and JS first, then stylesheets once the assets they
+    # reference have their final names (repeated for @import chains).
+    pending = []
+    for arcname in assets:
+        if arcname.lower().endswith('.css') and arcname in texts:
+            pending.append(arcname)
+        else:
+            renamed[arcname] = _hashed_name(arcname, _file_digest(sources[arcname]))
+
+    while pending:
+        ready = [
+            css for css in pending
+            if not any(
+                candidate in pending and candidate != css
+                for match in _ASSET_REFERENCE.finditer(texts[css])
+                for candidate in _resolve_reference(match.group('url'), css)
+            )
+        ] or pending  # import cycle: finish the rest with what is known
+        for css in ready:
+            text = _rewrite_references(texts[css], css, renamed)
+            if text != texts[css]:
+                store_text(css, text)
+            renamed[css] = _hashed_name(css, hashlib.sha256(text.encode('utf-8')).hexdigest())
+            pending.remove(css)
+
+    for arcname, text in texts.items():
+        if arcname in renamed or not arcname.lower().endswith(FINGERPRINT_REWRITE_EXTENSIONS):
+            continue
+        new_text = _rewrite_references(text, arcname, renamed)
+        if new_text != text:
+            store_text(arcname, new_text)
+
+    result: FileList = []
+    for file_path, arcname in files:
+        result.append((rewritten.get(arcname, file_path), renamed.get(arcname, arcname)))
+
+    if renamed:
+        manifest_data = json.dumps(renamed, indent=2, sort_keys=True).encode('utf-8')
+        manifest_path = cache_dir / f'{hashlib.sha256(manifest_data).hexdigest()}.json'
+        if not manifest_path.exists():
+            _write_atomic(manifest_path, manifest_data)
+        result.append((manifest_path, ASSET_MANIFEST_NAME))
+
+    _prune_cache(cache_dir)
+    return result, renamed
+
+
+def _precompress_file(file_path: str, cache_dir: str, use_brotli: bool) -> Tuple[Optional[str], Optional[str]]:
+    """Compress one file to gzip (and brotli), reusing cached variants by content hash."""
+    with open(file_path, 'rb') as f:
+        data = f.read()
+    key = hashlib.sha256(data).hexdigest()
+    cache = Path(cache_dir)
+
+    variants: Dict[str, Optional[str]] = {'.gz': None, '.br': None}
+    for suffix in ('.gz', '.br'):
+        if suffix == '.br' and not use_brotli:
+            continue
+        cached = _cached_variant(cache, key, suffix)
+        if cached is None:
+            if suffix == '.gz':
+                compressed = gzip.compress(data, compresslevel=9, mtime=0)
+            else:
+                compressed = brotli.compress(data, quality=11)
+            # Variants that do not save anything are not worth serving.
+            if len(compressed) >= len(data):
+                continue
+            cached = cache / f'{key}{suffix}'
+            _write_atomic(cached, compressed)
+        variants[suffix] = str(cached)
+
+    return variants['.gz'], variants['.br']
+
+
+def add_precompressed_sidecars(
+    files: FileList,
+    cache_dir: Optional[Path] = None,
+    min_size: int = PRECOMPRESS_MIN_SIZE,
+    use_brotli: bool = True,
+    workers: Optional[int] = None
+) -> Tuple[FileList, Dict[str, int]]:
+    """
+    Add .gz (and .br when brotli is installed) siblings for text assets.
+
+    Files below ``min_size``, files that already have a sibling in the list
+    and variants that are not smaller than the original are skipped.
+    Compression runs in a process pool at maximum compression.
+
+    Returns:
+        Tuple of the new file list and counts of generated variants ({'gz': n, 'br': n})
+    """
+    cache_dir = cache_dir or default_cache_dir('precompressed')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    use_brotli = use_brotli and brotli is not None
+
+    arcnames = {arcname for _, arcname in files}
+    candidates = [
+        (file_path, arcname) for file_path, arcname in files
+        if arcname.lower().endswith(PRECOMPRESS_EXTENSIONS)
+        and f'{arcname}.gz' not in arcnames
+        and f'{arcname}.br' not in arcnames
+        and file_path.stat().st_size >= min_size
+    ]
+
+    args = [(str(file_path), str(cache_dir), use_brotli) for file_path, _ in candidates]
+    if len(args) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_precompress_file, *zip(*args)))
+    else:
+        results = [_precompress_file(*arg) for arg in args]
+
+    counts = {'gz': 0, 'br': 0}
+    result = list(files)
+    for (_, arcname), (gz_path, br_path) in zip(candidates, results):
+        if gz_path:
+            result.append((Path(gz_path), f'{arcname}.gz'))
+            counts['gz'] += 1
+        if br_path:
+            result.append((Path(br_path), f'{arcname}.br'))
+            counts['br'] += 1
+
+    _prune_cache(cache_dir)
+    return result, counts
+
+
+def parse_env(text: str) -> Dict[str, str]:
+    """
+    Parse a .env file the way the generated config.php does.
+
+    Blank lines, lines starting with ``#`` and lines without ``=`` are
+    skipped; names and values are trimmed and not unquoted. The first
+    definition of a name wins.
+    """
+    values: Dict[str, str] = {}
+    for line in text.split('\n'):
+        if not line or line.strip(_PHP_TRIM).startswith('#') or '=' not in line:
+            continue
+        name, value = line.split('=', 1)
+        values.setdefault(name.strip(_PHP_TRIM), value.strip(_PHP_TRIM))
+    return values
+
+
+def _php_string(value: str) -> str:
+    return "'" + value.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def render_env_php(values: Dict[str, str]) -> str:
+    """Render .env values as a PHP file returning an array."""
+    lines = ['<?php', '// Compiled from .env by ufazien deploy. Do not edit.', 'return [']
+    lines.extend(f'    {_php_string(name)} => {_php_string(value)},' for name, value in values.items())
+    lines.append('];')
+    return '\n'.join(lines) + '\n'
+
+
+def compile_env_files(files: FileList, cache_dir: Optional[Path] = None) -> Tuple[FileList, int]:
+    """
+    Add a compiled ``.env.php`` next to every ``.env`` in the archive.
+
+    The generated config.php loads ``.env.php`` with a plain ``require``, so
+    opcache serves the array from shared memory and production requests never
+    read or parse ``.env``. A ``.env.php`` already in the list is left alone.
+    The compiled files hold credentials, so the cache directory is private to
+    the user (0700) and the files in it are 0600.
+
+    Returns:
+        Tuple of the new file list and the number of files compiled
+    """
+    cache_dir = cache_dir or default_cache_dir('compiled-env')
+    arcnames = {arcname for _, arcname in files}
+    result = list(files)
+    compiled = 0
+    for file_path, arcname in files:
+        target = arcname + COMPILED_ENV_SUFFIX
+        if posixpath.basename(arcname) != ENV_FILE_NAME or target in arcnames:
+            continue
+        with open(file_path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            values = parse_env(f.read())
+        data = render_env_php(values).encode('utf-8', errors='surrogateescape')
+        cache_dir.mkdir(mode=SECRET_DIR_MODE, parents=True, exist_ok=True)
+        os.chmod(cache_dir, SECRET_DIR_MODE)
+        path = cache_dir / f'{hashlib.sha256(data).hexdigest()}.php'
+        if path.exists():
+            os.chmod(path, SECRET_FILE_MODE)
+        else:
+            _write_atomic(path, data, mode=SECRET_FILE_MODE)
+        os.utime(path, None)
+        result.append((path, target))
+        compiled += 1
+    if compiled:
+        _prune_cache(cache_dir)
+    return result, compiled
+
+
+def has_managed_htaccess(files: FileList) -> bool:
+    """Check whether the root ``.htaccess`` in the list has the managed block."""
+    source = next((file_path for file_path, arcname in files if arcname == HTACCESS_NAME), None)
+    text = _read_text(source) if source is not None else None
+    return text is not None and has_block(text)
+
+
+def sync_htaccess_files(
+    files: FileList,
+    manifest: Optional[Dict[str, str]] = None,
+    add_block: bool = False,
+    cache_dir: Optional[Path] = None
+) -> Tuple[FileList, Dict[str, Any]]:
+    """
+    Rebuild the managed block of the root ``.htaccess`` from the deployed files.
+
+    Precompressed sidecars in the list get rules serving them, and
+    fingerprinted assets (from ``manifest`` or already carrying a hash in
+    their name) get immutable cache headers. The result goes to a cached
+    copy that replaces ``.htaccess`` in the archive; the file on disk is
+    never modified.
+
+    Args:
+        files: Files to deploy
+        manifest: Original to fingerprinted archive names
+        add_block: Add the block to an ``.htaccess`` without one (creating
+            the file if needed) instead of leaving it alone
+        cache_dir: Where the rebuilt file is written
+
+    Returns:
+        Tuple of the new file list and a summary ({'updated', 'fingerprinted', 'precompressed'})
+    """
+    summary: Dict[str, Any] = {'updated': False, 'fingerprinted': 0, 'precompressed': {}}
+    source = next((file_path for file_path, arcname in files if arcname == HTACCESS_NAME), None)
+    text = _read_text(source) if source is not None else ''
+    if text is None or not (add_block or has_block(text)):
+        return files, summary
+
+    arcnames = {arcname for _, arcname in files}
+    hashed = set((manifest or {}).values())
+    fingerprinted = {
+        posixpath.basename(arcname) for arcname in arcnames
+        if arcname.lower().endswith(FINGERPRINT_EXTENSIONS)
+        and (arcname in hashed or _ALREADY_FINGERPRINTED.search(arcname))
+    }
+    precompressed: Dict[str, set] = {}
+    for arcname in arcnames:
+        base, suffix = posixpath.splitext(arcname)
+        if suffix in ('.gz', '.br') and base in arcnames:
+            precompressed.setdefault(suffix[1:], set()).add(posixpath.splitext(base)[1][1:].lower())
+
+    new_text = replace_block(text, render_block(fingerprinted, precompressed))
+    summary.update(
+        fingerprinted=len(fingerprinted),
+        precompressed={suffix: sorted(exts) for suffix, exts in precompressed.items()},
+    )
+    if new_text == text:
+        return files, summary
+
+    cache_dir = cache_dir or default_cache_dir('htaccess')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data = new_text.encode('utf-8')
+    path = cache_dir / hashlib.sha256(data).hexdigest()
+    if not path.exists():
+        _write_atomic(path, data)
+    os.utime(path, None)
+    _prune_cache(cache_dir)
+    summary['updated'] = True
+    if source is None:
+        return files + [(path, HTACCESS_NAME)], summary
+    result = [(path if arcname == HTACCESS_NAME else file_path, arcname) for file_path, arcname in files]
+    return result, summary
+
+
+def add_precache_manifest(
+    files: FileList,
+    exclude: Optional[List[str]] = None,
+    cache_dir: Optional[Path] = None
+) -> Tuple[FileList, int]:
+    """
+    Fill the PRECACHE_MANIFEST of the root ``sw.js`` from the deployed files.
+
+    Every HTML, CSS, JS, JSON, image and font file (except dotfiles and paths
+    matching ``exclude``) is listed with a hash of its final content, so this
+    runs after minification and fingerprinting. Projects without an ``sw.js``,
+    or whose ``sw.js`` has no PRECACHE_MANIFEST, are left alone.
+
+    Returns:
+        Tuple of the new file list and the number of precached files
+    """
+    source = next((file_path for file_path, arcname in files if arcname == SERVICE_WORKER_NAME), None)
+    if source is None:
+        return files, 0
+    text = _read_text(source)
+    if text is None or not has_manifest(text):
+        return files, 0
+
+    exclude = exclude or []
+    entries = sorted(
+        (arcname, _file_digest(file_path)[:REVISION_LENGTH])
+        for file_path, arcname in files
+        if arcname.lower().endswith(PRECACHE_EXTENSIONS)
+        and arcname != SERVICE_WORKER_NAME
+        and not any(part.startswith('.') for part in arcname.split('/'))
+        and not matches_patterns(arcname, exclude)
+    )
+
+    cache_dir = cache_dir or default_cache_dir('service-worker')
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    data = inject_manifest(text, entries).encode('utf-8')
+    path = cache_dir / f'{hashlib.sha256(data).hexdigest()}.js'
+    if not path.exists():
+        _write_atomic(path, data)
+    os.utime(path, None)
+    _prune_cache(cache_dir)
+    result = [
+        (path if arcname == SERVICE_WORKER_NAME else file_path, arcname) for file_path, arcname in files
+    ]
+    return result, len(entries)
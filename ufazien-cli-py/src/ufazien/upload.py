@@ -0,0 +1,317 @@
+"""
+Streaming, rate-limited uploads.
+
+Multipart bodies are streamed from disk instead of being built in memory,
+and every chunk handed to the socket can be paced by a shared token bucket.
+In adaptive mode the rate backs off when the time the socket takes to
+accept a chunk (a proxy for round-trip time under load) rises above its
+baseline, and creeps back up while it stays low.
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple, Union
+
+CHUNK_SIZE = 64 * 1024
+
+# Conservative throughput assumed before any upload has been measured (bytes/s).
+DEFAULT_UPLOAD_THROUGHPUT = 256 * 1024
+UPLOAD_CONNECT_TIMEOUT = 10
+UPLOAD_TIMEOUT_MIN = 60
+
+# Adaptive mode: extra time (seconds) the socket may take to accept a
+# CHUNK_SIZE sample above the baseline, and the multiplicative decrease /
+# additive increase applied to the rate.
+ADAPTIVE_TARGET_DELAY = 0.05
+ADAPTIVE_DECREASE = 0.7
+ADAPTIVE_INCREASE = 0.05
+ADAPTIVE_MIN_RATE = 32 * 1024
+ADAPTIVE_START_RATE = 1024 * 1024
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``consume`` blocks until the bytes may be sent."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate: Sustained rate in bytes per second
+            burst: Bucket capacity in bytes (defaults to a quarter second of traffic)
+        """
+        self.rate = float(rate)
+        self.burst = float(burst) if burst is not None else max(CHUNK_SIZE, self.rate / 4)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.throttled_seconds = 0.0
+
+    def set_rate(self, rate: float, burst: Optional[float] = None) -> None:
+        """Change the sustained rate (and capacity), keeping the tokens already accumulated."""
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+            if burst is not None:
+                self.burst = float(burst)
+            self._tokens = min(self._tokens, self.burst)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """
+        Take ``amount`` tokens without blocking.
+
+        Returns:
+            Seconds the caller must wait before using them
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.throttled_seconds += wait
+        return wait
+
+    def consume(self, amount: float) -> float:
+        """
+        Take ``amount`` tokens, sleeping while the bucket is in debt.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(amount)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class UploadThrottle:
+    """Bandwidth limit shared by all uploads of a client, optionally adaptive."""
+
+    def __init__(self, max_bandwidth: Optional[float] = None, adaptive: bool = False):
+        """
+        Initialize the throttle.
+
+        Args:
+            max_bandwidth: Rate cap in bytes per second (None for no cap)
+            adaptive: Lower the rate when send latency rises; the cap becomes the ceiling
+        """
+        self.ceiling = max_bandwidth
+        self.adaptive = adaptive
+        rate = max_bandwidth
+        if adaptive:
+            rate = min(max_bandwidth or ADAPTIVE_START_RATE, ADAPTIVE_START_RATE)
+        self.bucket = TokenBucket(rate) if rate else None
+        self._delays: deque = deque(maxlen=256)
+        self._smoothed: Optional[float] = None
+        self._sample_delay = 0.0
+        self._sample_bytes = 0
+        self._last_change = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self) -> Optional[float]:
+        """Current rate in bytes per second, or None when unlimited."""
+        return self.bucket.rate if self.bucket else None
+
+    @property
+    def throttled_seconds(self) -> float:
+        """Total time uploads have been held back."""
+        return self.bucket.throttled_seconds if self.bucket else 0.0
+
+    def before_send(self, amount: int) -> None:
+        """Wait until ``amount`` bytes may be handed to the socket."""
+        if self.bucket:
+            self.bucket.consume(amount)
+
+    def observe(self, delay: float, amount: int) -> None:
+        """Record how long the socket took to accept the previous ``amount`` bytes."""
+        if not self.adaptive or not self.bucket:
+            return
+        with self._lock:
+            # Judge latency per CHUNK_SIZE sample, whatever size the HTTP stack reads.
+            self._sample_delay += delay
+            self._sample_bytes += amount
+            if self._sample_bytes < CHUNK_SIZE:
+                return
+            delay = self._sample_delay * CHUNK_SIZE / self._sample_bytes
+            self._sample_delay, self._sample_bytes = 0.0, 0
+            self._delays.append(delay)
+            self._smoothed = delay if self._smoothed is None else 0.8 * self._smoothed + 0.2 * delay
+            baseline = min(self._delays)
+            now = time.monotonic()
+            # Let a change take effect before judging it.
+            if now - self._last_change < max(0.25, 4 * self._smoothed):
+                return
+            rate = self.bucket.rate
+            if self._smoothed - baseline > ADAPTIVE_TARGET_DELAY:
+                rate = max(ADAPTIVE_MIN_RATE, rate * ADAPTIVE_DECREASE)
+            else:
+                rate = rate * (1 + ADAPTIVE_INCREASE)
+                if self.ceiling:
+                    rate = min(rate, self.ceiling)
+            if rate != self.bucket.rate:
+                self.bucket.set_rate(rate, burst=max(CHUNK_SIZE, rate / 4))
+                self._last_change = now
+
+
+FileSpec = Union[str, Tuple[str, IO[bytes], str]]
+
+
+class MultipartStream:
+    """
+    A multipart/form-data body read lazily from disk.
+
+    Exposes ``read`` and ``__len__`` so requests streams it with a
+    Content-Length header instead of encoding it in memory.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[Dict[str, Any]],
+        files: Dict[str, FileSpec],
+        throttle: Optional[UploadThrottle] = None
+    ):
+        """
+        Build the body.
+
+        Args:
+            fields: Form fields
+            files: Form field name to file path, or (filename, file object, content type)
+            throttle: Optional bandwidth limit applied while streaming
+        """
+        self.boundary = uuid.uuid4().hex
+        self.throttle = throttle
+        self._parts: List[Union[bytes, IO[bytes]]] = []
+        self._handles: List[IO[bytes]] = []
+        self._length = 0
+
+        for name, value in (fields or {}).items():
+            self._add(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n'.encode()
+                + str(value).encode('utf-8') + b'\r\n'
+            )
+        for name, spec in files.items():
+            if isinstance(spec, str):
+                filename, handle, content_type = 'file', open(spec, 'rb'), 'application/octet-stream'
+                self._handles.append(handle)
+            else:
+                filename, handle, content_type = spec
+            self._add(
+                f'--{self.boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                f'Content-Type: {content_type}\r\n\r\n'.encode()
+            )
+            handle.seek(0, os.SEEK_END)
+            self._length += handle.tell()
+            handle.seek(0)
+            self._parts.append(handle)
+            self._add(b'\r\n')
+        self._add(f'--{self.boundary}--\r\n'.encode())
+
+        self._index = 0
+        self._buffer = b''
+        self.bytes_sent = 0
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._returned_at: Optional[float] = None
+        self._last_chunk = 0
+
+    def _add(self, data: bytes) -> None:
+        self._parts.append(data)
+        self._length += len(data)
+
+    @property
+    def content_type(self) -> str:
+        return f'multipart/form-data; boundary={self.boundary}'
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def _next_bytes(self, size: int) -> bytes:
+        while self._index < len(self._parts):
+            part = self._parts[self._index]
+            if isinstance(part, bytes):
+                self._index += 1
+                return part
+            data = part.read(size)
+            if data:
+                return data
+            self._index += 1
+        return b''
+
+    def read(self, size: int = -1) -> bytes:
+        """Return up to ``size`` bytes of the body, pacing them through the throttle."""
+        now = time.monotonic()
+        if self.started is None:
+            self.started = now
+        elif self.throttle is not None and self._returned_at is not None:
+            self.throttle.observe(now - self._returned_at, self._last_chunk)
+
+        size = CHUNK_SIZE if size is None or size < 0 else size
+        while len(self._buffer) < size:
+            data = self._next_bytes(size)
+            if not data:
+                break
+            self._buffer += data
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+
+        if chunk:
+            if self.throttle is not None:
+                self.throttle.before_send(len(chunk))
+            self.bytes_sent += len(chunk)
+        else:
+            self.finished = time.monotonic()
+        self._returned_at = time.monotonic()
+        self._last_chunk = len(chunk)
+        return chunk
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Measured bytes per second, once the whole body has been read."""
+        if self.started is None or self.finished is None or self.finished <= self.started:
+            return None
+        return self.bytes_sent / (self.finished - self.started)
+
+    def close(self) -> None:
+        for handle in self._handles:
+            handle.close()
+
+
+def is_replayable(files: Optional[Dict[str, FileSpec]]) -> bool:
+    """
+    Check whether a multipart body can be sent again after a failed attempt.
+
+    MultipartStream is rebuilt for every attempt: paths are reopened and file
+    objects rewound, which only works when every file object can seek.
+    """
+    for spec in (files or {}).values():
+        if not isinstance(spec, str):
+            handle = spec[1]
+            if not (hasattr(handle, 'seekable') and handle.seekable()):
+                return False
+    return True
+
+
+def upload_timeout(size: int, throughput: Optional[float]) -> Tuple[float, float]:
+    """
+    Return (connect, read) timeouts for an upload of ``size`` bytes.
+
+    The read timeout leaves twice the expected transfer time, at the observed
+    or configured throughput, on top of a fixed allowance for the server to
+    extract the archive.
+    """
+    throughput = throughput or DEFAULT_UPLOAD_THROUGHPUT
+    return UPLOAD_CONNECT_TIMEOUT, max(UPLOAD_TIMEOUT_MIN, 30 + 2 * size / throughput)
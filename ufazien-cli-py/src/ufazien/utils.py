@@ -7,11 +7,20 @@ import json
 import os
 import random
 import re
+import shutil
 import string
+import tarfile
 import tempfile
 import zipfile
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ufazien.transforms import add_precompressed_sidecars
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
 
 
 def get_input(prompt: str, default: Optional[str] = None, required: bool = True) -> Optional[str]:
@@ -49,6 +58,14 @@ def generate_random_alphabetic(length: int = 6) -> str:
     return ''.join(random.choices(string.ascii_lowercase, k=length))
 
 
+def backoff_delays(initial: float = 0.5, maximum: float = 8.0, factor: float = 2.0) -> Iterator[float]:
+    """Yield exponentially growing poll delays with jitter, capped at ``maximum``."""
+    delay = initial
+    while True:
+        yield random.uniform(delay / 2, delay)
+        delay = min(delay * factor, maximum)
+
+
 def find_website_config(project_dir: str) -> Optional[Dict[str, Any]]:
     """Find .ufazien.json config file in project directory."""
     config_path = Path(project_dir) / '.ufazien.json'
@@ -77,14 +94,45 @@ def save_website_config(project_dir: str, config: Dict[str, Any]) -> None:
                 f.write('\n.ufazien.json\n')
 
 
+_ignore_patterns_cache: Dict[str, Tuple[int, List[str]]] = {}
+
+
+def read_ignore_patterns(ufazienignore_path: Path) -> List[str]:
+    """Read .ufazienignore patterns, re-parsing only when the file changes."""
+    try:
+        mtime = ufazienignore_path.stat().st_mtime_ns
+    except OSError:
+        return []
+    key = str(ufazienignore_path)
+    cached = _ignore_patterns_cache.get(key)
+    if cached is None or cached[0] != mtime:
+        with open(ufazienignore_path, 'r') as f:
+            patterns = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+        cached = (mtime, patterns)
+        _ignore_patterns_cache[key] = cached
+    return cached[1]
+
+
+def ignore_rule_matches(pattern: str, rel_path: str) -> bool:
+    """Check whether a single .ufazienignore pattern matches a relative POSIX path."""
+    segments = rel_path.split('/')
+    if pattern.endswith('/'):
+        dir_name = pattern[:-1]
+        return bool(dir_name) and dir_name in segments
+
+    basename = segments[-1]
+    if pattern.startswith('*.') and '*' not in pattern[2:]:
+        return basename.endswith(pattern[1:])
+
+    return basename == pattern or rel_path == pattern
+
+
 def should_exclude_file(file_path: Path, project_root: Path, ufazienignore_path: Path) -> bool:
     """Check if a file should be excluded based on .ufazienignore."""
-    if not ufazienignore_path.exists():
+    ignore_patterns = read_ignore_patterns(ufazienignore_path)
+    if not ignore_patterns:
         return False
 
-    with open(ufazienignore_path, 'r') as f:
-        ignore_patterns = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-
     try:
         rel = file_path.relative_to(project_root)
     except ValueError:
@@ -93,62 +141,38 @@ def should_exclude_file(file_path: Path, project_root: Path, ufazienignore_path:
     rel_path = rel.as_posix()
     if not rel_path or rel_path == '.':
         return False
-    segments = rel_path.split('/')
-    basename = segments[-1]
-
-    for pattern in ignore_patterns:
-        if pattern.endswith('/'):
-            dir_name = pattern[:-1]
-            if dir_name and dir_name in segments:
-                return True
-            continue
-
-        if pattern.startswith('*.') and '*' not in pattern[2:]:
-            if basename.endswith(pattern[1:]):
-                return True
-            continue
 
-        if basename == pattern or rel_path == pattern:
-            return True
+    return any(ignore_rule_matches(pattern, rel_path) for pattern in ignore_patterns)
 
-    return False
 
-
-def create_zip(project_dir: str, output_path: Optional[str] = None) -> str:
-    """Create a ZIP file of the project, excluding files in .ufazienignore."""
+def list_project_files(project_dir: str) -> List[Tuple[Path, str]]:
+    """List deployable project files as (path, archive name), excluding .ufazienignore matches."""
     project_path = Path(project_dir).resolve()
     ufazienignore_path = project_path / '.ufazienignore'
 
-    if output_path is None:
-        fd, output_path = tempfile.mkstemp(suffix='.zip')
-        os.close(fd)
+    result = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if not should_exclude_file(
+            Path(root) / d, project_path, ufazienignore_path
+        )]
 
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(project_path):
-            dirs[:] = [d for d in dirs if not should_exclude_file(
-                Path(root) / d, project_path, ufazienignore_path
-            )]
+        for file in files:
+            file_path = Path(root) / file
 
-            for file in files:
-                file_path = Path(root) / file
-
-                if should_exclude_file(file_path, project_path, ufazienignore_path):
-                    continue
-
-                if file_path.suffix == '.zip' and file_path.name == Path(output_path).name:
-                    continue
+            if should_exclude_file(file_path, project_path, ufazienignore_path):
+                continue
 
-                try:
-                    arcname = file_path.relative_to(project_path)
-                    zipf.write(file_path, arcname)
-                except ValueError:
-                    continue
+            try:
+                result.append((file_path, file_path.relative_to(project_path).as_posix()))
+            except ValueError:
+                continue
 
-    return output_path
+    result.sort(key=lambda item: item[1])
+    return result
 
 
-def create_zip_from_folder(project_dir: str, folder_name: str, output_path: Optional[str] = None) -> str:
-    """Create a ZIP file from a specific folder (e.g., dist, build)."""
+def list_folder_files(project_dir: str, folder_name: str) -> List[Tuple[Path, str]]:
+    """List files of a specific folder (e.g., dist, build) as (path, archive name)."""
     project_path = Path(project_dir).resolve()
     build_folder_path = project_path / folder_name
 
@@ -158,23 +182,257 @@ def create_zip_from_folder(project_dir: str, folder_name: str, output_path: Opti
     if not build_folder_path.is_dir():
         raise Exception(f"'{folder_name}' is not a directory.")
 
+    result = []
+    for root, dirs, files in os.walk(build_folder_path):
+        for file in files:
+            file_path = Path(root) / file
+            try:
+                # Create relative path from build folder root
+                result.append((file_path, file_path.relative_to(build_folder_path).as_posix()))
+            except ValueError:
+                continue
+
+    result.sort(key=lambda item: item[1])
+    return result
+
+
+# Fixed entry metadata for reproducible archives (the ZIP epoch, Unix host).
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+REPRODUCIBLE_COMPRESSLEVEL = 9
+
+
+def _reproducible_zipinfo(file_path: Path, arcname: str) -> zipfile.ZipInfo:
+    """Build a ZipInfo whose metadata depends only on the file's name, size and mode."""
+    stat = file_path.stat()
+    info = zipfile.ZipInfo(arcname, date_time=REPRODUCIBLE_DATE_TIME)
+    info.create_system = 3
+    mode = 0o755 if stat.st_mode & 0o111 else 0o644
+    info.external_attr = (0o100000 | mode) << 16
+    info.compress_type = zipfile.ZIP_DEFLATED
+    # ZipFile.open() takes the level from the ZipInfo, not from the archive.
+    if hasattr(info, 'compress_level'):  # Python 3.13+
+        info.compress_level = REPRODUCIBLE_COMPRESSLEVEL
+    else:
+        info._compresslevel = REPRODUCIBLE_COMPRESSLEVEL
+    info.file_size = stat.st_size
+    return info
+
+
+class ArchiveSizeExceeded(Exception):
+    """Raised when an archive grows past its size limit while being written."""
+
+    def __init__(self, size: int, limit: int):
+        super().__init__(f"Archive exceeds {limit} bytes (reached {size} bytes)")
+        self.size = size
+        self.limit = limit
+
+
+def _check_archive_size(size: int, max_size: Optional[int]) -> None:
+    if max_size is not None and size > max_size:
+        raise ArchiveSizeExceeded(size, max_size)
+
+
+def create_zip_from_files(
+    files: List[Tuple[Path, str]],
+    output_path: Optional[str] = None,
+    reproducible: bool = False,
+    max_size: Optional[int] = None
+) -> str:
+    """
+    Create a ZIP file from a list of (path, archive name) pairs.
+
+    With ``reproducible`` set, entries are sorted by name and written with
+    fixed timestamps, permissions and compression level and no extra fields,
+    so identical inputs produce byte-identical archives. With ``max_size``
+    set, writing stops with ArchiveSizeExceeded as soon as the archive grows
+    past it and the partial file is removed.
+    """
     if output_path is None:
         fd, output_path = tempfile.mkstemp(suffix='.zip')
         os.close(fd)
 
-    with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(build_folder_path):
-            for file in files:
-                file_path = Path(root) / file
-                try:
-                    # Create relative path from build folder root
-                    arcname = file_path.relative_to(build_folder_path)
+    output_resolved = Path(output_path).resolve()
+    if reproducible:
+        files = sorted(files, key=lambda item: item[1])
+
+    try:
+        with zipfile.ZipFile(
+            output_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=REPRODUCIBLE_COMPRESSLEVEL if reproducible else None
+        ) as zipf:
+            for file_path, arcname in files:
+                if file_path.resolve() == output_resolved:
+                    continue
+                if reproducible:
+                    info = _reproducible_zipinfo(file_path, arcname)
+                    with open(file_path, 'rb') as src, zipf.open(info, 'w') as dest:
+                        shutil.copyfileobj(src, dest, 1024 * 1024)
+                else:
                     zipf.write(file_path, arcname)
-                except ValueError:
+                _check_archive_size(zipf.fp.tell() if zipf.fp else 0, max_size)
+        _check_archive_size(os.path.getsize(output_path), max_size)
+    except ArchiveSizeExceeded:
+        os.remove(output_path)
+        raise
+
+    return output_path
+
+
+ZSTD_LEVEL = 10
+
+
+def available_archive_formats() -> List[str]:
+    """Archive formats this installation can produce, most preferred first."""
+    return ['tar.zst', 'zip'] if zstandard is not None else ['zip']
+
+
+def create_tar_zst_from_files(
+    files: List[Tuple[Path, str]],
+    output_path: Optional[str] = None,
+    reproducible: bool = False,
+    level: int = ZSTD_LEVEL,
+    max_size: Optional[int] = None
+) -> str:
+    """
+    Create a zstd-compressed tar archive from (path, archive name) pairs.
+
+    The tar stream is compressed as it is written, using all CPU cores.
+    ``reproducible`` and ``max_size`` work as in ``create_zip_from_files``.
+    Requires the optional ``zstandard`` module.
+    """
+    if zstandard is None:
+        raise Exception("tar.zst archives require the 'zstandard' package (pip install ufazien-cli[zstd]).")
+
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(suffix='.tar.zst')
+        os.close(fd)
+
+    output_resolved = Path(output_path).resolve()
+    if reproducible:
+        files = sorted(files, key=lambda item: item[1])
+
+    compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+    try:
+        with open(output_path, 'wb') as f, compressor.stream_writer(f) as stream, \
+                tarfile.open(fileobj=stream, mode='w|', format=tarfile.PAX_FORMAT) as tar:
+            for file_path, arcname in files:
+                if file_path.resolve() == output_resolved:
                     continue
+                with open(file_path, 'rb') as src:
+                    # Stat the open file so symlinks are stored as the file
+                    # they point to, as in ZIP archives.
+                    info = tar.gettarinfo(arcname=arcname, fileobj=src)
+                    if reproducible:
+                        info.mtime = 0
+                        info.uid = info.gid = 0
+                        info.uname = info.gname = ''
+                        info.mode = 0o755 if info.mode & 0o111 else 0o644
+                    tar.addfile(info, src)
+                # Compressed output lags behind the tar stream, so this is a lower bound.
+                _check_archive_size(f.tell(), max_size)
+        _check_archive_size(os.path.getsize(output_path), max_size)
+    except ArchiveSizeExceeded:
+        os.remove(output_path)
+        raise
 
     return output_path
-    
+
+
+def create_zip(
+    project_dir: str,
+    output_path: Optional[str] = None,
+    reproducible: bool = False,
+    precompress: bool = False
+) -> str:
+    """Create a ZIP file of the project, excluding files in .ufazienignore."""
+    files = list_project_files(project_dir)
+    if precompress:
+        files, _ = add_precompressed_sidecars(files)
+    return create_zip_from_files(files, output_path, reproducible)
+
+
+def create_zip_from_folder(
+    project_dir: str,
+    folder_name: str,
+    output_path: Optional[str] = None,
+    reproducible: bool = False,
+    precompress: bool = False
+) -> str:
+    """Create a ZIP file from a specific folder (e.g., dist, build)."""
+    files = list_folder_files(project_dir, folder_name)
+    if precompress:
+        files, _ = add_precompressed_sidecars(files)
+    return create_zip_from_files(files, output_path, reproducible)
+
+
+def file_sha256(file_path: Path) -> str:
+    """Compute the SHA-256 hex digest of a file."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def compute_tree_fingerprint(
+    files: List[Tuple[Path, str]],
+    previous_index: Optional[Dict[str, List[Any]]] = None,
+    settings: Optional[Dict[str, Any]] = None
+) -> Tuple[str, Dict[str, List[Any]]]:
+    """
+    Fingerprint a deploy file set by paths, sizes and content hashes.
+
+    Content hashes from ``previous_index`` are reused for files whose size and
+    mtime have not changed, so unchanged trees are fingerprinted without
+    reading file contents. ``settings`` (deploy options that change the
+    archive) are mixed into the fingerprint.
+
+    Returns:
+        Tuple of the fingerprint and the new index ({arcname: [size, mtime_ns, sha256]})
+    """
+    previous_index = previous_index or {}
+    index: Dict[str, List[Any]] = {}
+    for file_path, arcname in files:
+        stat = file_path.stat()
+        cached = previous_index.get(arcname)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            content_hash = cached[2]
+        else:
+            content_hash = file_sha256(file_path)
+        index[arcname] = [stat.st_size, stat.st_mtime_ns, content_hash]
+    return index_fingerprint(index, settings), index
+
+
+def index_fingerprint(index: Dict[str, List[Any]], settings: Optional[Dict[str, Any]] = None) -> str:
+    """Fingerprint a file index as produced by compute_tree_fingerprint."""
+    digest = hashlib.sha256(json.dumps(settings or {}, sort_keys=True).encode('utf-8'))
+    for arcname in sorted(index):
+        size, _, content_hash = index[arcname]
+        digest.update(f'{arcname}\0{size}\0{content_hash}\n'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_deploy_state(config_dir: Path, website_id: str) -> Dict[str, Any]:
+    """Load the recorded state of the last successful deploy of a website."""
+    state_path = Path(config_dir) / 'deploys' / f'{website_id}.json'
+    if state_path.exists():
+        try:
+            with open(state_path, 'r') as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            pass
+    return {}
+
+
+def save_deploy_state(config_dir: Path, website_id: str, state: Dict[str, Any]) -> None:
+    """Record the state of a successful deploy of a website."""
+    state_dir = Path(config_dir) / 'deploys'
+    state_dir.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=state_dir, suffix='.tmp')
+    with os.fdopen(fd, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_dir / f'{website_id}.json')
+
+
 def subdomain_sanitize(subdomain: str) -> str:
     name = subdomain.lower()
 
@@ -0,0 +1,155 @@
+"""
+File system watchers used by ``ufazien watch``.
+
+On Linux the project tree is watched with inotify (through ctypes, so no
+extra dependency is needed); elsewhere, or when inotify is unavailable,
+the tree is polled. Either way a watcher only reports *that* something may
+have changed - the caller rescans and diffs the file index to find out what.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Union
+
+# inotify event flags (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+# Longest a burst of events may keep extending the debounce window.
+MAX_BATCH_SECONDS = 2.0
+
+
+def list_watch_dirs(root: Path, exclude: Callable[[Path], bool]) -> List[Path]:
+    """List ``root`` and every subdirectory that is not excluded."""
+    result = []
+    for current, dirs, _ in os.walk(root):
+        dirs[:] = [d for d in dirs if not exclude(Path(current) / d)]
+        result.append(Path(current))
+    return result
+
+
+class PollingWatcher:
+    """Watcher that simply wakes up at a fixed interval."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+
+    def sync(self, dirs: Iterable[Path]) -> None:
+        """Polling needs no per-directory setup."""
+
+    def wait(self, debounce: float) -> Optional[List[str]]:
+        """Sleep for one interval; None means "rescan everything"."""
+        time.sleep(self.interval)
+        return None
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """Recursive directory watcher built on Linux inotify."""
+
+    def __init__(self) -> None:
+        libc_name = ctypes.util.find_library('c')
+        if not sys.platform.startswith('linux') or not libc_name:
+            raise OSError('inotify is only available on Linux')
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._watches: Dict[int, Path] = {}
+        self._paths: Dict[Path, int] = {}
+
+    def sync(self, dirs: Iterable[Path]) -> None:
+        """Watch every directory in ``dirs`` not watched yet."""
+        for directory in dirs:
+            if directory in self._paths:
+                continue
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(str(directory)), WATCH_MASK)
+            if wd < 0:
+                # The directory vanished between the scan and now, or the
+                # watch limit was reached; the next rescan will catch up.
+                continue
+            self._watches[wd] = directory
+            self._paths[directory] = wd
+
+    def _read_events(self) -> Optional[List[str]]:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        changed = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                directory = self._watches.pop(wd, None)
+                if directory is not None:
+                    self._paths.pop(directory, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is not None:
+                changed.append(str(directory / name) if name else str(directory))
+        return changed
+
+    def wait(self, debounce: float) -> Optional[List[str]]:
+        """
+        Block until something changes, then collect events until the tree is quiet.
+
+        Args:
+            debounce: Seconds without events that end a batch
+
+        Returns:
+            Changed paths, or None if events were lost and a full rescan is needed
+        """
+        select.select([self._fd], [], [])
+        changed: List[str] = []
+        started = time.monotonic()
+        while True:
+            events = self._read_events()
+            if events is None:
+                return None
+            changed.extend(events)
+            remaining = MAX_BATCH_SECONDS - (time.monotonic() - started)
+            if remaining <= 0:
+                return changed
+            ready, _, _ = select.select([self._fd], [], [], min(debounce, remaining))
+            if not ready:
+                return changed
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(poll: bool = False, interval: float = 1.0) -> Union[InotifyWatcher, PollingWatcher]:
+    """Return an inotify watcher where possible and a polling watcher otherwise."""
+    if not poll:
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(interval)
@@ -0,0 +1,62 @@
+"""Shared fixtures for the ufazien test suite."""
+
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+import requests
+
+from ufazien.client import UfazienAPIClient
+
+
+def make_response(
+    status: int = 200,
+    body: Any = None,
+    headers: Optional[Dict[str, str]] = None
+) -> requests.Response:
+    """Build a requests.Response with a JSON body."""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = 'OK' if status < 400 else 'Error'
+    response.headers.update(headers or {})
+    if body is not None:
+        response._content = json.dumps(body).encode('utf-8')
+        response.headers.setdefault('Content-Type', 'application/json')
+    else:
+        response._content = b''
+    return response
+
+
+class FakeSession:
+    """Stand-in for requests.Session that answers from a handler function."""
+
+    def __init__(self, handler: Callable[[str, str, Dict[str, str]], requests.Response]):
+        self.handler = handler
+        self.calls: List[Tuple[str, str, Dict[str, str]]] = []
+        self.bodies: List[bytes] = []
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None, **kwargs: Any):
+        headers = dict(headers or {})
+        self.calls.append((method, url, headers))
+        if hasattr(kwargs.get('data'), 'read'):
+            self.bodies.append(kwargs['data'].read())
+        return self.handler(method, url, headers)
+
+    def post(self, url: str, **kwargs: Any):
+        return self.request('POST', url, **kwargs)
+
+
+@pytest.fixture
+def make_client(tmp_path, monkeypatch):
+    """Create API clients with a fake session and no real sleeping."""
+    monkeypatch.setattr('ufazien.client.time.sleep', lambda seconds: None)
+
+    def factory(handler, **kwargs) -> UfazienAPIClient:
+        kwargs.setdefault('rate_limit', 1000)
+        kwargs.setdefault('base_url', 'https://api.example.test/api')
+        kwargs.setdefault('config_dir', str(tmp_path / 'config'))
+        client = UfazienAPIClient(**kwargs)
+        client.session = FakeSession(handler)
+        return client
+
+    return factory
@@ -0,0 +1,36 @@
+"""Tests for the rollback archive store."""
+
+import pytest
+
+from ufazien.archives import ArchiveStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArchiveStore(tmp_path / 'archives')
+    for name in ('first', 'second', 'third'):
+        archive = tmp_path / f'{name}.zip'
+        archive.write_bytes(name.encode())
+        store.add('1', str(archive), 'zip')
+    return store
+
+
+def test_positions_count_back_from_the_current_deploy(store):
+    history = store.history('1')
+    assert store.resolve('1', None) == history[1]
+    assert store.resolve('1', '0') == history[0]
+    assert store.resolve('1', '~2') == history[2]
+    assert store.resolve('1', '~3') is None
+
+
+def test_hash_prefixes_resolve_even_when_all_digits(store, monkeypatch):
+    entry = store.history('1')[2]
+    assert store.resolve('1', entry['hash'][:8]) == entry
+
+    monkeypatch.setattr(store, 'history', lambda website_id: [
+        {'hash': 'ab' * 32}, {'hash': '1234' + 'f' * 60}
+    ])
+    assert store.resolve('1', '1234') == {'hash': '1234' + 'f' * 60}
+    assert store.resolve('1', '9999') is None
+    # Short numbers stay positions: one deploy back.
+    assert store.resolve('1', '1') == {'hash': '1234' + 'f' * 60}
@@ -0,0 +1,123 @@
+"""Tests for deploy archive creation."""
+
+import hashlib
+import io
+import os
+import random
+import tarfile
+import zipfile
+import zlib
+
+import pytest
+
+from ufazien.utils import ArchiveSizeExceeded, create_tar_zst_from_files, create_zip_from_files
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+requires_zstd = pytest.mark.skipif(zstandard is None, reason='zstandard is not installed')
+
+
+def _read_tar_zst(path):
+    with open(path, 'rb') as f:
+        data = zstandard.ZstdDecompressor().stream_reader(f).read()
+    with tarfile.open(fileobj=io.BytesIO(data), mode='r:') as tar:
+        return {member.name: (member, tar.extractfile(member).read() if member.isfile() else None)
+                for member in tar.getmembers()}
+
+
+@requires_zstd
+def test_tar_zst_stores_symlink_targets(tmp_path):
+    outside = tmp_path / 'outside.txt'
+    outside.write_text('shared content')
+    project = tmp_path / 'project'
+    project.mkdir()
+    (project / 'link.txt').symlink_to(outside)
+    files = [(project / 'link.txt', 'link.txt')]
+
+    members = _read_tar_zst(create_tar_zst_from_files(files, str(tmp_path / 'out.tar.zst')))
+    member, content = members['link.txt']
+    assert member.isfile()
+    assert content == b'shared content'
+
+    with zipfile.ZipFile(create_zip_from_files(files, str(tmp_path / 'out.zip'))) as zf:
+        assert zf.read('link.txt') == content
+
+
+@requires_zstd
+def test_tar_zst_size_limit(tmp_path):
+    big = tmp_path / 'big.bin'
+    big.write_bytes(os.urandom(256 * 1024))
+    output = tmp_path / 'out.tar.zst'
+    with pytest.raises(ArchiveSizeExceeded):
+        create_tar_zst_from_files([(big, 'big.bin')], str(output), max_size=1024)
+    assert not output.exists()
+
+
+def _tree(root, mtime):
+    root.mkdir()
+    (root / 'index.html').write_text('<p>hello</p>')
+    (root / 'js').mkdir()
+    (root / 'js' / 'app.js').write_text('console.log(1);')
+    (root / 'run.sh').write_text('#!/bin/sh\n')
+    (root / 'run.sh').chmod(0o775)
+    for path in root.rglob('*'):
+        os.utime(path, (mtime, mtime))
+    return [(root / 'index.html', 'index.html'), (root / 'js' / 'app.js', 'js/app.js'), (root / 'run.sh', 'run.sh')]
+
+
+def _digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+@pytest.mark.parametrize('create', [
+    create_zip_from_files,
+    pytest.param(create_tar_zst_from_files, marks=requires_zstd),
+])
+def test_reproducible_archives_are_byte_identical(tmp_path, create):
+    first = _tree(tmp_path / 'a', 1_600_000_000)
+    second = _tree(tmp_path / 'b', 1_700_000_000)
+    (tmp_path / 'b' / 'run.sh').chmod(0o700)
+
+    one = create(first, str(tmp_path / 'one'), reproducible=True)
+    two = create(list(reversed(second)), str(tmp_path / 'two'), reproducible=True)
+
+    assert _digest(one) == _digest(two)
+
+
+def test_reproducible_zip_normalizes_entries(tmp_path):
+    files = _tree(tmp_path / 'a', 1_600_000_000)
+    archive = create_zip_from_files(list(reversed(files)), str(tmp_path / 'out.zip'), reproducible=True)
+    with zipfile.ZipFile(archive) as zf:
+        infos = zf.infolist()
+    assert [info.filename for info in infos] == ['index.html', 'js/app.js', 'run.sh']
+    assert {info.date_time for info in infos} == {(1980, 1, 1, 0, 0, 0)}
+    assert [(info.external_attr >> 16) & 0o777 for info in infos] == [0o644, 0o644, 0o755]
+
+
+@requires_zstd
+def test_reproducible_tar_zst_normalizes_entries(tmp_path):
+    files = _tree(tmp_path / 'a', 1_600_000_000)
+    members = _read_tar_zst(create_tar_zst_from_files(files, str(tmp_path / 'out.tar.zst'), reproducible=True))
+    assert list(members) == ['index.html', 'js/app.js', 'run.sh']
+    for name, (member, _) in members.items():
+        assert (member.mtime, member.uid, member.gid, member.uname, member.gname) == (0, 0, 0, '', '')
+    assert members['run.sh'][0].mode == 0o755
+
+
+def test_reproducible_zip_uses_maximum_compression(tmp_path):
+    rng = random.Random(0)
+    words = [bytes(rng.choice(b'abcdefghijklmnop') for _ in range(rng.randint(2, 9))) for _ in range(300)]
+    data = b' '.join(rng.choice(words) for _ in range(60000))
+    source = tmp_path / 'data.txt'
+    source.write_bytes(data)
+
+    archive = create_zip_from_files([(source, 'data.txt')], str(tmp_path / 'out.zip'), reproducible=True)
+
+    deflate = zlib.compressobj(9, zlib.DEFLATED, -15)
+    expected = len(deflate.compress(data) + deflate.flush())
+    with zipfile.ZipFile(archive) as zipf:
+        assert zipf.getinfo('data.txt').compress_size == expected
@@ -0,0 +1,144 @@
+"""Tests for the on-disk response cache and its use by the API client."""
+
+import time
+
+from ufazien.cache import ResponseCache
+
+from conftest import make_response
+
+
+def test_ttl_applies_by_prefix(tmp_path):
+    cache = ResponseCache(tmp_path, ttls=[('/a/b/', 10), ('/a/', 60)])
+    assert cache.ttl_for('/a/b/1/') == 10
+    assert cache.ttl_for('/a/c/') == 60
+    assert cache.ttl_for('/other/') is None
+
+
+def test_entry_is_fresh_until_ttl_expires(tmp_path, monkeypatch):
+    cache = ResponseCache(tmp_path, ttls=[('/a/', 10)])
+    cache.store('/a/', {'x': 1}, etag='"v1"')
+    entry = cache.get('/a/')
+    assert entry['body'] == {'x': 1}
+    assert cache.is_fresh(entry)
+    assert cache.conditional_headers(entry) == {'If-None-Match': '"v1"'}
+
+    now = time.time()
+    monkeypatch.setattr('ufazien.cache.time.time', lambda: now + 11)
+    assert not cache.is_fresh(cache.get('/a/'))
+
+
+def test_invalidate_drops_the_whole_collection(tmp_path):
+    cache = ResponseCache(tmp_path)
+    cache.store('/hosting/websites/', [])
+    cache.store('/hosting/websites/1/', {'id': 1})
+    cache.store('/hosting/capabilities/', {})
+    cache.invalidate('/hosting/websites/1/deploy/')
+    assert cache.get('/hosting/websites/') is None
+    assert cache.get('/hosting/websites/1/') is None
+    assert cache.get('/hosting/capabilities/') is not None
+
+    cache.invalidate('/auth/logout/')
+    assert cache.get('/hosting/capabilities/') is None
+
+
+def test_eviction_keeps_total_size_bounded(tmp_path):
+    cache = ResponseCache(tmp_path, max_bytes=600)
+    for i in range(10):
+        cache.store(f'/hosting/websites/{i}/', {'padding': 'x' * 100})
+    total = sum(path.stat().st_size for path in tmp_path.glob('*.json'))
+    assert total <= 600
+    assert cache.get('/hosting/websites/9/') is not None
+
+
+def test_fresh_entries_are_served_without_a_request(make_client):
+    def handler(method, url, headers):
+        return make_response(body={'email': 'a@example.test'})
+
+    client = make_client(handler, cache=True)
+    assert client.get_profile() == {'email': 'a@example.test'}
+    assert client.get_profile() == {'email': 'a@example.test'}
+    assert len(client.session.calls) == 1
+
+
+def test_entries_are_not_shared_between_servers(make_client):
+    def handler_for(email):
+        return lambda method, url, headers: make_response(body={'email': email})
+
+    staging = make_client(handler_for('staging@example.test'), cache=True, base_url='https://staging.example.test/api')
+    production = make_client(handler_for('prod@example.test'), cache=True)
+
+    assert staging.get_profile() == {'email': 'staging@example.test'}
+    assert production.get_profile() == {'email': 'prod@example.test'}
+    assert staging.get_profile() == {'email': 'staging@example.test'}
+    assert len(staging.session.calls) == 1
+
+
+def test_entries_are_not_shared_between_users(make_client):
+    def handler(method, url, headers):
+        if url.endswith('/auth/login/'):
+            return make_response(body={'access': 'a', 'refresh': 'r', 'user': {'id': 2}})
+        return make_response(body={'email': 'second@example.test'})
+
+    first = make_client(lambda method, url, headers: make_response(body={'email': 'first@example.test'}), cache=True)
+    assert first.get_profile() == {'email': 'first@example.test'}
+
+    second = make_client(handler, cache=True)
+    second.login('second@example.test', 'secret')
+    assert second.get_profile() == {'email': 'second@example.test'}
+    assert make_client(handler, cache=True).user_id == '2'
+
+
+def test_stale_entries_are_revalidated(make_client):
+    def handler(method, url, headers):
+        if headers.get('If-None-Match') == '"v1"':
+            return make_response(304)
+        return make_response(body={'email': 'a@example.test'}, headers={'ETag': '"v1"'})
+
+    client = make_client(handler, cache=True)
+    client.cache.ttls = [('/auth/user/', 0)]
+    client.get_profile()
+    assert client.get_profile() == {'email': 'a@example.test'}
+    assert client.session.calls[-1][2]['If-None-Match'] == '"v1"'
+
+
+def test_use_cache_false_bypasses_a_fresh_entry(make_client):
+    website = {'id': '1', 'deployment_status': 'queued'}
+
+    def handler(method, url, headers):
+        return make_response(body=dict(website))
+
+    client = make_client(handler, cache=True)
+    assert client.get_website('1')['deployment_status'] == 'queued'
+    website['deployment_status'] = 'active'
+    assert client.get_website('1')['deployment_status'] == 'queued'
+    assert client.get_website('1', use_cache=False)['deployment_status'] == 'active'
+
+
+def test_deployment_polling_sees_updates_through_a_populated_cache(make_client):
+    polls = []
+
+    def handler(method, url, headers):
+        polls.append(url)
+        status = 'queued' if len(polls) < 3 else 'active'
+        return make_response(body={'id': '1', 'deployment_status': status})
+
+    client = make_client(handler, cache=True)
+    client.get_website('1')
+    assert client.cache.get('/hosting/websites/1/') is not None
+
+    result = client.wait_for_deployment('1', {'status': 'queued'}, timeout=60)
+    assert result['succeeded']
+    assert not result['timed_out']
+
+
+def test_database_polling_sees_updates_through_a_populated_cache(make_client):
+    polls = []
+
+    def handler(method, url, headers):
+        polls.append(url)
+        status = 'creating' if len(polls) < 3 else 'active'
+        return make_response(body={'id': '7', 'status': status})
+
+    client = make_client(handler, cache=True)
+    client.get_database('7')
+    assert client.wait_for_database('7', timeout=60)['status'] == 'active'
@@ -0,0 +1,127 @@
+"""Tests for token storage and refresh in the API client."""
+
+import json
+import stat
+import threading
+
+from conftest import make_response
+
+
+def _auth_server(refreshes, refresh_delay=None):
+    """Handler accepting only the current access token and rotating it on refresh."""
+    state = {'access': 'old'}
+
+    def handler(method, url, headers):
+        if url.endswith('/auth/token/refresh/'):
+            if refresh_delay is not None:
+                refresh_delay.wait(1)
+            refreshes.append(url)
+            state['access'] = f'new{len(refreshes)}'
+            return make_response(body={'access': state['access'], 'refresh': 'refresh2'})
+        if headers.get('Authorization') != f"Bearer {state['access']}":
+            return make_response(401, body={'detail': 'Token expired'})
+        return make_response(body={'email': 'a@example.test'})
+
+    return handler
+
+
+def test_tokens_are_saved_privately(make_client):
+    client = make_client(lambda method, url, headers: make_response(body={}))
+    client._save_tokens('access', 'refresh')
+
+    assert json.loads(client.tokens_file.read_text()) == {'access_token': 'access', 'refresh_token': 'refresh'}
+    assert stat.S_IMODE(client.tokens_file.stat().st_mode) == 0o600
+    assert not list(client.config_dir.glob('.tokens.*.tmp'))
+
+
+def test_expired_token_is_refreshed_and_the_request_retried(make_client):
+    refreshes = []
+    client = make_client(_auth_server(refreshes))
+    client._save_tokens('expired', 'refresh1')
+
+    assert client.get_profile() == {'email': 'a@example.test'}
+    assert len(refreshes) == 1
+    assert client.access_token == 'new1'
+    assert json.loads(client.tokens_file.read_text())['refresh_token'] == 'refresh2'
+
+
+def test_concurrent_401s_refresh_once(make_client):
+    refreshes = []
+    release = threading.Event()
+    handler = _auth_server(refreshes, refresh_delay=release)
+    clients = [make_client(handler) for _ in range(4)]
+    clients[0]._save_tokens('expired', 'refresh1')
+    for client in clients:
+        client._load_tokens()
+
+    results = []
+    threads = [threading.Thread(target=lambda c=c: results.append(c.get_profile())) for c in clients]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    assert len(refreshes) == 1
+    assert {client.access_token for client in clients} == {'new1'}
+
+
+def test_threads_sharing_a_client_refresh_once(make_client):
+    refreshes = []
+    refreshed = threading.Event()
+    rejected = []
+    auth = _auth_server(refreshes)
+
+    def handler(method, url, headers):
+        response = auth(method, url, headers)
+        if url.endswith('/auth/token/refresh/'):
+            refreshed.set()
+        elif response.status_code == 401:
+            rejected.append(url)
+            # Deliver every 401 after the first only once the token has rotated.
+            if len(rejected) > 1:
+                refreshed.wait(1)
+        return response
+
+    client = make_client(handler)
+    client._save_tokens('expired', 'refresh1')
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client.get_profile())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    assert len(refreshes) == 1
+    assert client.access_token == 'new1'
+
+
+def test_token_refreshed_by_another_process_is_reused(make_client):
+    refreshes = []
+    client = make_client(_auth_server(refreshes))
+    # Another process already stored the current token; this one still has a stale copy.
+    client._save_tokens('old', 'refresh1')
+    client.access_token = 'stale'
+
+    assert client.get_profile() == {'email': 'a@example.test'}
+    assert refreshes == []
+    assert client.access_token == 'old'
+
+
+def test_failed_refresh_logs_out(make_client):
+    def handler(method, url, headers):
+        return make_response(401, body={'detail': 'Token is invalid'})
+
+    client = make_client(handler)
+    client._save_tokens('old', 'refresh1')
+    try:
+        client.get_profile()
+    except Exception as e:
+        assert 'ufazien login' in str(e)
+    else:
+        raise AssertionError('expected an authentication error')
+    assert client.access_token is None
+    assert not client.tokens_file.exists()
@@ -0,0 +1,117 @@
+"""Tests for SQL dump splitting and resumable imports."""
+
+import io
+
+import pytest
+
+from ufazien.database import frame_statements, import_dump, iter_batches, parse_frames
+from ufazien.operations import operation_id
+
+from conftest import make_response
+
+
+def test_batches_split_statements_and_resume_from_an_offset():
+    dump = b"CREATE TABLE t (a TEXT);\nINSERT INTO t VALUES ('x;y');\nINSERT INTO t VALUES ('z');\n"
+    batches = list(iter_batches(io.BytesIO(dump), 0, b';', max_statements=2, max_bytes=1 << 20))
+    assert [count for _, count, _, _ in batches] == [2, 1]
+    assert parse_frames(batches[0][0])[1] == b"INSERT INTO t VALUES ('x;y')"
+
+    resume_at = batches[0][2]
+    rest = list(iter_batches(io.BytesIO(dump), resume_at, b';', max_statements=2, max_bytes=1 << 20))
+    assert [parse_frames(payload) for payload, _, _, _ in rest] == [parse_frames(batches[1][0])]
+
+
+def test_frames_round_trip():
+    statements = [b'SELECT 1;', b"INSERT INTO t VALUES ('\\n');"]
+    assert parse_frames(frame_statements(statements)) == statements
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / 'dump.sql'
+    path.write_bytes(b'INSERT INTO t VALUES (1);\nINSERT INTO t VALUES (2);\n')
+    return path
+
+
+def _interrupted(client, dump, import_id='imp1'):
+    stat = dump.stat()
+    op_id = operation_id('db_import', {
+        'api': client.base_url,
+        'database_id': 'db1',
+        'path': str(dump.resolve()),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    })
+    client.pending.begin(op_id)
+    client.pending.update(op_id, import_id=import_id, attempt=1)
+    return op_id
+
+
+def _import_server(statuses):
+    """Handler answering session lookups with successive statuses and recording writes."""
+    posts = []
+
+    def handler(method, url, headers):
+        if method == 'GET':
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            return make_response(body={'id': 'imp1', 'status': status, 'statements': 2, 'cursor': None})
+        posts.append(url)
+        if url.endswith('/imports/'):
+            return make_response(201, body={'id': 'imp2', 'status': 'receiving', 'cursor': None})
+        if url.endswith('/complete/'):
+            return make_response(body={'id': 'imp2', 'status': 'completed', 'statements': 2})
+        return make_response(body={'id': 'imp2', 'status': 'receiving'})
+
+    return handler, posts
+
+
+def test_completed_import_is_not_run_again(make_client, dump):
+    handler, posts = _import_server(['completed'])
+    client = make_client(handler)
+    op_id = _interrupted(client, dump)
+
+    result = import_dump(client, 'db1', str(dump), compression='none')
+
+    assert result['status'] == 'completed'
+    assert posts == []
+    assert client.pending.get(op_id) is None
+
+
+def test_running_import_is_waited_for(make_client, dump):
+    handler, posts = _import_server(['importing', 'importing', 'succeeded'])
+    client = make_client(handler)
+    op_id = _interrupted(client, dump)
+
+    assert import_dump(client, 'db1', str(dump), compression='none')['status'] == 'succeeded'
+    assert posts == []
+    assert client.pending.get(op_id) is None
+
+
+@pytest.mark.parametrize('status', ['failed', 'expired'])
+def test_failed_import_starts_over(make_client, dump, status):
+    handler, posts = _import_server([status])
+    client = make_client(handler)
+    _interrupted(client, dump)
+
+    result = import_dump(client, 'db1', str(dump), compression='none')
+
+    assert result['id'] == 'imp2'
+    assert posts[0].endswith('/databases/db1/imports/')
+    assert posts[-1].endswith('/imports/imp2/complete/')
+
+
+def test_failed_lookup_does_not_start_over(make_client, dump):
+    posts = []
+
+    def handler(method, url, headers):
+        if method != 'GET':
+            posts.append(url)
+        return make_response(503, body={'detail': 'unavailable'})
+
+    client = make_client(handler)
+    op_id = _interrupted(client, dump)
+
+    with pytest.raises(Exception, match='--restart'):
+        import_dump(client, 'db1', str(dump), compression='none')
+    assert posts == []
+    assert client.pending.get(op_id) is not None
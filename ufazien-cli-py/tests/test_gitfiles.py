@@ -0,0 +1,61 @@
+"""Tests for deploy file lists taken from git."""
+
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from ufazien.gitfiles import list_git_files
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git is not installed')
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ['git', '-C', str(repo), '-c', 'user.name=t', '-c', 'user.email=t@example.test', *args],
+        check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    repo = tmp_path / 'repo'
+    (repo / 'public').mkdir(parents=True)
+    (repo / 'public' / 'index.php').write_text('<?php echo 1;')
+    (repo / 'shared.css').write_text('body{}')
+    (repo / '.gitignore').write_text('.env\n')
+    (repo / '.env').write_text('DB_NAME=app\n')
+    os.symlink('../shared.css', repo / 'public' / 'style.css')
+    os.symlink('/etc/hostname', repo / 'outside')
+    os.symlink('public', repo / 'web')
+    _git(repo, 'init', '-q')
+    _git(repo, 'add', '-A')
+    _git(repo, 'commit', '-q', '-m', 'init')
+    return repo
+
+
+def _contents(files):
+    return {arcname: path.read_bytes() for path, arcname in files}
+
+
+@pytest.mark.parametrize('ref', [None, 'HEAD'])
+def test_index_and_ref_modes_list_the_same_files(repo, ref):
+    files = _contents(list_git_files(str(repo), ref=ref))
+    assert sorted(files) == ['.env', '.gitignore', 'public/index.php', 'public/style.css', 'shared.css']
+    assert files['public/style.css'] == b'body{}'
+    assert files['.env'] == b'DB_NAME=app\n'
+
+
+@pytest.mark.parametrize('ref', [None, 'HEAD'])
+def test_folder_mode_follows_links_out_of_the_folder(repo, ref):
+    (repo / 'public' / '.env').write_text('APP=1\n')
+    files = _contents(list_git_files(str(repo), ref=ref, folder='public'))
+    assert sorted(files) == ['.env', 'index.php', 'style.css']
+    assert files['.env'] == b'APP=1\n'
+
+
+def test_ignored_env_is_not_added(repo):
+    (repo / '.ufazienignore').write_text('.env\n')
+    assert '.env' not in _contents(list_git_files(str(repo)))
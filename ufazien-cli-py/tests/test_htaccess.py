@@ -0,0 +1,103 @@
+"""Tests for the managed .htaccess block."""
+
+from ufazien.api import deploy_settings
+from ufazien.htaccess import BEGIN_MARKER, END_MARKER, MAX_PATTERN_LENGTH, has_block, render_block, replace_block
+from ufazien.transforms import has_managed_htaccess, sync_htaccess_files
+
+
+def test_render_block_without_extras():
+    block = render_block()
+    assert block.startswith(BEGIN_MARKER + '\n')
+    assert block.endswith(END_MARKER + '\n')
+    assert 'AddOutputFilterByType DEFLATE' in block
+    assert 'RewriteEngine' not in block
+    assert 'immutable' not in block
+
+
+def test_render_block_serves_sidecars_by_preference():
+    block = render_block(precompressed={'gz': {'css', 'js', 'png'}, 'br': {'css'}})
+    br = block.index(r'RewriteRule ^(.+)\.(css)$ $1.$2.br [L]')
+    gz = block.index(r'RewriteRule ^(.+)\.(css|js)$ $1.$2.gz [L]')
+    assert br < gz
+    # Extensions without a known content type get no rules.
+    assert 'png' not in block.split('<IfModule mod_headers.c>')[1].split('</IfModule>')[0]
+    assert 'Header set Content-Encoding br' in block
+    assert r'RewriteRule \.css\.(br|gz)$ - [T=text/css,E=no-gzip:1,E=no-brotli:1]' in block
+
+
+def test_render_block_marks_fingerprinted_assets_immutable():
+    block = render_block(fingerprinted=['app.0123456789.css', 'a+b.1234567890.js'])
+    assert r'<FilesMatch "^(a\+b\.1234567890\.js|app\.0123456789\.css)(\.(br|gz))?$">' in block
+    assert 'max-age=31536000, immutable' in block
+
+
+def test_render_block_splits_long_patterns():
+    names = [f'asset-{i:05d}.0123456789.js' for i in range(500)]
+    lines = [line for line in render_block(fingerprinted=names).splitlines() if 'FilesMatch "^(' in line]
+    assert len(lines) > 1
+    assert all(len(line) < MAX_PATTERN_LENGTH + 100 for line in lines)
+
+
+def test_replace_block_keeps_user_rules():
+    text = 'Options -Indexes\n\n' + render_block() + '\nRedirect /old /new\n'
+    replaced = replace_block(text, render_block(fingerprinted=['a.0123456789.css']))
+    assert replaced.startswith('Options -Indexes\n\n')
+    assert replaced.endswith('\nRedirect /old /new\n')
+    assert replaced.count(BEGIN_MARKER) == 1
+    assert 'immutable' in replaced
+
+
+def test_replace_block_appends_when_missing():
+    assert replace_block('', render_block()) == render_block()
+    appended = replace_block('Options -Indexes', render_block())
+    assert appended == 'Options -Indexes\n\n' + render_block()
+    assert has_block(appended)
+    assert not has_block('Options -Indexes\n')
+
+
+def _project(tmp_path, htaccess):
+    (tmp_path / '.htaccess').write_text(htaccess)
+    (tmp_path / 'app.css').write_text('p{}')
+    (tmp_path / 'app.css.gz').write_bytes(b'gz')
+    return [
+        (tmp_path / '.htaccess', '.htaccess'),
+        (tmp_path / 'app.css', 'css/app.0123456789.css'),
+        (tmp_path / 'app.css.gz', 'css/app.0123456789.css.gz'),
+    ]
+
+
+def test_sync_rebuilds_the_block_in_a_staged_copy(tmp_path):
+    original = 'Options -Indexes\n\n' + render_block()
+    files = _project(tmp_path, original)
+    assert has_managed_htaccess(files)
+
+    result, summary = sync_htaccess_files(files, cache_dir=tmp_path / 'cache')
+
+    assert summary == {'updated': True, 'fingerprinted': 1, 'precompressed': {'gz': ['css']}}
+    staged = dict((arcname, path) for path, arcname in result)['.htaccess']
+    assert staged.parent == tmp_path / 'cache'
+    assert 'app\\.0123456789\\.css' in staged.read_text()
+    assert (tmp_path / '.htaccess').read_text() == original
+
+
+def test_sync_leaves_unmanaged_htaccess_alone(tmp_path):
+    files = _project(tmp_path, 'Options -Indexes\n')
+    assert not has_managed_htaccess(files)
+    assert sync_htaccess_files(files, cache_dir=tmp_path / 'cache')[0] == files
+
+
+def test_sync_can_add_the_block(tmp_path):
+    files = _project(tmp_path, 'Options -Indexes\n')
+    result, summary = sync_htaccess_files(files, add_block=True, cache_dir=tmp_path / 'cache')
+    staged = dict((arcname, path) for path, arcname in result)['.htaccess']
+    assert staged.read_text().startswith('Options -Indexes\n\n' + BEGIN_MARKER)
+    assert (tmp_path / '.htaccess').read_text() == 'Options -Indexes\n'
+
+    # Without an .htaccess, one is added to the archive.
+    result, _ = sync_htaccess_files(files[1:], add_block=True, cache_dir=tmp_path / 'cache')
+    assert [arcname for _, arcname in result][-1] == '.htaccess'
+
+
+def test_htaccess_setting_defaults_to_markers_only():
+    assert deploy_settings({})['htaccess'] is None
+    assert deploy_settings({'htaccess': False})['htaccess'] is False
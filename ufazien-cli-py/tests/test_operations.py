@@ -0,0 +1,64 @@
+"""Tests for locally persisted pending operations."""
+
+import json
+import multiprocessing
+import time
+
+import pytest
+
+from ufazien.operations import PENDING_MAX_AGE, PendingOperations, operation_id
+
+
+def test_operation_id_is_stable():
+    assert operation_id('create', {'a': 1, 'b': 2}) == operation_id('create', {'b': 2, 'a': 1})
+    assert operation_id('create', {'a': 1}) != operation_id('create', {'a': 2})
+    assert operation_id('create', {'a': 1}).startswith('create:')
+
+
+def test_begin_reuses_the_key_until_finished(tmp_path):
+    pending = PendingOperations(tmp_path / 'pending.json')
+    first = pending.begin('op', name='site')
+    assert first['name'] == 'site'
+    assert pending.begin('op')['key'] == first['key']
+
+    pending.update('op', website_id='w1')
+    assert pending.get('op')['website_id'] == 'w1'
+
+    pending.finish('op')
+    assert pending.get('op') is None
+    assert pending.begin('op')['key'] != first['key']
+
+
+def test_state_survives_a_new_instance(tmp_path):
+    key = PendingOperations(tmp_path / 'pending.json').begin('op')['key']
+    assert PendingOperations(tmp_path / 'pending.json').get('op')['key'] == key
+
+
+def test_old_operations_expire(tmp_path):
+    path = tmp_path / 'pending.json'
+    path.write_text(json.dumps({'old': {'key': 'k', 'created_at': time.time() - PENDING_MAX_AGE - 1}}))
+    assert PendingOperations(path).get('old') is None
+
+
+def _begin_many(path, worker, count):
+    pending = PendingOperations(path)
+    for i in range(count):
+        pending.begin(f'{worker}-{i}')
+        pending.update(f'{worker}-{i}', worker=worker)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='needs fork')
+def test_concurrent_processes_do_not_lose_operations(tmp_path):
+    path = tmp_path / 'pending.json'
+    context = multiprocessing.get_context('fork')
+    processes = [context.Process(target=_begin_many, args=(path, worker, 25)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    records = json.loads(path.read_text())
+    assert len(records) == 100
+    assert all(record['worker'] == int(op.split('-')[0]) for op, record in records.items())
+    assert not list(tmp_path.glob('.pending.*.tmp'))
@@ -0,0 +1,131 @@
+"""Tests for client-side rate limiting."""
+
+import time
+
+import pytest
+
+from ufazien.ratelimit import RateLimiter, parse_retry_after
+from ufazien.upload import TokenBucket
+
+from conftest import make_response
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time, 'monotonic', clock)
+    return clock
+
+
+def test_token_bucket_allows_a_burst_then_spreads_requests(clock):
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == 0
+    assert bucket.reserve(1) == pytest.approx(0.1)
+    assert bucket.reserve(1) == pytest.approx(0.2)
+    assert bucket.throttled_seconds == pytest.approx(0.3)
+
+    clock.now += 10
+    assert bucket.reserve(1) == 0
+
+
+def test_token_bucket_set_rate_keeps_accumulated_tokens(clock):
+    bucket = TokenBucket(rate=10, burst=5)
+    bucket.reserve(5)
+    clock.now += 0.2
+    bucket.set_rate(1, burst=5)
+    assert bucket.reserve(2) == 0
+    assert bucket.reserve(1) == pytest.approx(1.0)
+
+
+def test_pause_holds_back_requests(clock):
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.pause(5)
+    assert limiter.reserve() == pytest.approx(5)
+    clock.now += 5
+    assert limiter.reserve() == 0
+
+
+def test_overlapping_pauses_count_only_the_extension(clock):
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.pause(5)
+    limiter.pause(5)
+    clock.now += 2
+    limiter.pause(5)
+    limiter.pause(1)
+    assert limiter.paused_seconds == pytest.approx(7)
+
+    clock.now += 100
+    limiter.pause(3)
+    assert limiter.paused_seconds == pytest.approx(10)
+    assert limiter.stats()['paused_seconds'] == pytest.approx(10)
+
+
+def test_exhausted_window_pauses_until_reset(clock):
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.update_from_headers({'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '4'})
+    assert limiter.reserve() == pytest.approx(4)
+
+
+def test_remaining_budget_is_spread_over_the_window(clock):
+    limiter = RateLimiter(rate=100, burst=10)
+    limiter.update_from_headers({'RateLimit-Remaining': '10', 'RateLimit-Reset': '10'})
+    assert limiter.bucket.rate == pytest.approx(1)
+
+    clock.now += 11
+    limiter.reserve()
+    assert limiter.bucket.rate == 100
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('3') == 3
+    assert parse_retry_after('-1') == 0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+
+
+def test_429_is_retried_after_retry_after(make_client):
+    responses = [
+        make_response(429, body={'detail': 'slow down'}, headers={'Retry-After': '2'}),
+        make_response(body={'ok': True}),
+    ]
+    client = make_client(lambda method, url, headers: responses.pop(0))
+    client.rate_limiter = RateLimiter(rate=1000, burst=100)
+    assert client._make_request('POST', '/hosting/websites/') == {'ok': True}
+    stats = client.rate_limiter.stats()
+    assert stats['rate_limited'] == 1
+    assert stats['retries'] == 1
+    assert stats['paused_seconds'] == pytest.approx(2, abs=0.1)
+
+
+def test_unkeyed_post_is_not_retried_on_5xx(make_client, tmp_path):
+    archive = tmp_path / 'site.tar.zst'
+    archive.write_bytes(b'archive')
+    client = make_client(lambda method, url, headers: make_response(503, body={'detail': 'unavailable'}))
+
+    with pytest.raises(Exception, match='unavailable'):
+        client.upload_archive('1', str(archive), 'tar.zst')
+    with pytest.raises(Exception, match='unavailable'):
+        client.login('a@example.test', 'secret')
+    assert len(client.session.calls) == 2
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_keyed_upload_is_retried_with_the_whole_body(make_client, status):
+    responses = [make_response(status, body={'detail': 'again'}), make_response(body={'offset': 5})]
+    client = make_client(lambda method, url, headers: responses.pop(0))
+
+    client.upload_database_import_chunk('1', '2', b'chunk', 0, '', 1, 'none', idempotency_key='key')
+
+    first, second = client.session.bodies
+    assert b'chunk' in first and b'chunk' in second
+    assert len(first) == len(second)
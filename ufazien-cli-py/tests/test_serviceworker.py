@@ -0,0 +1,58 @@
+"""Tests for the service worker precache manifest."""
+
+import json
+import re
+
+from ufazien.api import deploy_settings
+from ufazien.serviceworker import SERVICE_WORKER_TEMPLATE, has_manifest, inject_manifest
+from ufazien.transforms import add_precache_manifest
+
+
+def _manifest(text):
+    return json.loads(re.search(r'PRECACHE_MANIFEST = (\[.*\]);', text).group(1))
+
+
+def test_inject_manifest_replaces_the_placeholder():
+    text = inject_manifest(SERVICE_WORKER_TEMPLATE, [('index.html', 'abc')])
+    assert _manifest(text) == [['index.html', 'abc']]
+    # A filled manifest can be replaced again on the next deploy.
+    assert has_manifest(text)
+    assert _manifest(inject_manifest(text, [])) == []
+
+
+def test_inject_manifest_handles_minified_scripts():
+    assert inject_manifest('const PRECACHE_MANIFEST=[];', [('a.js', '1')]) == \
+        'const PRECACHE_MANIFEST = [["a.js","1"]];'
+
+
+def test_precache_lists_deployed_files(tmp_path):
+    (tmp_path / 'sw.js').write_text(SERVICE_WORKER_TEMPLATE)
+    (tmp_path / 'index.html').write_text('<p>hi</p>')
+    (tmp_path / 'app.css').write_text('p{}')
+    (tmp_path / 'notes.txt').write_text('x')
+    (tmp_path / '.htaccess').write_text('x')
+    files = [(tmp_path / name, name) for name in ('sw.js', 'index.html', 'app.css', 'notes.txt', '.htaccess')]
+    files.append((tmp_path / 'app.css', 'private/app.css'))
+
+    result, count = add_precache_manifest(files, exclude=['private/'], cache_dir=tmp_path / 'cache')
+
+    assert count == 2
+    sw_path = dict((arcname, path) for path, arcname in result)['sw.js']
+    assert sw_path.parent == tmp_path / 'cache'
+    assert [url for url, _ in _manifest(sw_path.read_text())] == ['app.css', 'index.html']
+    # The source file on disk keeps its empty manifest.
+    assert _manifest((tmp_path / 'sw.js').read_text()) == []
+
+
+def test_projects_without_a_service_worker_are_untouched(tmp_path):
+    (tmp_path / 'index.html').write_text('<p>hi</p>')
+    files = [(tmp_path / 'index.html', 'index.html')]
+    assert add_precache_manifest(files, cache_dir=tmp_path / 'cache') == (files, 0)
+
+
+def test_service_worker_is_opt_in():
+    assert deploy_settings({})['service_worker'] is False
+    assert deploy_settings({'service_worker': True})['service_worker'] is True
+    settings = deploy_settings({'service_worker': {'exclude': ['admin/']}})
+    assert settings['service_worker'] is True
+    assert settings['service_worker_exclude'] == ['admin/']
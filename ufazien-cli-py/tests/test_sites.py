@@ -0,0 +1,64 @@
+"""Tests for the sites command."""
+
+import json
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from typer.testing import CliRunner
+
+from ufazien import cli
+
+from conftest import make_response
+
+WEBSITES = [
+    {'id': 'w1', 'name': 'one', 'domain': {'name': 'one.example.test'}, 'website_type': 'static', 'status': 'active'},
+    {'id': 'w2', 'name': 'two', 'domain': {'name': 'two.example.test'}, 'website_type': 'php', 'status': 'active'},
+]
+
+
+def _projecting_server(url_log):
+    """Handler that, like the API, returns only the fields asked for in a listing."""
+
+    def handler(method, url, headers):
+        url_log.append(url)
+        parts = urlsplit(url)
+        if parts.path.endswith('/hosting/websites/'):
+            fields = parse_qs(parts.query).get('fields', [''])[0].split(',')
+            results = [{key: value for key, value in site.items() if key in fields} for site in WEBSITES]
+            return make_response(body={'count': len(results), 'next': None, 'results': results})
+        website_id = parts.path.rstrip('/').rsplit('/', 1)[1]
+        return make_response(body=next(site for site in WEBSITES if site['id'] == website_id))
+
+    return handler
+
+
+@pytest.fixture
+def run_sites(make_client, monkeypatch):
+    urls = []
+    client = make_client(_projecting_server(urls))
+    client._save_tokens('access', 'refresh')
+    monkeypatch.setattr(cli, 'UfazienAPIClient', lambda *args, **kwargs: client)
+
+    def run(*args):
+        result = CliRunner().invoke(cli.app, ['--output', 'json', 'sites', *args])
+        return result, urls
+
+    return run
+
+
+def test_details_fetch_by_id_when_id_is_not_shown(run_sites):
+    result, urls = run_sites('--details', '--fields', 'name,status')
+    assert result.exit_code == 0, result.output
+    events = [json.loads(line) for line in result.output.splitlines()]
+    assert [event['website'] for event in events if event['event'] == 'sites.website'] == [
+        {'name': 'one', 'status': 'active'},
+        {'name': 'two', 'status': 'active'},
+    ]
+    assert 'fields=name%2Cstatus%2Cid' in urls[0]
+
+
+def test_listing_without_details_requests_only_shown_fields(run_sites):
+    result, urls = run_sites('--fields', 'name')
+    assert result.exit_code == 0, result.output
+    assert 'fields=name&' in urls[0] or urls[0].endswith('fields=name')
+    assert len(urls) == 1
@@ -0,0 +1,48 @@
+"""Tests for deploy-time transforms."""
+
+import stat
+
+from ufazien.transforms import compile_env_files, parse_env, render_env_php
+
+
+def test_parse_env_matches_config_php():
+    values = parse_env('# comment\n DB_HOST = localhost \nDB_PASS="a=b"\nno equals\nDB_HOST=other\n')
+    # Values are trimmed but not unquoted, and the first definition wins.
+    assert values == {'DB_HOST': 'localhost', 'DB_PASS': '"a=b"'}
+
+
+def test_render_env_php_escapes_values():
+    php = render_env_php({'KEY': "it's \\ here"})
+    assert "'KEY' => 'it\\'s \\\\ here'," in php
+
+
+def test_compiled_env_cache_is_private(tmp_path):
+    project = tmp_path / 'project'
+    project.mkdir()
+    env = project / '.env'
+    env.write_text('DB_PASSWORD=secret\n')
+    cache_dir = tmp_path / 'compiled-env'
+
+    files, compiled = compile_env_files([(env, '.env')], cache_dir=cache_dir)
+
+    assert compiled == 1
+    path, arcname = files[-1]
+    assert arcname == '.env.php'
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+    assert "'DB_PASSWORD' => 'secret'" in path.read_text()
+
+
+def test_existing_compiled_env_is_made_private(tmp_path):
+    env = tmp_path / '.env'
+    env.write_text('A=1\n')
+    cache_dir = tmp_path / 'compiled-env'
+    files, _ = compile_env_files([(env, '.env')], cache_dir=cache_dir)
+    path = files[-1][0]
+    path.chmod(0o644)
+    cache_dir.chmod(0o755)
+
+    compile_env_files([(env, '.env')], cache_dir=cache_dir)
+
+    assert stat.S_IMODE(cache_dir.stat().st_mode) == 0o700
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
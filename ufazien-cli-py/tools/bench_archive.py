@@ -0,0 +1,93 @@
+"""
+Compare deploy archive formats on a project directory.
+
+Builds the archive the way ``ufazien deploy`` does (honouring
+.ufazienignore) in every available format and reports size and time.
+With ``--upload`` the archives are also uploaded to a running stand-in
+server (see standin_server.py) to include transfer and extraction.
+
+Usage:
+    python tools/bench_archive.py path/to/project [--repeat 3]
+    python tools/bench_archive.py path/to/project --upload http://127.0.0.1:8000
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from ufazien.client import UfazienAPIClient
+from ufazien.utils import (
+    available_archive_formats,
+    create_tar_zst_from_files,
+    create_zip_from_files,
+    list_folder_files,
+    list_project_files,
+)
+
+BUILDERS = {
+    'zip': create_zip_from_files,
+    'tar.zst': create_tar_zst_from_files,
+}
+
+
+def _time(func: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('project_dir')
+    parser.add_argument('--build-folder', help='Benchmark a build folder instead of the project root')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--upload', metavar='URL', help='Also time uploads to a stand-in server at URL')
+    args = parser.parse_args()
+
+    if args.build_folder:
+        files = list_folder_files(args.project_dir, args.build_folder)
+    else:
+        files = list_project_files(args.project_dir)
+    raw_size = sum(path.stat().st_size for path, _ in files)
+    print(f"{len(files)} files, {raw_size / 1024 / 1024:.2f} MB uncompressed\n")
+
+    client = None
+    website_id = None
+    if args.upload:
+        # A throwaway config dir keeps the stand-in login away from real tokens.
+        client = UfazienAPIClient(args.upload, config_dir=tempfile.mkdtemp())
+        client.login('bench@example.com', 'bench')
+        website_id = client.create_website('bench', f'bench-{int(time.time())}', 'static')['id']
+
+    print(f"{'format':<10}{'size MB':>10}{'ratio':>8}{'build s':>10}{'upload s':>10}")
+    for archive_format in available_archive_formats():
+        builder = BUILDERS[archive_format]
+        paths: List[str] = []
+
+        def build() -> None:
+            paths.append(builder(files))
+
+        build_times = _time(build, args.repeat)
+        size = os.path.getsize(paths[-1])
+
+        upload = ''
+        if client is not None and website_id is not None:
+            upload_times = _time(lambda: client.upload_archive(website_id, paths[-1], archive_format), args.repeat)
+            upload = f"{statistics.median(upload_times):.3f}"
+
+        for path in paths:
+            os.remove(path)
+        print(
+            f"{archive_format:<10}{size / 1024 / 1024:>10.2f}{size / max(raw_size, 1):>8.2f}"
+            f"{statistics.median(build_times):>10.3f}{upload:>10}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,714 @@
+"""
+Local stand-in for the Ufazien API, for trying the CLI without an account.
+
+Implements the endpoints the CLI uses with in-memory state. Uploaded
+archives (ZIP, and tar.zst when ``zstandard`` is installed) are extracted to
+``<root>/sites/<website_id>/`` so deploys can be inspected. Each database is
+an SQLite file in ``<root>/databases/`` that accepts common mysqldump output,
+so ``ufazien db import`` and ``ufazien db export`` can be tried locally.
+
+Usage:
+    python tools/standin_server.py --port 8000 --root /tmp/ufazien-standin
+    UFAZIEN_API_URL=http://127.0.0.1:8000 ufazien login -e me@example.com -p x
+"""
+
+import argparse
+import email.parser
+import email.policy
+import gzip
+import hashlib
+import io
+import json
+import re
+import shutil
+import sqlite3
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+
+class StandinState:
+    """In-memory data shared by all request handlers."""
+
+    def __init__(
+        self,
+        root: Path,
+        archive_formats: List[str],
+        provision_seconds: float,
+        deploy_seconds: float,
+        rate_limit: int = 0
+    ):
+        self.root = root
+        self.archive_formats = archive_formats
+        self.provision_seconds = provision_seconds
+        self.deploy_seconds = deploy_seconds
+        self.rate_limit = rate_limit
+        self.window_start = 0.0
+        self.window_count = 0
+        self.lock = threading.Lock()
+        self.domains: Dict[str, Dict[str, Any]] = {}
+        self.websites: Dict[str, Dict[str, Any]] = {}
+        self.databases: Dict[str, Dict[str, Any]] = {}
+        self.deployments: Dict[str, Dict[str, Any]] = {}
+        self.imports: Dict[str, Dict[str, Any]] = {}
+        self.exports: Dict[str, Dict[str, Any]] = {}
+        # Idempotency-Key -> (status, body) of the first response
+        self.idempotent_responses: Dict[str, Tuple[int, Any]] = {}
+
+
+def _new_id() -> str:
+    return str(uuid.uuid4())
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, str], Dict[str, bytes]]:
+    """Split a multipart/form-data body into form fields and files."""
+    message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+        f'Content-Type: {content_type}\r\n\r\n'.encode('latin-1') + body
+    )
+    fields: Dict[str, str] = {}
+    files: Dict[str, bytes] = {}
+    for part in message.iter_parts():
+        name = part.get_param('name', header='content-disposition')
+        payload = part.get_payload(decode=True) or b''
+        if part.get_filename() is not None:
+            files[name] = payload
+        else:
+            fields[name] = payload.decode('utf-8')
+    return fields, files
+
+
+def extract_archive(data: bytes, archive_format: str, target: Path, replace: bool = True) -> int:
+    """Extract an uploaded archive into ``target``, returning the file count."""
+    if replace and target.exists():
+        shutil.rmtree(target)
+    target.mkdir(parents=True, exist_ok=True)
+    if archive_format == 'zip':
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            archive.extractall(target)
+            return len([info for info in archive.infolist() if not info.is_dir()])
+    if archive_format == 'tar.zst':
+        if zstandard is None:
+            raise ValueError('zstandard is not installed on the stand-in server')
+        reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data))
+        count = 0
+        with tarfile.open(fileobj=reader, mode='r|') as archive:
+            for member in archive:
+                if not member.isfile() or member.name.startswith('/') or '..' in member.name.split('/'):
+                    continue
+                destination = target / member.name
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                source = archive.extractfile(member)
+                if source is not None:
+                    with open(destination, 'wb') as f:
+                        shutil.copyfileobj(source, f)
+                    count += 1
+        return count
+    raise ValueError(f'unsupported archive format: {archive_format}')
+
+
+def parse_frames(data: bytes) -> List[str]:
+    """Decode statements framed as ``<length>\\n<statement>\\n`` records."""
+    statements = []
+    pos = 0
+    while pos < len(data):
+        newline = data.index(b'\n', pos)
+        length = int(data[pos:newline])
+        statements.append(data[newline + 1:newline + 1 + length].decode('utf-8'))
+        pos = newline + length + 2
+    return statements
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+    if compression == 'gzip':
+        return gzip.decompress(data)
+    if compression == 'zstd':
+        if zstandard is None:
+            raise ValueError('zstandard is not installed on the stand-in server')
+        return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+    if compression == 'none':
+        return data
+    raise ValueError(f'unsupported compression: {compression}')
+
+
+_LEADING_COMMENTS = re.compile(r'\A(?:\s+|--[^\n]*(?:\n|\Z)|#[^\n]*(?:\n|\Z)|/\*(?!!).*?\*/)*', re.S)
+# Session settings, locks and transaction control (each chunk runs in its own transaction)
+_SKIPPED = re.compile(
+    r'(?:/\*!|SET\b|LOCK\s+TABLES|UNLOCK\s+TABLES|USE\b|CREATE\s+DATABASE|BEGIN\b|START\s+TRANSACTION|COMMIT\b)',
+    re.I
+)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'", re.S)
+_ESCAPES = {'0': '\0', 'n': '\n', 'r': '\r', 't': '\t', 'Z': '\x1a'}
+
+
+def _sqlite_string(match: 're.Match[str]') -> str:
+    body = re.sub(
+        r"\\(.)|''",
+        lambda m: _ESCAPES.get(m.group(1), m.group(1)) if m.group(1) else "'",
+        match.group()[1:-1],
+        flags=re.S
+    )
+    return "'" + body.replace("'", "''") + "'"
+
+
+def mysql_to_sqlite(statement: str) -> Optional[str]:
+    """
+    Adapt a mysqldump statement to SQLite, or return None to skip it.
+
+    Only handles what mysqldump commonly writes: session settings, locks and
+    transaction control are skipped, table options and column attributes SQLite does not know are
+    dropped, and backslash escapes in strings are decoded.
+    """
+    statement = _LEADING_COMMENTS.sub('', statement)
+    if not statement or _SKIPPED.match(statement):
+        return None
+    strings: List[str] = []
+
+    def stash(match: 're.Match[str]') -> str:
+        strings.append(_sqlite_string(match))
+        return f"'\x00{len(strings) - 1}'"
+
+    sql = _STRING.sub(stash, statement)
+    if re.match(r'CREATE\s+TABLE', sql, re.I):
+        sql = sql[:sql.rindex(')') + 1]
+        sql = re.sub(r'^\s*(?:FULLTEXT\s+|SPATIAL\s+)?KEY\b[^\n]*\n', '', sql, flags=re.I | re.M)
+        sql = re.sub(r'\bUNIQUE\s+KEY\s+`[^`]*`', 'UNIQUE', sql, flags=re.I)
+        sql = re.sub(r'\b(?:AUTO_INCREMENT|UNSIGNED|ZEROFILL)\b', '', sql, flags=re.I)
+        sql = re.sub(r"\b(?:CHARACTER\s+SET|COLLATE|COMMENT)\s+(?:'\x00\d+'|\w+)", '', sql, flags=re.I)
+        sql = re.sub(r',(\s*\))\s*\Z', r'\1', sql)
+    return re.sub(r"'\x00(\d+)'", lambda m: strings[int(m.group(1))], sql)
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the subset of the API used by the CLI."""
+
+    state: StandinState
+    protocol_version = 'HTTP/1.1'
+
+    # (method, path regex, handler name)
+    routes = [
+        ('POST', r'/api/auth/login/', 'login'),
+        ('POST', r'/api/auth/logout/', 'logout'),
+        ('POST', r'/api/auth/token/refresh/', 'refresh'),
+        ('GET', r'/api/auth/user/', 'user'),
+        ('GET', r'/api/hosting/capabilities/', 'capabilities'),
+        ('POST', r'/api/hosting/domains/', 'create_domain'),
+        ('GET', r'/api/hosting/domains/available/', 'available_domains'),
+        ('GET', r'/api/hosting/websites/', 'list_websites'),
+        ('POST', r'/api/hosting/websites/', 'create_website'),
+        ('GET', r'/api/hosting/websites/(?P<id>[^/]+)/', 'get_website'),
+        ('POST', r'/api/hosting/websites/(?P<id>[^/]+)/upload_zip/', 'upload_zip'),
+        ('POST', r'/api/hosting/websites/(?P<id>[^/]+)/upload_archive/', 'upload_archive'),
+        ('POST', r'/api/hosting/websites/(?P<id>[^/]+)/upload_files/', 'upload_files'),
+        ('POST', r'/api/hosting/websites/(?P<id>[^/]+)/deploy/', 'deploy'),
+        ('POST', r'/api/hosting/databases/', 'create_database'),
+        ('GET', r'/api/hosting/databases/(?P<id>[^/]+)/', 'get_database'),
+        ('POST', r'/api/hosting/databases/(?P<id>[^/]+)/imports/', 'start_import'),
+        ('GET', r'/api/hosting/databases/(?P<id>[^/]+)/imports/(?P<import_id>[^/]+)/', 'get_import'),
+        ('POST', r'/api/hosting/databases/(?P<id>[^/]+)/imports/(?P<import_id>[^/]+)/chunks/', 'import_chunk'),
+        ('POST', r'/api/hosting/databases/(?P<id>[^/]+)/imports/(?P<import_id>[^/]+)/complete/', 'complete_import'),
+        ('POST', r'/api/hosting/databases/(?P<id>[^/]+)/exports/', 'start_export'),
+        ('GET', r'/api/hosting/databases/(?P<id>[^/]+)/exports/(?P<export_id>[^/]+)/', 'get_export'),
+        ('GET', r'/api/hosting/databases/(?P<id>[^/]+)/exports/(?P<export_id>[^/]+)/download/', 'download_export'),
+    ]
+
+    def log_message(self, format: str, *args: Any) -> None:
+        print(f"{self.command} {self.path} -> {args[1] if len(args) > 1 else ''}")
+
+    def send_json(self, data: Any, status: int = 200, headers: Optional[Dict[str, str]] = None) -> None:
+        key = getattr(self, 'idempotency_key', None)
+        if key and 200 <= status < 300:
+            with self.state.lock:
+                self.state.idempotent_responses[key] = (status, data)
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in {**getattr(self, 'rate_headers', {}), **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_file_range(self, path: Path) -> None:
+        """Send a file, honouring a single ``Range: bytes=start-end`` header."""
+        size = path.stat().st_size
+        start, end, status = 0, size - 1, 200
+        match = re.fullmatch(r'bytes=(\d+)-(\d*)', self.headers.get('Range', ''))
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2)), size - 1) if match.group(2) else size - 1
+            status = 206
+            if start >= size:
+                self.send_json({'detail': 'Requested range not satisfiable.'}, 416)
+                return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(end - start + 1))
+        if status == 206:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.end_headers()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = end - start + 1
+            while remaining:
+                block = f.read(min(remaining, 1024 * 1024))
+                self.wfile.write(block)
+                remaining -= len(block)
+
+    def read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def read_json(self) -> Dict[str, Any]:
+        body = self.read_body()
+        return json.loads(body) if body else {}
+
+    def check_rate_limit(self) -> bool:
+        """Count the request in the current one-second window; False if over the limit."""
+        self.rate_headers: Dict[str, str] = {}
+        if not self.state.rate_limit:
+            return True
+        with self.state.lock:
+            now = time.time()
+            if now - self.state.window_start >= 1:
+                self.state.window_start, self.state.window_count = now, 0
+            self.state.window_count += 1
+            remaining = self.state.rate_limit - self.state.window_count
+            reset = max(0.0, self.state.window_start + 1 - now)
+        self.rate_headers = {
+            'X-RateLimit-Limit': str(self.state.rate_limit),
+            'X-RateLimit-Remaining': str(max(0, remaining)),
+            'X-RateLimit-Reset': f'{reset:.3f}',
+        }
+        if remaining >= 0:
+            return True
+        self.read_body()
+        self.send_json({'detail': 'Request was throttled.'}, 429, {'Retry-After': f'{reset:.3f}'})
+        return False
+
+    def replay_idempotent(self, method: str) -> bool:
+        """Answer a repeated POST with the response stored for its Idempotency-Key."""
+        self.idempotency_key = None
+        key = self.headers.get('Idempotency-Key')
+        if method != 'POST' or not key:
+            return False
+        with self.state.lock:
+            stored = self.state.idempotent_responses.get(key)
+        if stored is None:
+            self.idempotency_key = key
+            return False
+        self.read_body()
+        self.send_json(stored[1], stored[0], {'Idempotent-Replayed': 'true'})
+        return True
+
+    def dispatch(self, method: str) -> None:
+        if not self.check_rate_limit() or self.replay_idempotent(method):
+            return
+        parts = urlsplit(self.path)
+        self.query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        for route_method, pattern, name in self.routes:
+            match = re.fullmatch(pattern, parts.path)
+            if route_method == method and match:
+                if name not in ('login', 'refresh') and not self.headers.get('Authorization'):
+                    self.read_body()
+                    self.send_json({'detail': 'Authentication credentials were not provided.'}, 401)
+                    return
+                try:
+                    getattr(self, f'handle_{name}')(**match.groupdict())
+                except KeyError:
+                    self.send_json({'detail': 'Not found.'}, 404)
+                except ValueError as e:
+                    self.send_json({'detail': str(e)}, 400)
+                return
+        self.read_body()
+        self.send_json({'detail': 'Not found.'}, 404)
+
+    def do_GET(self) -> None:
+        self.dispatch('GET')
+
+    def do_POST(self) -> None:
+        self.dispatch('POST')
+
+    # Auth
+
+    def handle_login(self) -> None:
+        data = self.read_json()
+        self.send_json({
+            'access': f'access-{_new_id()}',
+            'refresh': f'refresh-{_new_id()}',
+            'user': {'email': data.get('email', ''), 'first_name': 'Stand-in', 'last_name': 'User'},
+        })
+
+    def handle_logout(self) -> None:
+        self.read_body()
+        self.send_json({})
+
+    def handle_refresh(self) -> None:
+        self.read_json()
+        self.send_json({'access': f'access-{_new_id()}'})
+
+    def handle_user(self) -> None:
+        self.send_json({'email': 'standin@example.com', 'first_name': 'Stand-in', 'last_name': 'User'})
+
+    def handle_capabilities(self) -> None:
+        self.send_json({'archive_formats': self.state.archive_formats, 'incremental_upload': True})
+
+    # Domains
+
+    def handle_create_domain(self) -> None:
+        data = self.read_json()
+        domain = {'id': _new_id(), 'name': data['name'], 'domain_type': data.get('domain_type', 'subdomain')}
+        with self.state.lock:
+            self.state.domains[domain['id']] = domain
+        self.send_json(domain, 201)
+
+    def handle_available_domains(self) -> None:
+        with self.state.lock:
+            used = {site['domain']['id'] for site in self.state.websites.values()}
+            self.send_json([d for d in self.state.domains.values() if d['id'] not in used])
+
+    # Websites
+
+    def _website_view(self, website: Dict[str, Any]) -> Dict[str, Any]:
+        view = dict(website)
+        deployment = self.state.deployments.get(website.get('latest_deployment_id', ''))
+        if deployment:
+            elapsed = time.time() - deployment['created_at']
+            if elapsed < self.state.deploy_seconds / 3:
+                status = 'queued'
+            elif elapsed < self.state.deploy_seconds:
+                status = 'building'
+            else:
+                status = 'deployed'
+            view['latest_deployment'] = {'id': deployment['id'], 'status': status}
+        view.pop('latest_deployment_id', None)
+        return view
+
+    def handle_list_websites(self) -> None:
+        page = int(self.query.get('page', 1))
+        page_size = int(self.query.get('page_size', 20))
+        fields = [f for f in self.query.get('fields', '').split(',') if f]
+        with self.state.lock:
+            sites = [self._website_view(w) for w in self.state.websites.values()]
+        chunk = sites[(page - 1) * page_size:page * page_size]
+        if fields:
+            # Like the real API, return only the requested fields.
+            chunk = [{key: value for key, value in site.items() if key in fields} for site in chunk]
+        base = f'http://{self.headers.get("Host")}/api/hosting/websites/'
+        extra = f'&fields={",".join(fields)}' if fields else ''
+        self.send_json({
+            'count': len(sites),
+            'next': f'{base}?page={page + 1}&page_size={page_size}{extra}' if page * page_size < len(sites) else None,
+            'previous': f'{base}?page={page - 1}&page_size={page_size}{extra}' if page > 1 else None,
+            'results': chunk,
+        })
+
+    def handle_create_website(self) -> None:
+        data = self.read_json()
+        with self.state.lock:
+            domain = self.state.domains[data['domain_id']]
+            website = {
+                'id': _new_id(),
+                'name': data['name'],
+                'website_type': data.get('website_type', 'static'),
+                'description': data.get('description', ''),
+                'status': 'active',
+                'domain': domain,
+            }
+            self.state.websites[website['id']] = website
+        self.send_json(website, 201)
+
+    def handle_get_website(self, id: str) -> None:
+        with self.state.lock:
+            self.send_json(self._website_view(self.state.websites[id]))
+
+    def _store_upload(self, website_id: str, data: bytes, archive_format: str) -> None:
+        if website_id not in self.state.websites:
+            raise KeyError(website_id)
+        started = time.monotonic()
+        count = extract_archive(data, archive_format, self.state.root / 'sites' / website_id)
+        self.send_json({
+            'detail': 'Upload extracted.',
+            'format': archive_format,
+            'files': count,
+            'bytes': len(data),
+            'extract_seconds': round(time.monotonic() - started, 3),
+        })
+
+    def handle_upload_zip(self, id: str) -> None:
+        _, files = parse_multipart(self.headers['Content-Type'], self.read_body())
+        self._store_upload(id, files['zip_file'], 'zip')
+
+    def handle_upload_archive(self, id: str) -> None:
+        fields, files = parse_multipart(self.headers['Content-Type'], self.read_body())
+        archive_format = fields.get('format', 'zip')
+        if archive_format not in self.state.archive_formats:
+            raise ValueError(f'unsupported archive format: {archive_format}')
+        self._store_upload(id, files['archive'], archive_format)
+
+    def handle_upload_files(self, id: str) -> None:
+        fields, files = parse_multipart(self.headers['Content-Type'], self.read_body())
+        if id not in self.state.websites:
+            raise KeyError(id)
+        target = self.state.root / 'sites' / id
+        count = extract_archive(files['archive'], 'zip', target, replace=False)
+        deleted = 0
+        for name in json.loads(fields.get('deleted', '[]')):
+            path = target / name
+            if name.startswith('/') or '..' in name.split('/') or not path.is_file():
+                continue
+            path.unlink()
+            deleted += 1
+        self.send_json({'detail': 'Files updated.', 'files': count, 'deleted': deleted})
+
+    def handle_deploy(self, id: str) -> None:
+        self.read_body()
+        with self.state.lock:
+            website = self.state.websites[id]
+            deployment = {'id': _new_id(), 'status': 'queued', 'created_at': time.time()}
+            self.state.deployments[deployment['id']] = deployment
+            website['latest_deployment_id'] = deployment['id']
+        self.send_json({'id': deployment['id'], 'status': 'queued'})
+
+    # Databases
+
+    def handle_create_database(self) -> None:
+        data = self.read_json()
+        database = {
+            'id': _new_id(),
+            'name': data['name'],
+            'db_type': data.get('db_type', 'mysql'),
+            'created_at': time.time(),
+        }
+        with self.state.lock:
+            self.state.databases[database['id']] = database
+        self.send_json(self._database_view(database), 201)
+
+    def _database_view(self, database: Dict[str, Any]) -> Dict[str, Any]:
+        view = {key: value for key, value in database.items() if key != 'created_at'}
+        if time.time() - database['created_at'] < self.state.provision_seconds:
+            view['status'] = 'creating'
+        else:
+            view.update({
+                'status': 'active',
+                'host': '127.0.0.1',
+                'port': 3306,
+                'username': f"{database['name']}_user",
+                'password': 'standin-password',
+            })
+        return view
+
+    def handle_get_database(self, id: str) -> None:
+        with self.state.lock:
+            self.send_json(self._database_view(self.state.databases[id]))
+
+
+    def _database_path(self, id: str) -> Path:
+        if id not in self.state.databases:
+            raise KeyError(id)
+        path = self.state.root / 'databases' / f'{id}.sqlite3'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def handle_start_import(self, id: str) -> None:
+        data = self.read_json()
+        self._database_path(id)
+        if data.get('compression', 'none') not in ('gzip', 'zstd', 'none'):
+            raise ValueError(f"unsupported compression: {data['compression']}")
+        session = {
+            'id': _new_id(),
+            'database_id': id,
+            'filename': data.get('filename', ''),
+            'compression': data.get('compression', 'none'),
+            'status': 'receiving',
+            'offset': 0,
+            'cursor': None,
+            'chunks': 0,
+            'statements': 0,
+            'skipped': 0,
+        }
+        with self.state.lock:
+            self.state.imports[session['id']] = session
+        self.send_json(session, 201)
+
+    def _import_session(self, id: str, import_id: str) -> Dict[str, Any]:
+        session = self.state.imports[import_id]
+        if session['database_id'] != id:
+            raise KeyError(import_id)
+        return session
+
+    def handle_get_import(self, id: str, import_id: str) -> None:
+        with self.state.lock:
+            response = dict(self._import_session(id, import_id))
+        self.send_json(response)
+
+    def handle_import_chunk(self, id: str, import_id: str) -> None:
+        fields, files = parse_multipart(self.headers['Content-Type'], self.read_body())
+        with self.state.lock:
+            session = self._import_session(id, import_id)
+            if session['status'] != 'receiving':
+                conflict = f"Import is {session['status']}."
+            elif int(fields['offset']) != session['offset']:
+                conflict = f"Chunk starts at {fields['offset']}, expected {session['offset']}."
+            else:
+                conflict = None
+                self._apply_chunk(session, fields, files['chunk'])
+            response = dict(session)
+        if conflict:
+            self.send_json({'detail': conflict, 'offset': response['offset']}, 409)
+        else:
+            self.send_json(response)
+
+    def _apply_chunk(self, session: Dict[str, Any], fields: Dict[str, str], chunk: bytes) -> None:
+        """Run a batch of statements in one transaction and advance the session."""
+        statements = parse_frames(decompress(chunk, fields.get('compression', 'none')))
+        connection = sqlite3.connect(str(self._database_path(session['database_id'])), isolation_level=None)
+        executed = 0
+        try:
+            connection.execute('BEGIN')
+            for index, statement in enumerate(statements):
+                sql = mysql_to_sqlite(statement)
+                if sql is None:
+                    continue
+                try:
+                    connection.execute(sql)
+                except sqlite3.Error as e:
+                    connection.execute('ROLLBACK')
+                    raise ValueError(f'statement {session["statements"] + index + 1}: {e}: {statement[:200]}')
+                executed += 1
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+        session['statements'] += len(statements)
+        session['skipped'] += len(statements) - executed
+        session['chunks'] += 1
+        session['cursor'] = fields.get('cursor')
+        if session['cursor']:
+            session['offset'] = json.loads(session['cursor'])['offset']
+
+    def handle_complete_import(self, id: str, import_id: str) -> None:
+        self.read_body()
+        with self.state.lock:
+            session = self._import_session(id, import_id)
+            session['status'] = 'completed'
+            response = dict(session)
+        self.send_json(response)
+
+    def handle_start_export(self, id: str) -> None:
+        data = self.read_json()
+        compression = data.get('compression', 'gzip')
+        export_id = _new_id()
+        path = self.state.root / 'exports' / f'{export_id}.sql'
+        path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        with self.state.lock:
+            connection = sqlite3.connect(str(self._database_path(id)))
+            try:
+                with open(path, 'wb') as raw:
+                    if compression == 'gzip':
+                        out: Any = gzip.GzipFile(fileobj=raw, mode='wb', mtime=0)
+                    elif compression == 'zstd':
+                        if zstandard is None:
+                            raise ValueError('zstandard is not installed on the stand-in server')
+                        out = zstandard.ZstdCompressor().stream_writer(raw, closefd=False)
+                    elif compression == 'none':
+                        out = raw
+                    else:
+                        raise ValueError(f'unsupported compression: {compression}')
+                    for line in connection.iterdump():
+                        out.write(line.encode('utf-8') + b'\n')
+                    if out is not raw:
+                        out.close()
+            finally:
+                connection.close()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        export = {
+            'id': export_id,
+            'database_id': id,
+            'compression': compression,
+            'status': 'ready',
+            'size': path.stat().st_size,
+            'sha256': digest.hexdigest(),
+        }
+        with self.state.lock:
+            self.state.exports[export_id] = dict(export, path=str(path))
+        self.send_json(export, 201)
+
+    def _export(self, id: str, export_id: str) -> Dict[str, Any]:
+        export = self.state.exports[export_id]
+        if export['database_id'] != id:
+            raise KeyError(export_id)
+        return export
+
+    def handle_get_export(self, id: str, export_id: str) -> None:
+        with self.state.lock:
+            export = self._export(id, export_id)
+        self.send_json({key: value for key, value in export.items() if key != 'path'})
+
+    def handle_download_export(self, id: str, export_id: str) -> None:
+        with self.state.lock:
+            export = self._export(id, export_id)
+        self.send_file_range(Path(export['path']))
+
+
+def make_server(
+    host: str = '127.0.0.1',
+    port: int = 8000,
+    root: Optional[Path] = None,
+    archive_formats: Optional[List[str]] = None,
+    provision_seconds: float = 3.0,
+    deploy_seconds: float = 3.0,
+    rate_limit: int = 0
+) -> ThreadingHTTPServer:
+    """Build a stand-in server; call ``serve_forever()`` on the result."""
+    root = root or Path.cwd() / 'standin-data'
+    root.mkdir(parents=True, exist_ok=True)
+    if archive_formats is None:
+        archive_formats = ['zip', 'tar.zst'] if zstandard is not None else ['zip']
+    handler = type('Handler', (StandinHandler,), {
+        'state': StandinState(root, archive_formats, provision_seconds, deploy_seconds, rate_limit),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--root', type=Path, default=Path.cwd() / 'standin-data', help='Where uploads are extracted')
+    parser.add_argument('--formats', default=None, help='Accepted archive formats, e.g. zip,tar.zst')
+    parser.add_argument('--provision-seconds', type=float, default=3.0, help='Simulated database provisioning time')
+    parser.add_argument('--deploy-seconds', type=float, default=3.0, help='Simulated deployment time')
+    parser.add_argument('--rate-limit', type=int, default=0, help='Requests per second before answering 429')
+    args = parser.parse_args()
+
+    server = make_server(
+        args.host,
+        args.port,
+        args.root,
+        args.formats.split(',') if args.formats else None,
+        args.provision_seconds,
+        args.deploy_seconds,
+        args.rate_limit,
+    )
+    print(f"Ufazien stand-in API on http://{args.host}:{args.port} (data in {args.root})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()